@@ -0,0 +1,164 @@
+"""Transport compression: Content-Encoding request bodies and negotiated response encoding (gzip, zstd)."""
+
+import gzip
+import os
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..exceptions import VRPError, ErrorCode
+
+GZIP = "gzip"
+DEFLATE = "deflate"
+ZSTD = "zstd"
+IDENTITY = "identity"
+# streamed bodies (job events, NDJSON batches) pass through so every line is delivered as it is written
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+# larger responses are compressed off the event loop
+THREADPOOL_BYTES = 256 * 1024
+
+
+@lru_cache(maxsize=None)
+def _zstd():
+    # optional dependency (pip install zstandard); without it responses are gzip only and zstd request
+    # bodies are rejected (gzip and deflate bodies are always accepted)
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def available_encodings() -> List[str]:
+    # preference order on equal q-values
+    return [ZSTD, GZIP] if _zstd() is not None else [GZIP]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    # highest q-value among the encodings we offer; None means identity
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == ZSTD:
+        return _zstd().ZstdCompressor(level=level).compress(body)
+    # gzip container, mtime 0 so equal bodies compress to equal bytes
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class BodyDecoder:
+    # incremental, so streamed raw matrix uploads are inflated chunk by chunk on their way to disk
+
+    def __init__(self, encoding: str, max_bytes: Optional[int] = None):
+        self.encoding = encoding.strip().lower()
+        if self.encoding in (GZIP, "x-gzip"):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == DEFLATE:
+            self._decompressor = zlib.decompressobj()
+        elif self.encoding == ZSTD and _zstd() is not None:
+            self._decompressor = _zstd().ZstdDecompressor().decompressobj()
+        else:
+            supported = [e for e in (ZSTD, GZIP, DEFLATE) if e != ZSTD or _zstd() is not None]
+            raise VRPError(
+                ErrorCode.VALIDATION_ERROR,
+                details={"details": f"unsupported Content-Encoding {encoding!r}, use one of {supported}"}
+            )
+        # guards against compression bombs; a decoded body larger than this is rejected
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("VRP_MAX_DECODED_BODY_MB", 2048)) * 1024 * 1024
+        self.size = 0
+
+    def decode(self, chunk: bytes) -> bytes:
+        try:
+            out = self._decompressor.decompress(chunk)
+        except Exception as e:
+            raise VRPError(ErrorCode.VALIDATION_ERROR, details={"details": f"invalid {self.encoding} body: {e}"})
+        self.size += len(out)
+        if self.size > self.max_bytes:
+            raise VRPError(
+                ErrorCode.VALIDATION_ERROR,
+                details={"details": f"decoded body exceeds {self.max_bytes} bytes (VRP_MAX_DECODED_BODY_MB)"}
+            )
+        return out
+
+    def flush(self) -> bytes:
+        out = self._decompressor.flush() if hasattr(self._decompressor, "flush") else b""
+        if not getattr(self._decompressor, "eof", True):
+            raise VRPError(ErrorCode.VALIDATION_ERROR, details={"details": f"truncated {self.encoding} body"})
+        return out
+
+
+class CompressionMiddleware:
+    # compresses complete responses in the encoding negotiated from Accept-Encoding; small, already
+    # encoded and streamed responses are sent as they are
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, gzip_level: Optional[int] = None,
+                 zstd_level: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv("VRP_COMPRESS_MIN_BYTES", 1024))
+        self.levels = {
+            GZIP: gzip_level if gzip_level is not None else int(os.getenv("VRP_GZIP_LEVEL", 6)),
+            ZSTD: zstd_level if zstd_level is not None else int(os.getenv("VRP_ZSTD_LEVEL", 3)),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "")
+                if content_type.split(";")[0].strip().lower() in STREAMING_MEDIA_TYPES:
+                    await send(message)
+                else:
+                    # held until the first body chunk shows whether the response is complete
+                    start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (not message.get("more_body", False) and len(body) >= self.minimum_size
+                    and "content-encoding" not in headers):
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is not None:
+                    if len(body) >= THREADPOOL_BYTES:
+                        body = await run_in_threadpool(compress, body, encoding, self.levels[encoding])
+                    else:
+                        body = compress(body, encoding, self.levels[encoding])
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
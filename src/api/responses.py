@@ -0,0 +1,26 @@
+"""orjson response class for service-built outputs."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # same document as FastAPI's encoder: None fields kept, datetimes as ISO 8601, numpy scalars/arrays as numbers
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class VRPJSONResponse(JSONResponse):
+    # endpoints return this directly, so the response_model (kept for the OpenAPI schema) is not
+    # validated and run through jsonable_encoder again for outputs the service has just built
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,63 @@
+"""Asynchronous solve job API router."""
+
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from ..routing import VRPRoute, apply_request_deadline
+from ...schemas.request_models import VRPInput
+from ...schemas.response_models import JobStatus
+from ...services.job_manager import JobManager
+from ...utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=VRPRoute)
+
+
+def _job_manager(request: Request) -> JobManager:
+    return request.app.state.job_manager
+
+
+@router.post("", response_model=JobStatus, status_code=202)
+async def submit_job(vrp_input: VRPInput, request: Request) -> JobStatus:
+    apply_request_deadline(request, vrp_input)
+    job = await _job_manager(request).submit(vrp_input)
+    return job.snapshot()
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, request: Request) -> JobStatus:
+    return _job_manager(request).get(job_id).snapshot()
+
+
+@router.post("/{job_id}/stop", response_model=JobStatus)
+async def stop_job(job_id: str, request: Request) -> JobStatus:
+    # the search ends at its next check and the job completes with the best solution so far
+    return _job_manager(request).stop(job_id).snapshot()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request) -> StreamingResponse:
+    job = _job_manager(request).get(job_id)
+
+    async def event_stream():
+        seen = 0
+        while True:
+            pending = job.events[seen:]
+            seen += len(pending)
+            for event in pending:
+                if event["type"] in ("completed", "failed"):
+                    yield f"event: {event['type']}\ndata: {job.snapshot().model_dump_json()}\n\n"
+                    return
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            if await request.is_disconnected():
+                return
+            await job.wait_for_update(seen)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
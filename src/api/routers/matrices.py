@@ -0,0 +1,81 @@
+"""Shared matrix registry API router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from ..routing import VRPRoute, media_type
+from ...schemas.request_models import MatrixUpload
+from ...schemas.response_models import MatrixInfo
+from ...repositories.matrix_store import MatrixStore
+from ...validators.business_validator import BusinessValidator
+from ...exceptions import VRPError, ErrorCode
+from ...utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+# raw little-endian int32 bodies are streamed straight to disk, for matrices too large for JSON
+RAW_MEDIA_TYPE = "application/octet-stream"
+
+router = APIRouter(prefix="/matrices", tags=["Matrices"], route_class=VRPRoute)
+
+
+def _matrix_store(request: Request) -> MatrixStore:
+    return request.app.state.vrp_service.matrix_store
+
+
+async def _upload_raw(request: Request, store: MatrixStore, size: Optional[int]) -> dict:
+    if not size or size < 1:
+        raise VRPError(
+            ErrorCode.VALIDATION_ERROR,
+            details={"details": "raw matrix uploads need a positive size query parameter"}
+        )
+    pending = store.begin(size)
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                pending.write(chunk)
+        # the value check reads the whole matrix
+        return await run_in_threadpool(pending.commit)
+    except BaseException:
+        pending.abort()
+        raise
+
+
+def _store_upload(store: MatrixStore, upload: MatrixUpload) -> dict:
+    try:
+        buffer = upload.matrix_buffer()
+    except ValueError as e:
+        raise VRPError(ErrorCode.INVALID_MATRIX_DATA, str(e))
+    n = upload.matrix_size(buffer)
+    BusinessValidator.validate_matrix_buffer(buffer, n)
+    return store.put(buffer.reshape(n, n))
+
+
+@router.post("", response_model=MatrixInfo, status_code=201)
+async def upload_matrix(request: Request, size: Optional[int] = None) -> MatrixInfo:
+    # JSON or msgpack bodies use the VRPInput matrix encodings; ids are content hashes, so re-uploads are free
+    store = _matrix_store(request)
+    if media_type(request) == RAW_MEDIA_TYPE:
+        info = await _upload_raw(request, store, size)
+    else:
+        try:
+            payload = await request.json()
+        except ValueError as e:
+            raise VRPError(ErrorCode.VALIDATION_ERROR, details={"details": f"invalid request body: {e}"})
+        upload = MatrixUpload.model_validate(payload)
+        info = await run_in_threadpool(_store_upload, store, upload)
+    logger.info(f"Matrix {info['matrix_id']} available ({info['size']}x{info['size']})")
+    return MatrixInfo(**info)
+
+
+@router.get("/{matrix_id}", response_model=MatrixInfo)
+async def get_matrix(matrix_id: str, request: Request) -> MatrixInfo:
+    return MatrixInfo(**_matrix_store(request).info(matrix_id))
+
+
+@router.delete("/{matrix_id}", status_code=204)
+async def delete_matrix(matrix_id: str, request: Request) -> Response:
+    _matrix_store(request).delete(matrix_id)
+    return Response(status_code=204)
@@ -0,0 +1,42 @@
+"""Stateful plan session API router."""
+
+import time
+
+from fastapi import APIRouter, Request, Response
+
+from ..routing import VRPRoute, apply_request_deadline
+from ...schemas.request_models import PlanDelta, VRPInput
+from ...schemas.response_models import PlanStatus
+from ...services.plan_manager import PlanManager
+
+router = APIRouter(prefix="/plans", tags=["Plans"], route_class=VRPRoute)
+
+
+def _plan_manager(request: Request) -> PlanManager:
+    return request.app.state.plan_manager
+
+
+@router.post("", response_model=PlanStatus, status_code=201)
+async def create_plan(vrp_input: VRPInput, request: Request) -> PlanStatus:
+    apply_request_deadline(request, vrp_input)
+    plan = await _plan_manager(request).create(vrp_input)
+    return plan.snapshot()
+
+
+@router.get("/{plan_id}", response_model=PlanStatus)
+async def get_plan(plan_id: str, request: Request) -> PlanStatus:
+    return _plan_manager(request).get(plan_id).snapshot()
+
+
+@router.post("/{plan_id}/deltas", response_model=PlanStatus)
+async def apply_delta(plan_id: str, delta: PlanDelta, request: Request) -> PlanStatus:
+    # cheap repair of the current routes, then a short local search; the time box counts from receipt
+    received_at = getattr(request.state, "received_at", None) or time.time()
+    plan = await _plan_manager(request).apply(plan_id, delta, received_at)
+    return plan.snapshot()
+
+
+@router.delete("/{plan_id}", status_code=204)
+async def delete_plan(plan_id: str, request: Request) -> Response:
+    _plan_manager(request).delete(plan_id)
+    return Response(status_code=204)
@@ -0,0 +1,52 @@
+"""Stored solution history API router."""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from ..responses import VRPJSONResponse
+from ..routing import VRPRoute
+from ...schemas.response_models import SolutionPage
+from ...repositories.vrp_repository import VRPRepository
+from ...services.solution_history import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    public_solution
+)
+from ...exceptions import VRPError, VRPSystemError, ErrorCode
+
+router = APIRouter(prefix="/solutions", tags=["Solutions"], route_class=VRPRoute)
+
+
+def _repository(request: Request) -> VRPRepository:
+    repository = request.app.state.vrp_service.repository
+    if repository is None:
+        raise VRPSystemError(ErrorCode.DATABASE_ERROR, details={"details": "persistence is not attached"})
+    return repository
+
+
+@router.get("", response_model=SolutionPage)
+async def list_solutions(request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                         cursor: Optional[str] = None, fields: Optional[str] = None) -> VRPJSONResponse:
+    # newest first; pass next_cursor back as cursor for the following page
+    repository = _repository(request)
+    after = decode_cursor(cursor) if cursor else None
+    # one extra document tells whether another page exists
+    docs = await run_in_threadpool(repository.list_solutions, limit + 1, after, parse_fields(fields))
+    page = docs[:limit]
+    return VRPJSONResponse(SolutionPage.model_construct(
+        items=[public_solution(doc) for doc in page],
+        next_cursor=encode_cursor(page[-1]) if len(docs) > limit else None
+    ))
+
+
+@router.get("/{solution_id}", response_model=Dict[str, Any])
+async def get_solution(solution_id: str, request: Request, fields: Optional[str] = None) -> VRPJSONResponse:
+    doc = await run_in_threadpool(_repository(request).get_solution_by_id, solution_id, parse_fields(fields))
+    if doc is None:
+        raise VRPError(ErrorCode.SOLUTION_NOT_FOUND, details={"solution_id": solution_id})
+    return VRPJSONResponse(public_solution(doc))
@@ -1,29 +1,54 @@
 """VRP API router."""
 
+import os
+
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from ...schemas.request_models import VRPInput
-from ...schemas.response_models import VRPOutput
+from ..responses import VRPJSONResponse
+from ..routing import VRPRoute, apply_request_deadline
+from ...schemas.request_models import VRPInput, BatchSolveInput
+from ...schemas.response_models import VRPOutput, BatchSolveOutput
 from ...services.vrp_service import VRPService
+from ...services.solver_executor import SolverExecutor
+from ...services.batch_solver import OK, parse_problems, solve_batch
+from ...exceptions import VRPError, ErrorCode
 from ...utils.logger import get_service_logger
 
 logger = get_service_logger()
 
-router = APIRouter(tags=["VRP"])
+# /solve accepts JSON (nested matrix, matrix_b64 or matrix_flat) and application/x-msgpack bodies;
+# results are returned as VRPJSONResponse, skipping response_model validation of service-built outputs
+router = APIRouter(tags=["VRP"], route_class=VRPRoute)
+
+
+async def _solve(request: Request, vrp_input: VRPInput) -> VRPOutput:
+    executor: SolverExecutor = getattr(request.app.state, 'solver_executor', None)
+    if executor is not None:
+        return await executor.solve(vrp_input)
+    # no executor attached (e.g. app used without lifespan) -> still keep the loop free
+    vrp_service: VRPService = request.app.state.vrp_service
+    return await run_in_threadpool(vrp_service.solve, vrp_input)
+
+
+def _batch_concurrency(request: Request) -> int:
+    executor: SolverExecutor = getattr(request.app.state, 'solver_executor', None)
+    return executor.max_workers if executor is not None else (os.cpu_count() or 1)
 
 
 @router.post("/solve", response_model=VRPOutput)
 async def solve_vrp(
     vrp_input: VRPInput,
     request: Request
-) -> VRPOutput:
+) -> VRPJSONResponse:
     logger.info(
         f"Received VRP request: {len(vrp_input.vehicles)} vehicles, {len(vrp_input.jobs)} jobs",
         extra={'vehicles': len(vrp_input.vehicles), 'jobs': len(vrp_input.jobs)}
     )
     
-    vrp_service: VRPService = request.app.state.vrp_service
-    result = vrp_service.solve(vrp_input)
+    apply_request_deadline(request, vrp_input)
+    result = await _solve(request, vrp_input)
     
     logger.info(
         f"VRP solved successfully. Total duration: {result.total_delivery_duration}",
@@ -34,4 +59,34 @@ async def solve_vrp(
         }
     )
     
-    return result
\ No newline at end of file
+    return VRPJSONResponse(result)
+
+
+@router.post("/solve/batch", response_model=BatchSolveOutput)
+async def solve_vrp_batch(batch: BatchSolveInput, request: Request, stream: bool = False):
+    # results in input order; with ?stream=true (or Accept: application/x-ndjson) one NDJSON line per item as it finishes
+    max_items = int(os.getenv("VRP_BATCH_MAX_ITEMS", 1000))
+    if len(batch.problems) > max_items:
+        raise VRPError(
+            ErrorCode.VALIDATION_ERROR,
+            details={"details": f"batch has {len(batch.problems)} problems, at most {max_items} allowed"}
+        )
+    logger.info(f"Received VRP batch: {len(batch.problems)} problems")
+
+    problems = parse_problems(batch.problems)
+    for problem in problems:
+        if isinstance(problem, VRPInput):
+            apply_request_deadline(request, problem, always=False)
+    items = solve_batch(problems, lambda problem: _solve(request, problem), _batch_concurrency(request))
+
+    if stream or "application/x-ndjson" in request.headers.get("accept", ""):
+        async def ndjson():
+            async for item in items:
+                yield item.model_dump_json() + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = sorted([item async for item in items], key=lambda item: item.index)
+    succeeded = sum(1 for item in results if item.status == OK)
+    logger.info(f"VRP batch solved: {succeeded}/{len(results)} succeeded")
+    return VRPJSONResponse(BatchSolveOutput.model_construct(results=results, succeeded=succeeded, failed=len(results) - succeeded))
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""Custom request/route classes for the VRP API body encodings."""
+
+import math
+import time
+from typing import AsyncGenerator, Callable
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from .compression import IDENTITY, BodyDecoder
+from ..schemas.request_models import VRPInput
+from ..exceptions import VRPError, ErrorCode
+
+MSGPACK_MEDIA_TYPES = ("application/x-msgpack", "application/msgpack")
+# end-to-end time budget in seconds; the deadline_seconds body field takes precedence
+DEADLINE_HEADER = "x-deadline-seconds"
+
+
+class DecodedRequest(Request):
+    # Content-Encoding (gzip, deflate, zstd) bodies are inflated as they are read, before any parsing
+
+    async def stream(self) -> AsyncGenerator[bytes, None]:
+        if hasattr(self, "_body") or content_encoding(self) == IDENTITY:
+            async for chunk in super().stream():
+                yield chunk
+            return
+        decoder = BodyDecoder(content_encoding(self))
+        async for chunk in super().stream():
+            if chunk:
+                yield decoder.decode(chunk)
+        yield decoder.flush()
+
+
+class MsgpackRequest(DecodedRequest):
+    # presented to FastAPI as JSON so the usual body validation runs on the unpacked payload
+
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # bin fields (e.g. matrix_bytes) stay as bytes, no per-element objects
+            self._json = msgpack.unpackb(await self.body(), raw=False)
+        return self._json
+
+
+def media_type(request: Request) -> str:
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def content_encoding(request: Request) -> str:
+    return request.headers.get("content-encoding", "").strip().lower() or IDENTITY
+
+
+class VRPRoute(APIRoute):
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> Response:
+            received_at = time.time()
+            if media_type(request) in MSGPACK_MEDIA_TYPES:
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (k, b"application/json" if k == b"content-type" else v)
+                    for k, v in request.scope["headers"]
+                ]
+                request = MsgpackRequest(scope, request.receive)
+            elif content_encoding(request) != IDENTITY:
+                request = DecodedRequest(request.scope, request.receive)
+            if content_encoding(request) != IDENTITY and self.body_field is not None:
+                # inflate up front: FastAPI would turn decoding errors into a generic body parse error
+                await request.body()
+            # body parsing counts against the request's time budget
+            request.state.received_at = received_at
+            return await original_route_handler(request)
+
+        return custom_route_handler
+
+
+def apply_request_deadline(request: Request, data: VRPInput, always: bool = True) -> None:
+    # always=False: only problems with an explicit deadline start their budget at receipt,
+    # the others start it when a solver picks them up (e.g. batch items waiting their turn)
+    header = request.headers.get(DEADLINE_HEADER)
+    if header is not None and data.deadline_seconds is None:
+        try:
+            data.deadline_seconds = float(header)
+        except ValueError:
+            data.deadline_seconds = None
+        # float() also takes "nan" and "inf", which no budget can be measured against
+        if data.deadline_seconds is None or not math.isfinite(data.deadline_seconds) or data.deadline_seconds <= 0:
+            raise VRPError(
+                ErrorCode.VALIDATION_ERROR,
+                details={"details": f"{DEADLINE_HEADER} must be a positive number of seconds, got {header!r}"}
+            )
+    if always or data.deadline_seconds is not None:
+        data.mark_received(getattr(request.state, "received_at", None) or time.time())
\ No newline at end of file
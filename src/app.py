@@ -1,21 +1,45 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from pydantic import ValidationError
 import logging
+import os
 
 from .services.vrp_service import VRPService
+from .services.solver_executor import SolverExecutor
+from .services.solution_cache import SolutionCache
+from .services.search_tuner import SearchTuner
+from .services.job_manager import JobManager
+from .services.plan_manager import PlanManager
 from .repositories.vrp_repository import VRPRepository
-from .config.database import db_config
+from .repositories.persistence_writer import PersistenceWriter
+from .repositories.connector import ATTACHED, BackgroundConnector
+from .api.compression import CompressionMiddleware
 from .exceptions import VRPException
 from .exceptions.handlers import (
     vrp_exception_handler,
     general_exception_handler,
     validation_exception_handler
 )
+from .utils import metrics
 from .utils.logger import get_service_logger
 
 logger = get_service_logger()
 
+
+def attach_persistence(app: FastAPI, repository: VRPRepository) -> None:
+    # called from the background connector once MongoDB answers; solves so far ran without persistence
+    service = app.state.vrp_service
+    service.repository = repository
+    # queue/batch/interval come from VRP_PERSIST_QUEUE_SIZE, VRP_PERSIST_BATCH_SIZE, VRP_PERSIST_FLUSH_INTERVAL
+    service.writer = PersistenceWriter(repository)
+    metrics.track_writer(service.writer)
+    if service.cache is not None and os.getenv("VRP_CACHE_MONGO", "0") == "1":
+        service.cache.attach(repository)
+    if service.tuner is not None:
+        service.tuner.attach(repository)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     import time
@@ -23,38 +47,59 @@ async def lifespan(app: FastAPI):
     
     app.state.start_time = time.time()
     
-    repository = None
-    try:
-        db_config.test_connection()
-        repository = VRPRepository()
-        logger.info("Database connection established")
-    except Exception as e:
-        logger.warning(f"Database not available, running without persistence: {e}")
-    
-
-    import os
     time_limit = int(os.getenv("VRP_TIME_LIMIT", 30))
     solution_limit = int(os.getenv("VRP_SOLUTION_LIMIT", 100))
     random_seed = int(os.getenv("VRP_RANDOM_SEED", 0))
     
+    cache = None
+    if os.getenv("VRP_CACHE_ENABLED", "0") == "1":
+        cache = SolutionCache(
+            max_entries=int(os.getenv("VRP_CACHE_SIZE", 256)),
+            ttl_seconds=int(os.getenv("VRP_CACHE_TTL", 3600))
+        )
+        logger.info(f"Solution cache enabled: size={cache.max_entries}, ttl={cache.ttl_seconds}s, mongo={os.getenv('VRP_CACHE_MONGO', '0') == '1'}")
+    
+    tuner = None
+    if os.getenv("VRP_AUTOTUNE", "0") == "1":
+        tuner = SearchTuner(
+            time_limit=time_limit,
+            max_records=int(os.getenv("VRP_TUNE_HISTORY", 5000)),
+            explore=float(os.getenv("VRP_TUNE_EXPLORE", 0.1))
+        )
+        logger.info("Search auto-tuning enabled")
+    
     app.state.vrp_service = VRPService(
         time_limit=time_limit,
         solution_limit=solution_limit,
         random_seed=random_seed,
-        repository=repository
+        repository=None,
+        cache=cache,
+        tuner=tuner
     )
     logger.info(f"VRP service initialized with time_limit={time_limit}, solution_limit={solution_limit}, random_seed={random_seed}")
-    logger.info("VRP service ready")
+
+    # worker mode/count/queue come from VRP_SOLVER_MODE, VRP_SOLVER_WORKERS, VRP_SOLVER_QUEUE_SIZE
+    app.state.solver_executor = SolverExecutor(app.state.vrp_service)
+    app.state.job_manager = JobManager(app.state.solver_executor)
+    # retention and refine time box come from VRP_PLANS_MAX, VRP_PLAN_REFINE_SECONDS
+    app.state.plan_manager = PlanManager(app.state.solver_executor)
+    metrics.track_executor(app.state.solver_executor)
+    # MongoDB is probed off the startup path (retrying every MONGO_RETRY_INTERVAL); requests are served
+    # meanwhile and persistence attaches when the connection is up
+    app.state.connector = BackgroundConnector(lambda repository: attach_persistence(app, repository))
+    app.state.connector.start()
+    logger.info(f"VRP service ready in {time.time() - app.state.start_time:.3f}s")
     
     yield
     
     logger.info("Shutting down VRP API")
-    if hasattr(app.state, 'vrp_service') and app.state.vrp_service.repository:
+    app.state.connector.stop()
+    await app.state.job_manager.shutdown()
+    app.state.solver_executor.shutdown()
+    if app.state.vrp_service.writer:
+        app.state.vrp_service.writer.close()
+    if app.state.vrp_service.repository:
         app.state.vrp_service.repository.close_connection()
-    try:
-        db_config.close_connection()
-    except Exception:
-        pass
 
 
 def create_app() -> FastAPI:
@@ -67,15 +112,46 @@ def create_app() -> FastAPI:
 
     logging.basicConfig(level=logging.INFO)
 
+    # gzip/zstd negotiated from Accept-Encoding; VRP_COMPRESSION=0 leaves it to a proxy in front
+    if os.getenv("VRP_COMPRESSION", "1") == "1":
+        app.add_middleware(CompressionMiddleware)
+
     app.add_exception_handler(VRPException, vrp_exception_handler)
     app.add_exception_handler(Exception, general_exception_handler)
     app.add_exception_handler(ValidationError, validation_exception_handler)
 
     from .api.routers.vrp import router as vrp_router
+    from .api.routers.jobs import router as jobs_router
+    from .api.routers.matrices import router as matrices_router
+    from .api.routers.plans import router as plans_router
+    from .api.routers.solutions import router as solutions_router
     app.include_router(vrp_router, prefix="")
+    app.include_router(jobs_router)
+    app.include_router(matrices_router)
+    app.include_router(plans_router)
+    app.include_router(solutions_router)
 
     @app.get("/health")
     async def health_check():
         return {"status": "healthy", "message": "VRP API running", "version": "1.0.0"}
 
+    @app.get("/ready")
+    async def readiness_check(require_persistence: bool = False):
+        # serving: the solver pool is up. persistence: connecting, attached or unavailable (still retrying)
+        connector = getattr(app.state, "connector", None)
+        if connector is None:
+            return JSONResponse({"status": "starting", "serving": False, "persistence": None}, status_code=503)
+        body = {"status": "ready", "serving": True, "persistence": connector.state}
+        if connector.error:
+            body["persistence_error"] = connector.error
+        if require_persistence and connector.state != ATTACHED:
+            body["status"] = "degraded"
+            return JSONResponse(body, status_code=503)
+        return body
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        body, content_type = metrics.render()
+        return Response(body, media_type=content_type)
+
     return app
@@ -0,0 +1 @@
+"""Synthetic benchmark instances and the solve pipeline benchmark harness."""
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Command line entry point: python -m src.benchmarks"""
+
+import argparse
+import json
+import logging
+import sys
+
+from .generators import GENERATORS
+from .harness import DEFAULT_SIZES, compare, load_report, run_benchmark
+from ..services.vrp_service import VRPService
+from ..utils.logger import get_service_logger
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='VRP solve pipeline benchmark')
+    parser.add_argument('--kinds', nargs='+', default=list(GENERATORS), choices=list(GENERATORS), help='Instance families')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='Job counts')
+    parser.add_argument('--seed', type=int, default=7, help='Instance generator seed')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per instance; phase timings are medians')
+    parser.add_argument('--time-limit', type=int, default=60, help='Solver time limit in seconds')
+    parser.add_argument('--solution-limit', type=int, default=100, help='Solver solution limit')
+    parser.add_argument('--persist', action='store_true', help='Also time MongoDB persistence (needs MONGO_URI)')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', help='Baseline report to compare against; exit code 1 on regression')
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help='Allowed relative slowdown per phase')
+    parser.add_argument('--quality-tolerance', type=float, default=0.01, help='Allowed relative increase in total duration')
+    args = parser.parse_args()
+
+    # keep stdout for the report
+    get_service_logger().setLevel(logging.WARNING)
+
+    repository = None
+    if args.persist:
+        from ..repositories.vrp_repository import VRPRepository
+        repository = VRPRepository()
+
+    service = VRPService(time_limit=args.time_limit, solution_limit=args.solution_limit, repository=repository)
+    report = run_benchmark(service, args.kinds, args.sizes, seed=args.seed, repeat=args.repeat)
+
+    if args.baseline:
+        report["regressions"] = compare(
+            report, load_report(args.baseline),
+            time_tolerance=args.time_tolerance, quality_tolerance=args.quality_tolerance
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['instance']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""Seeded synthetic VRP instances for benchmarking."""
+
+import math
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+# travel time units per coordinate unit; coordinates live on a 1000 x 1000 plane
+SPEED = 3
+JOBS_PER_VEHICLE = 25
+VEHICLE_CAPACITY = 100
+
+
+def _payload(points: np.ndarray, matrix: np.ndarray, rng: np.random.Generator) -> Dict[str, Any]:
+    # location 0 is the depot, location i (i >= 1) hosts job i
+    n_jobs = len(points) - 1
+    n_vehicles = max(1, math.ceil(n_jobs / JOBS_PER_VEHICLE))
+    deliveries = rng.integers(1, 6, size=n_jobs)
+    # keep total capacity ~30% above total demand so instances stay feasible
+    capacity = max(VEHICLE_CAPACITY, math.ceil(deliveries.sum() * 1.3 / n_vehicles))
+    services = rng.integers(0, 4, size=n_jobs) * 60
+    return {
+        "vehicles": [{"id": v, "start_index": 0, "capacity": [capacity]} for v in range(1, n_vehicles + 1)],
+        "jobs": [
+            {"id": i, "location_index": i, "delivery": [int(deliveries[i - 1])], "service": int(services[i - 1])}
+            for i in range(1, n_jobs + 1)
+        ],
+        "matrix": matrix.astype(np.int64).tolist(),
+    }
+
+
+def _euclidean(points: np.ndarray) -> np.ndarray:
+    deltas = points[:, None, :] - points[None, :, :]
+    return np.rint(np.sqrt((deltas ** 2).sum(axis=-1)) * SPEED)
+
+
+def uniform(n_jobs: int, seed: int) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 1000, size=(n_jobs + 1, 2))
+    points[0] = (500, 500)
+    return _payload(points, _euclidean(points), rng)
+
+
+def clustered(n_jobs: int, seed: int) -> Dict[str, Any]:
+    # jobs gathered around a handful of centres, as in per-district delivery days
+    rng = np.random.default_rng(seed)
+    n_clusters = max(2, n_jobs // 40)
+    centres = rng.uniform(100, 900, size=(n_clusters, 2))
+    members = rng.integers(0, n_clusters, size=n_jobs + 1)
+    points = np.clip(centres[members] + rng.normal(0, 40, size=(n_jobs + 1, 2)), 0, 1000)
+    points[0] = (500, 500)
+    return _payload(points, _euclidean(points), rng)
+
+
+def asymmetric(n_jobs: int, seed: int) -> Dict[str, Any]:
+    # uniform layout with direction-dependent delays (one-way streets, climbs, turn restrictions)
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 1000, size=(n_jobs + 1, 2))
+    points[0] = (500, 500)
+    base = _euclidean(points)
+    delay = rng.uniform(1.0, 1.6, size=base.shape)
+    matrix = np.rint(base * delay)
+    np.fill_diagonal(matrix, 0)
+    return _payload(points, matrix, rng)
+
+
+GENERATORS: Dict[str, Callable[[int, int], Dict[str, Any]]] = {
+    "uniform": uniform,
+    "clustered": clustered,
+    "asymmetric": asymmetric,
+}
\ No newline at end of file
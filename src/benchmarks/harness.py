@@ -0,0 +1,107 @@
+"""Phase-level benchmark of the solve pipeline, with baseline comparison."""
+
+import json
+import os
+import platform
+import statistics
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import ortools
+
+from .generators import GENERATORS
+from ..schemas.request_models import VRPInput
+from ..services.vrp_service import VRPService
+from ..utils.timing import PhaseTimer
+
+DEFAULT_SIZES = [50, 200, 500, 1000, 2000]
+PHASES = ["parse", "validation", "model_build", "search", "extraction", "persistence"]
+
+# phase timings below this many seconds are noise, whatever their relative change
+NOISE_FLOOR_SECONDS = 0.01
+
+
+def run_instance(service: VRPService, kind: str, n_jobs: int, seed: int, repeat: int = 1) -> Dict[str, Any]:
+    payload = GENERATORS[kind](n_jobs, seed)
+    body = json.dumps(payload).encode()
+
+    runs: List[Dict[str, float]] = []
+    result = None
+    for _ in range(repeat):
+        timer = PhaseTimer()
+        data = VRPInput.model_validate_json(body)
+        timer.lap("parse")
+        result = service.compute_solution(data, timer=timer)
+        if service.repository:
+            timer.reset()
+            service.persist_solution(data, result)
+            timer.lap("persistence")
+        runs.append(timer.phases)
+
+    # median per phase over the repeats
+    phases = {name: round(statistics.median(run[name] for run in runs), 6) for name in PHASES if name in runs[0]}
+    return {
+        "instance": f"{kind}-{n_jobs}-s{seed}",
+        "kind": kind,
+        "jobs": n_jobs,
+        "vehicles": len(payload["vehicles"]),
+        "seed": seed,
+        "repeat": repeat,
+        "phases": phases,
+        "total_seconds": round(sum(phases.values()), 6),
+        "total_delivery_duration": result.total_delivery_duration,
+        "objective_value": result.metadata.objective_value if result.metadata else None,
+    }
+
+
+def run_benchmark(service: VRPService, kinds: Sequence[str], sizes: Sequence[int], seed: int = 7,
+                  repeat: int = 1) -> Dict[str, Any]:
+    results = [run_instance(service, kind, n_jobs, seed, repeat) for kind in kinds for n_jobs in sizes]
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "ortools": ortools.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "settings": service.settings(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], time_tolerance: float = 0.25,
+            quality_tolerance: float = 0.01, noise_floor: float = NOISE_FLOOR_SECONDS) -> List[Dict[str, Any]]:
+    # regressions of current against baseline; instances missing from the baseline are not compared
+    previous = {r["instance"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        base = previous.get(result["instance"])
+        if base is None:
+            continue
+        for name, seconds in result["phases"].items():
+            before = base["phases"].get(name)
+            if before is None or seconds <= noise_floor:
+                continue
+            if seconds > max(before, noise_floor) * (1 + time_tolerance):
+                regressions.append(_regression(result["instance"], name, before, seconds))
+        before, after = base["total_delivery_duration"], result["total_delivery_duration"]
+        if after > before * (1 + quality_tolerance):
+            regressions.append(_regression(result["instance"], "total_delivery_duration", before, after))
+    return regressions
+
+
+def _regression(instance: str, metric: str, before: float, after: float) -> Dict[str, Any]:
+    return {
+        "instance": instance,
+        "metric": metric,
+        "baseline": before,
+        "current": after,
+        "change": round(after / before - 1, 4) if before else None,
+    }
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
\ No newline at end of file
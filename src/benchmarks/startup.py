@@ -0,0 +1,92 @@
+"""Startup benchmark: time from a fresh interpreter to a ready API, with MongoDB unreachable.
+
+python -m src.benchmarks.startup [--repeat 5] [--mongo-uri mongodb://10.255.255.1:27017]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+# modules that must stay off the startup path; they load with the first solve or the background connection
+HEAVY_MODULES = ["ortools", "pymongo"]
+
+# runs in a fresh interpreter per measurement, so nothing is already imported or cached in memory
+_CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+from src.app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+# before the lifespan starts the background MongoDB connection, which imports pymongo in its own thread
+loaded = sorted(m for m in HEAVY if m in sys.modules)
+
+async def main():
+    import httpx
+    async with app.router.lifespan_context(app):
+        lifespan = time.perf_counter()
+        async with httpx.AsyncClient(app=app, base_url="http://startup") as client:
+            ready = await client.get("/ready")
+        answered = time.perf_counter()
+        return {
+            "import_seconds": imported - started,
+            "create_app_seconds": created - imported,
+            "lifespan_seconds": lifespan - created,
+            "ready_seconds": answered - started,
+            "ready_status": ready.status_code,
+            "persistence": ready.json().get("persistence"),
+            "heavy_modules_loaded": loaded,
+        }
+
+print(json.dumps(asyncio.run(main())))
+"""
+
+
+def measure(mongo_uri: str, mongo_timeout_ms: int) -> Dict[str, Any]:
+    env = {**os.environ, "MONGO_URI": mongo_uri, "MONGO_TIMEOUT": str(mongo_timeout_ms), "VRP_SOLVER_MODE": "process"}
+    code = f"HEAVY = {HEAVY_MODULES!r}\n" + _CHILD
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    # interpreter start and teardown included
+    result["process_seconds"] = time.perf_counter() - started
+    return result
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    timings = [k for k in runs[0] if k.endswith("_seconds")]
+    return {
+        "runs": len(runs),
+        "median": {k: round(statistics.median(r[k] for r in runs), 4) for k in timings},
+        "max": {k: round(max(r[k] for r in runs), 4) for k in timings},
+        "ready_status": sorted({r["ready_status"] for r in runs}),
+        "persistence": sorted({str(r["persistence"]) for r in runs}),
+        "heavy_modules_loaded": sorted({m for r in runs for m in r["heavy_modules_loaded"]}),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='VRP API startup benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreter starts to measure')
+    parser.add_argument('--mongo-uri', default='mongodb://10.255.255.1:27017',
+                        help='MongoDB address; the default is unroutable, so connecting hangs until the timeout')
+    parser.add_argument('--mongo-timeout-ms', type=int, default=10000, help='MONGO_TIMEOUT for the measured processes')
+    parser.add_argument('--budget', type=float, default=None, help='Exit code 1 if the median time to ready exceeds this')
+    args = parser.parse_args()
+
+    runs = [measure(args.mongo_uri, args.mongo_timeout_ms) for _ in range(args.repeat)]
+    report = summarize(runs)
+    print(json.dumps(report, indent=2))
+    if args.budget is not None and report["median"]["ready_seconds"] > args.budget:
+        print(f"REGRESSION ready_seconds: {report['median']['ready_seconds']} > {args.budget}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Transport benchmark: bytes on the wire and encode/decode time for /solve requests and responses.
+
+python -m src.benchmarks.transport [--sizes 500 2000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import msgpack
+import numpy as np
+
+from .generators import JOBS_PER_VEHICLE, uniform
+from ..api.compression import GZIP, ZSTD, BodyDecoder, available_encodings, compress
+from ..api.responses import VRPJSONResponse
+from ..schemas.response_models import Route, VRPMetadata, VRPOutput
+
+DEFAULT_SIZES = [500, 2000]
+# responses at the server defaults (VRP_GZIP_LEVEL, VRP_ZSTD_LEVEL); multi-MB request bodies at the fastest
+# levels, where the client's compress time stays well below the transfer time it saves
+RESPONSE_LEVELS = {GZIP: 6, ZSTD: 3}
+REQUEST_LEVELS = {GZIP: 1, ZSTD: 1}
+
+
+def _median_seconds(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings), 6)
+
+
+def solved_output(payload: Dict[str, Any]) -> VRPOutput:
+    # shaped like a solve result (JOBS_PER_VEHICLE consecutive jobs per route), without running the solver
+    matrix = np.asarray(payload["matrix"])
+    jobs = payload["jobs"]
+    routes = {}
+    for v, vehicle in enumerate(payload["vehicles"]):
+        chunk = jobs[v * JOBS_PER_VEHICLE:(v + 1) * JOBS_PER_VEHICLE]
+        path = [0] + [j["location_index"] for j in chunk] + [0]
+        distance = int(matrix[path[:-1], path[1:]].sum())
+        service = sum(j["service"] for j in chunk)
+        routes[str(vehicle["id"])] = Route.model_construct(
+            jobs=[j["id"] for j in chunk], delivery_duration=distance + service,
+            capacity_used=sum(j["delivery"][0] for j in chunk), total_service_time=service,
+            total_distance=distance, start_location=0, end_location=0
+        )
+    metadata = VRPMetadata.model_construct(**{
+        **{name: field.default for name, field in VRPMetadata.model_fields.items() if not field.is_required()},
+        "solve_time_seconds": 12.5, "objective_value": sum(r.total_distance for r in routes.values()),
+        "random_seed": 0, "strategy": "PATH_CHEAPEST_ARC+GUIDED_LOCAL_SEARCH"
+    })
+    return VRPOutput.model_construct(
+        total_delivery_duration=sum(r.delivery_duration for r in routes.values()), routes=routes, metadata=metadata
+    )
+
+
+def _wire(body: bytes, levels: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    # per encoding: bytes sent, sender compress time, receiver BodyDecoder time
+    out = {"identity": {"bytes": len(body)}}
+    for encoding in available_encodings():
+        packed = compress(body, encoding, levels[encoding])
+
+        def decode():
+            decoder = BodyDecoder(encoding)
+            return decoder.decode(packed) + decoder.flush()
+
+        out[encoding] = {
+            "bytes": len(packed),
+            "ratio": round(len(body) / len(packed), 2),
+            "compress_seconds": _median_seconds(lambda: compress(body, encoding, levels[encoding]), repeat),
+            "decode_seconds": _median_seconds(decode, repeat),
+        }
+    return out
+
+
+def _fastapi_render(output: VRPOutput) -> Callable[[], bytes]:
+    # what a response_model=VRPOutput endpoint returning the model does: validate, jsonable_encoder, json.dumps
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    field = create_response_field(name="Response_solve_vrp", type_=VRPOutput)
+    loop = asyncio.new_event_loop()
+
+    def render() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=output))
+        return JSONResponse(content).body
+
+    return render
+
+
+def measure(n_jobs: int, seed: int, repeat: int) -> Dict[str, Any]:
+    payload = uniform(n_jobs, seed)
+    json_body = json.dumps(payload, separators=(",", ":")).encode()
+    packed_payload = {k: v for k, v in payload.items() if k != "matrix"}
+    packed_payload["matrix_bytes"] = np.asarray(payload["matrix"], dtype="<i4").tobytes()
+    packed_payload["size"] = len(payload["matrix"])
+    msgpack_body = msgpack.packb(packed_payload)
+
+    output = solved_output(payload)
+    fastapi_render = _fastapi_render(output)
+    body = VRPJSONResponse(output).body
+    assert json.loads(body) == json.loads(fastapi_render()), "orjson body differs from the FastAPI encoding"
+
+    return {
+        "jobs": n_jobs,
+        "request": {
+            "json": _wire(json_body, REQUEST_LEVELS, repeat),
+            "msgpack": _wire(msgpack_body, REQUEST_LEVELS, repeat),
+        },
+        "response": {
+            "serialize_seconds": {
+                "fastapi_response_model": _median_seconds(fastapi_render, repeat),
+                "orjson": _median_seconds(lambda: VRPJSONResponse(output).body, repeat),
+            },
+            "wire": _wire(body, RESPONSE_LEVELS, repeat),
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='VRP API transport benchmark')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='Job counts')
+    parser.add_argument('--seed', type=int, default=7, help='Instance generator seed')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; timings are medians')
+    args = parser.parse_args()
+
+    report: List[Dict[str, Any]] = [measure(n, args.seed, args.repeat) for n in args.sizes]
+    print(json.dumps({"encodings": available_encodings(), "results": report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Validation benchmark: BusinessValidator request and solution checks per matrix encoding.
+
+python -m src.benchmarks.validation [--jobs 500] [--repeat 50] [--budget-ms 1.0]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .generators import uniform
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import Route
+from ..utils.matrix import encode_base64_matrix
+from ..validators.business_validator import BusinessValidator
+
+ENCODINGS = ["matrix", "matrix_flat", "matrix_b64"]
+# the validation budget per request at the default size
+BUDGET_MS = 1.0
+
+
+def encoded_payload(payload: Dict[str, Any], encoding: str) -> Dict[str, Any]:
+    matrix = payload["matrix"]
+    out = {k: v for k, v in payload.items() if k != "matrix"}
+    if encoding == "matrix":
+        out["matrix"] = matrix
+    elif encoding == "matrix_flat":
+        out["matrix_flat"] = np.asarray(matrix).ravel().tolist()
+        out["size"] = len(matrix)
+    else:
+        out["matrix_b64"] = encode_base64_matrix(matrix)
+    return out
+
+
+def assigned_routes(payload: Dict[str, Any]) -> Dict[str, Route]:
+    # every job on exactly one route, round robin over the vehicles
+    vehicles = payload["vehicles"]
+    return {
+        str(vehicle["id"]): Route(
+            jobs=[j["id"] for j in payload["jobs"][v::len(vehicles)]],
+            delivery_duration=0, capacity_used=0, total_service_time=0, total_distance=0, start_location=0
+        )
+        for v, vehicle in enumerate(vehicles)
+    }
+
+
+def measure(n_jobs: int, seed: int, repeat: int) -> Dict[str, Any]:
+    # each run validates a freshly parsed request, as the API does; parsing itself is not timed
+    payload = uniform(n_jobs, seed)
+    routes = assigned_routes(payload)
+    medians = {}
+    for encoding in ENCODINGS:
+        body = encoded_payload(payload, encoding)
+        timings: List[float] = []
+        for _ in range(repeat):
+            data = VRPInput.model_validate(body)
+            started = time.perf_counter()
+            BusinessValidator.validate_business_rules(data)
+            BusinessValidator.validate_solution(routes, data)
+            timings.append(time.perf_counter() - started)
+        medians[encoding] = round(statistics.median(timings) * 1000, 4)
+    return {"jobs": n_jobs, "vehicles": len(payload["vehicles"]), "median_ms": medians}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='VRP request validation benchmark')
+    parser.add_argument('--jobs', type=int, default=500, help='Job count')
+    parser.add_argument('--seed', type=int, default=7, help='Instance generator seed')
+    parser.add_argument('--repeat', type=int, default=50, help='Runs per encoding; timings are medians')
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS,
+                        help='Exit code 1 if any encoding\'s median exceeds this many milliseconds')
+    args = parser.parse_args()
+
+    report = measure(args.jobs, args.seed, args.repeat)
+    print(json.dumps(report, indent=2))
+    over = {k: v for k, v in report["median_ms"].items() if v > args.budget_ms}
+    for encoding, median in over.items():
+        print(f"REGRESSION {encoding}: {median} ms > {args.budget_ms} ms", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
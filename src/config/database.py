@@ -1,10 +1,13 @@
 """Database configuration module."""
 import os
-from typing import Optional
-from pymongo import MongoClient
+import threading
+from typing import TYPE_CHECKING, Optional
 from ..utils.logger import get_service_logger
 from ..exceptions import VRPSystemError, ErrorCode
 
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
 logger = get_service_logger()
 
 
@@ -14,31 +17,50 @@ class DatabaseConfig:
         self.mongo_uri = mongo_uri or os.getenv('MONGO_URI', 'mongodb://localhost:27017')
         self.database_name = os.getenv('MONGO_DB_NAME', 'vrp_db')
         self.connection_timeout = int(os.getenv('MONGO_TIMEOUT', '10000'))
+        # one pooled client per process: every repository, cache tier and history reader shares its sockets
+        self.max_pool_size = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+        self.min_pool_size = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+        self.max_idle_ms = int(os.getenv('MONGO_MAX_IDLE_MS', '60000'))
         self._client = None
+        self._lock = threading.Lock()
     
-    def get_mongo_client(self) -> MongoClient:
-        try:
-            client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=self.connection_timeout)
-
-            client.admin.command('ping')
-            logger.info("MongoDB connection established")
+    def get_mongo_client(self) -> "MongoClient":
+        # the shared client, created and pinged on first use; a failed ping leaves nothing behind to retry with
+        with self._lock:
+            if self._client is not None:
+                return self._client
+            # pymongo is imported on first connect, keeping it off the service's startup path
+            from pymongo import MongoClient
+            client = None
+            try:
+                client = MongoClient(
+                    self.mongo_uri,
+                    serverSelectionTimeoutMS=self.connection_timeout,
+                    connectTimeoutMS=self.connection_timeout,
+                    maxPoolSize=self.max_pool_size,
+                    minPoolSize=self.min_pool_size,
+                    maxIdleTimeMS=self.max_idle_ms,
+                    appname="vrp-api"
+                )
+                client.admin.command('ping')
+            except Exception as e:
+                if client is not None:
+                    client.close()
+                logger.error(f"MongoDB connection failed: {str(e)}", exc_info=True)
+                raise VRPSystemError(
+                    ErrorCode.DATABASE_ERROR,
+                    f"Failed to connect to MongoDB at {self.mongo_uri} (timeout: {self.connection_timeout}ms): {str(e)}"
+                )
+            self._client = client
+            logger.info(f"MongoDB connection established (pool size {self.min_pool_size}-{self.max_pool_size})")
             return client
-        except Exception as e:
-            logger.error(f"MongoDB connection failed: {str(e)}", exc_info=True)
-            raise VRPSystemError(
-                ErrorCode.DATABASE_ERROR,
-                f"Failed to connect to MongoDB at {self.mongo_uri} (timeout: {self.connection_timeout}s): {str(e)}"
-            )
     
-    def get_database(self, client: MongoClient):
+    def get_database(self, client: "MongoClient"):
         return client[self.database_name]
     
     def test_connection(self):
         try:
-            if not self._client:
-                self._client = self.get_mongo_client()
-            else:
-                self._client.admin.command('ping')
+            self.get_mongo_client().admin.command('ping')
             logger.info("Database connection test successful")
         except VRPSystemError:
             raise
@@ -50,10 +72,11 @@ class DatabaseConfig:
             )
     
     def close_connection(self):
-        if self._client:
-            self._client.close()
-            self._client = None
-            logger.info("Database connection closed")
+        with self._lock:
+            if self._client:
+                self._client.close()
+                self._client = None
+                logger.info("Database connection closed")
 
 
 db_config = DatabaseConfig()
\ No newline at end of file
@@ -13,5 +13,13 @@ class ErrorCode(Enum):
     INVALID_MATRIX_DATA = "INVALID_MATRIX_DATA"
     INVALID_VEHICLE_DATA = "INVALID_VEHICLE_DATA"
     INVALID_JOB_DATA = "INVALID_JOB_DATA"
+    INVALID_LOCATION_INDEX = "INVALID_LOCATION_INDEX"
+    CAPACITY_EXCEEDED = "CAPACITY_EXCEEDED"
+    INVALID_ROUTE_ASSIGNMENT = "INVALID_ROUTE_ASSIGNMENT"
     NO_SOLUTION_FOUND = "NO_SOLUTION_FOUND"
-    TIME_LIMIT_EXCEEDED = "TIME_LIMIT_EXCEEDED"
\ No newline at end of file
+    TIME_LIMIT_EXCEEDED = "TIME_LIMIT_EXCEEDED"
+    SOLVER_BUSY = "SOLVER_BUSY"
+    JOB_NOT_FOUND = "JOB_NOT_FOUND"
+    MATRIX_NOT_FOUND = "MATRIX_NOT_FOUND"
+    PLAN_NOT_FOUND = "PLAN_NOT_FOUND"
+    SOLUTION_NOT_FOUND = "SOLUTION_NOT_FOUND"
\ No newline at end of file
@@ -8,4 +8,9 @@ class ErrorMessage:
     SOLVER_ERROR = "Solver error: {details}"
     TIMEOUT_ERROR = "Operation timed out after {timeout_seconds} seconds."
     DATABASE_ERROR = "Database operation failed: {details}"
-    SOLUTION_ERROR = "Solution processing failed: {details}"
\ No newline at end of file
+    SOLUTION_ERROR = "Solution processing failed: {details}"
+    SOLVER_BUSY = "Solver capacity exhausted ({in_flight} requests in flight). Please retry later."
+    JOB_NOT_FOUND = "Solve job {job_id} not found."
+    MATRIX_NOT_FOUND = "Matrix {matrix_id} not found."
+    PLAN_NOT_FOUND = "Plan {plan_id} not found."
+    SOLUTION_NOT_FOUND = "Solution {solution_id} not found."
\ No newline at end of file
@@ -19,7 +19,7 @@ def create_error_response(error_code: ErrorCode, message: str, details: Optional
             "code": error_code.value,
             "message": message,
             "timestamp": logger.handlers[0].formatter.formatTime(logger.makeRecord(
-                name="", level=0, pathname="", lineno=0, msg="", args=(), exc_info=None
+                "", 0, "", 0, "", (), None
             )) if logger.handlers else None
         }
     }
@@ -36,10 +36,22 @@ def create_error_response(error_code: ErrorCode, message: str, details: Optional
 def get_status_code_for_error(error_code: ErrorCode) -> int:
     status_map = {
         ErrorCode.VALIDATION_ERROR: 400,
+        ErrorCode.INVALID_MATRIX_DATA: 400,
+        ErrorCode.INVALID_VEHICLE_DATA: 400,
+        ErrorCode.INVALID_JOB_DATA: 400,
+        ErrorCode.INVALID_LOCATION_INDEX: 400,
+        ErrorCode.CAPACITY_EXCEEDED: 400,
         ErrorCode.TIMEOUT_ERROR: 408,
         ErrorCode.SOLVER_ERROR: 422,
         ErrorCode.SOLUTION_ERROR: 422,
+        ErrorCode.NO_SOLUTION_FOUND: 422,
+        ErrorCode.INVALID_ROUTE_ASSIGNMENT: 422,
         ErrorCode.DATABASE_ERROR: 503,
+        ErrorCode.SOLVER_BUSY: 503,
+        ErrorCode.JOB_NOT_FOUND: 404,
+        ErrorCode.MATRIX_NOT_FOUND: 404,
+        ErrorCode.PLAN_NOT_FOUND: 404,
+        ErrorCode.SOLUTION_NOT_FOUND: 404,
         ErrorCode.INTERNAL_ERROR: 500,
     }
     return status_map.get(error_code, 500)
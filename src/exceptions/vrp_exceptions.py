@@ -22,6 +22,10 @@ class VRPException(Exception):
         
         self.message = message
         super().__init__(message)
+    
+    def __reduce__(self):
+        # keep error_code/details intact when crossing process boundaries
+        return (self.__class__, (self.error_code, self.message, self.details))
 
 
 class VRPError(VRPException):
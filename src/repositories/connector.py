@@ -0,0 +1,73 @@
+"""MongoDB connection made in the background, so the API serves before (or without) persistence."""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+from ..config.database import DatabaseConfig
+from ..utils.logger import get_service_logger
+
+if TYPE_CHECKING:
+    from .vrp_repository import VRPRepository
+
+logger = get_service_logger()
+
+# persistence states reported by /ready
+CONNECTING = "connecting"
+ATTACHED = "attached"
+UNAVAILABLE = "unavailable"
+
+
+class BackgroundConnector:
+    # connects in a daemon thread, retrying until it succeeds or is stopped; on_connect hands the
+    # repository to the running service
+
+    def __init__(self, on_connect: Callable[["VRPRepository"], None], db_config: Optional[DatabaseConfig] = None,
+                 retry_interval: Optional[float] = None):
+        self.on_connect = on_connect
+        self.db_config = db_config
+        # 0: a single attempt, as before
+        self.retry_interval = retry_interval if retry_interval is not None else float(os.getenv("MONGO_RETRY_INTERVAL", 30))
+        self.state = CONNECTING
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.repository: Optional["VRPRepository"] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="vrp-mongo-connect", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        from .vrp_repository import VRPRepository
+        while not self._stop.is_set():
+            self.attempts += 1
+            try:
+                repository = VRPRepository(self.db_config)
+            except Exception as e:
+                self.state, self.error = UNAVAILABLE, str(e)
+                logger.warning(f"Database not available (attempt {self.attempts}), running without persistence: {e}")
+                if self.retry_interval <= 0 or self._stop.wait(self.retry_interval):
+                    return
+                continue
+            if self._stop.is_set():
+                # shut down while connecting
+                repository.close_connection()
+                return
+            try:
+                self.on_connect(repository)
+            except Exception as e:
+                logger.error(f"Failed to attach persistence: {str(e)}", exc_info=True)
+                self.state, self.error = UNAVAILABLE, str(e)
+                repository.close_connection()
+                return
+            self.repository = repository
+            self.state, self.error = ATTACHED, None
+            logger.info(f"Database connection established after {self.attempts} attempt(s), persistence attached")
+            return
+
+    def stop(self, timeout: float = 0.1) -> None:
+        # an attempt still waiting on MongoDB is abandoned; its daemon thread closes the client if it ever connects
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
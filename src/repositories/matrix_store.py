@@ -0,0 +1,159 @@
+"""On-disk registry of uploaded travel matrices, memory-mapped read-only by every process that solves."""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..exceptions import VRPError, ErrorCode
+from ..utils.matrix import WIRE_DTYPE, as_matrix_array
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "vrp-matrices")
+# .npy files: a small header with shape/dtype followed by the raw row-major int32 values
+SUFFIX = ".npy"
+_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+# rows checked at a time when validating an upload, bounding the pages touched per step
+CHECK_ROWS = 1024
+# largest accepted matrix (locations per side); 20000 is a 1.6 GB file
+DEFAULT_MAX_SIZE = 20000
+
+
+class PendingMatrix:
+    # a matrix being streamed to disk; its id is the content hash, known once the last byte arrived
+
+    def __init__(self, store: "MatrixStore", size: int):
+        self.store = store
+        self.size = size
+        self.nbytes = size * size * WIRE_DTYPE.itemsize
+        self.written = 0
+        fd, self.path = tempfile.mkstemp(dir=store.directory, suffix=".part")
+        os.close(fd)
+        self._array = np.lib.format.open_memmap(self.path, mode="w+", dtype=WIRE_DTYPE, shape=(size, size))
+        self._digest = hashlib.blake2b(digest_size=16)
+
+    def write(self, chunk: bytes) -> None:
+        end = self.written + len(chunk)
+        if end > self.nbytes:
+            raise VRPError(
+                ErrorCode.INVALID_MATRIX_DATA,
+                f"Matrix data exceeds {self.nbytes} bytes ({self.size}x{self.size} int32 values)"
+            )
+        self._array.reshape(-1).view(np.uint8)[self.written:end] = np.frombuffer(chunk, dtype=np.uint8)
+        self._digest.update(chunk)
+        self.written = end
+
+    def commit(self) -> Dict[str, Any]:
+        if self.written != self.nbytes:
+            raise VRPError(
+                ErrorCode.INVALID_MATRIX_DATA,
+                f"Got {self.written} bytes, expected {self.nbytes} for a {self.size}x{self.size} int32 matrix"
+            )
+        for lo in range(0, self.size, CHECK_ROWS):
+            rows = self._array[lo:lo + CHECK_ROWS]
+            if rows.min() < 0:
+                i, j = divmod(int(np.argmax(rows < 0)), self.size)
+                raise VRPError(
+                    ErrorCode.INVALID_MATRIX_DATA,
+                    f"Distance cannot be negative at position [{lo + i}][{j}]: {rows[i, j]}"
+                )
+        self._array.flush()
+        self._array = None
+
+        matrix_id = self._digest.hexdigest()
+        target = self.store.path(matrix_id)
+        if os.path.exists(target):
+            # identical content was uploaded before; ids are content hashes
+            os.remove(self.path)
+        else:
+            os.replace(self.path, target)
+        logger.info(f"Stored matrix {matrix_id} ({self.size}x{self.size})")
+        return self.store.info(matrix_id)
+
+    def abort(self) -> None:
+        self._array = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MatrixStore:
+    # files are written once and never modified, so every process can map them read-only and share pages
+
+    def __init__(self, directory: Optional[str] = None, max_size: Optional[int] = None):
+        self.directory = directory or os.getenv("VRP_MATRIX_DIR", DEFAULT_DIRECTORY)
+        # uploads allocate size x size int32 values on disk up front, so the size is capped
+        self.max_size = max_size or int(os.getenv("VRP_MATRIX_MAX_SIZE", DEFAULT_MAX_SIZE))
+        # maps opened by this process, by matrix id
+        self._open: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def path(self, matrix_id: str) -> str:
+        if not _ID_PATTERN.match(matrix_id or ""):
+            raise VRPError(ErrorCode.MATRIX_NOT_FOUND, details={"matrix_id": matrix_id})
+        return os.path.join(self.directory, matrix_id + SUFFIX)
+
+    def begin(self, size: int) -> PendingMatrix:
+        if size < 1:
+            raise VRPError(ErrorCode.INVALID_MATRIX_DATA, "Matrix cannot be empty")
+        if size > self.max_size:
+            raise VRPError(
+                ErrorCode.INVALID_MATRIX_DATA,
+                f"Matrix size {size} exceeds the maximum of {self.max_size} locations (VRP_MATRIX_MAX_SIZE)"
+            )
+        os.makedirs(self.directory, exist_ok=True)
+        return PendingMatrix(self, size)
+
+    def put(self, matrix: np.ndarray) -> Dict[str, Any]:
+        if matrix.size and matrix.max() > np.iinfo(WIRE_DTYPE).max:
+            raise VRPError(ErrorCode.INVALID_MATRIX_DATA, f"Stored matrices hold int32 values, got {matrix.max()}")
+        pending = self.begin(len(matrix))
+        try:
+            pending.write(np.ascontiguousarray(matrix, dtype=WIRE_DTYPE).tobytes())
+            return pending.commit()
+        except Exception:
+            pending.abort()
+            raise
+
+    def open(self, matrix_id: str) -> np.ndarray:
+        path = self.path(matrix_id)
+        with self._lock:
+            # a delete in another process removes the file but not this process' map, which would keep serving it
+            if not os.path.exists(path):
+                self._open.pop(matrix_id, None)
+                raise VRPError(ErrorCode.MATRIX_NOT_FOUND, details={"matrix_id": matrix_id})
+            mapped = self._open.get(matrix_id)
+            if mapped is None:
+                mapped = self._open[matrix_id] = np.load(path, mmap_mode="r")
+            return mapped
+
+    def info(self, matrix_id: str) -> Dict[str, Any]:
+        mapped = self.open(matrix_id)
+        return {"matrix_id": matrix_id, "size": len(mapped), "bytes": int(mapped.nbytes)}
+
+    def delete(self, matrix_id: str) -> None:
+        path = self.path(matrix_id)
+        with self._lock:
+            self._open.pop(matrix_id, None)
+            if not os.path.exists(path):
+                raise VRPError(ErrorCode.MATRIX_NOT_FOUND, details={"matrix_id": matrix_id})
+            # processes that still map the file keep reading it until they drop the map
+            os.remove(path)
+        logger.info(f"Deleted matrix {matrix_id}")
+
+    def submatrix(self, matrix_id: str, locations: Sequence[int]) -> np.ndarray:
+        # gathers only the requested rows/columns; the full matrix is never read or copied
+        mapped = self.open(matrix_id)
+        index = np.asarray(locations, dtype=np.int64)
+        if len(index) and (index.min() < 0 or index.max() >= len(mapped)):
+            bad = int(index[(index < 0) | (index >= len(mapped))][0])
+            raise VRPError(
+                ErrorCode.INVALID_LOCATION_INDEX,
+                f"Location {bad} is outside matrix {matrix_id} of size {len(mapped)}"
+            )
+        return as_matrix_array(mapped[np.ix_(index, index)])
@@ -0,0 +1,86 @@
+"""Background writer that persists solved problems in batches, off the request path."""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import VRPOutput
+from ..utils.metrics import PERSISTENCE_BATCH_SECONDS
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+
+class PersistenceWriter:
+    # bounded queue drained by one daemon thread; when the queue is full, new writes are dropped, never awaited
+
+    def __init__(self, repository: Any, max_queue: Optional[int] = None, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        self.repository = repository
+        self.max_queue = max_queue or int(os.getenv("VRP_PERSIST_QUEUE_SIZE", 1000))
+        self.batch_size = batch_size or int(os.getenv("VRP_PERSIST_BATCH_SIZE", 50))
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv("VRP_PERSIST_FLUSH_INTERVAL", 0.5))
+        self._queue: "queue.Queue[Tuple[list, list, VRPOutput]]" = queue.Queue(maxsize=self.max_queue)
+        self._stop = threading.Event()
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="vrp-persistence", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, data: VRPInput, result: VRPOutput) -> bool:
+        # the matrix is not persisted, so it is not kept alive by the queue either
+        if self._stop.is_set():
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((data.vehicles, data.jobs, result))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Persistence queue full ({self.max_queue}), solution not saved")
+            return False
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        # stop accepting work and flush whatever is still queued
+        self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Persistence writer did not flush within {timeout}s, {self.pending} solutions lost")
+        logger.info(f"Persistence writer closed: written={self.written}, failed={self.failed}, dropped={self.dropped}")
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _next_batch(self) -> List[Tuple[list, list, VRPOutput]]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Tuple[list, list, VRPOutput]]) -> None:
+        started = time.perf_counter()
+        try:
+            ids = self.repository.save_solutions_batch(batch)
+            PERSISTENCE_BATCH_SECONDS.observe(time.perf_counter() - started)
+            self.written += len(batch)
+            logger.info(f"Persisted {len(batch)} solutions to MongoDB ({len(ids)} ids)")
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning(f"Failed to persist batch of {len(batch)} solutions: {str(e)}")
\ No newline at end of file
@@ -1,44 +1,84 @@
 """VRP Repository for database operations."""
-from typing import List, Optional
-from datetime import datetime
-from pymongo import MongoClient
-from pymongo.collection import Collection
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
 
 from ..schemas.request_models import VRPInput, Vehicle, Job
 from ..schemas.response_models import VRPOutput
-from ..config.database import DatabaseConfig
+from ..config.database import DatabaseConfig, db_config as shared_db_config
 from ..utils.logger import get_service_logger
 from ..exceptions import VRPSystemError, ErrorCode
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 logger = get_service_logger()
 
+SOLUTION_ORDER = [("timestamp", -1), ("_id", -1)]
+
 
 class VRPRepository:
     
     def __init__(self, db_config: Optional[DatabaseConfig] = None):
-        self.db_config = db_config or DatabaseConfig()
+        self.db_config = db_config or shared_db_config
         self.client = self.db_config.get_mongo_client()
         self.db = self.db_config.get_database(self.client)
         
-        self.solutions_col: Collection = self.db['solutions']
-        self.vehicles_col: Collection = self.db['vehicles']
-        self.jobs_col: Collection = self.db['jobs']
+        self.solutions_col: "Collection" = self.db['solutions']
+        self.vehicles_col: "Collection" = self.db['vehicles']
+        self.jobs_col: "Collection" = self.db['jobs']
+        self.cache_col: "Collection" = self.db['solution_cache']
+        self.history_col: "Collection" = self.db['solve_history']
+        
+        self.ensure_indexes()
+    
+    def ensure_indexes(self) -> None:
+        try:
+            self.vehicles_col.create_index("content_hash", unique=True)
+            self.jobs_col.create_index("content_hash", unique=True)
+            self.history_col.create_index("created_at")
+            # newest-first keyset pagination; _id breaks timestamp ties
+            self.solutions_col.create_index(SOLUTION_ORDER)
+        except Exception as e:
+            logger.warning(f"Failed to create indexes: {str(e)}")
+    
+    @staticmethod
+    def _content_hash(doc: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(doc, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+    
+    @staticmethod
+    def _vehicle_doc(vehicle: Vehicle) -> Dict[str, Any]:
+        return {
+            "vehicle_id": vehicle.id,
+            "start_index": vehicle.start_index,
+            "capacity": vehicle.capacity
+        }
+    
+    @staticmethod
+    def _job_doc(job: Job) -> Dict[str, Any]:
+        return {
+            "job_id": job.id,
+            "location_index": job.location_index,
+            "delivery": job.delivery,
+            "service": job.service
+        }
+    
+    def _upsert_by_hash(self, collection: "Collection", docs: Sequence[Dict[str, Any]]) -> List[str]:
+        # identical documents are stored once; the content hash is the reference
+        from pymongo import UpdateOne
+        hashes = [self._content_hash(doc) for doc in docs]
+        operations = {
+            h: UpdateOne({"content_hash": h}, {"$setOnInsert": {**doc, "content_hash": h}}, upsert=True)
+            for h, doc in zip(hashes, docs)
+        }
+        if operations:
+            collection.bulk_write(list(operations.values()), ordered=False)
+        return hashes
     
     def save_vehicles(self, vehicles: List[Vehicle]) -> List[str]:
         try:
-            vehicle_docs = []
-            for vehicle in vehicles:
-                doc = {
-                    "vehicle_id": vehicle.id,
-                    "start_index": vehicle.start_index,
-                    "capacity": vehicle.capacity
-                }
-                vehicle_docs.append(doc)
-            
-            if vehicle_docs:
-                result = self.vehicles_col.insert_many(vehicle_docs)
-                return [str(id) for id in result.inserted_ids]
-            return []
+            return self._upsert_by_hash(self.vehicles_col, [self._vehicle_doc(v) for v in vehicles])
         except Exception as e:
             logger.error(f"Failed to save vehicles: {str(e)}", exc_info=True)
             raise VRPSystemError(
@@ -48,20 +88,7 @@ class VRPRepository:
     
     def save_jobs(self, jobs: List[Job]) -> List[str]:
         try:
-            job_docs = []
-            for job in jobs:
-                doc = {
-                    "job_id": job.id,
-                    "location_index": job.location_index,
-                    "delivery": job.delivery,
-                    "service": job.service
-                }
-                job_docs.append(doc)
-            
-            if job_docs:
-                result = self.jobs_col.insert_many(job_docs)
-                return [str(id) for id in result.inserted_ids]
-            return []
+            return self._upsert_by_hash(self.jobs_col, [self._job_doc(j) for j in jobs])
         except Exception as e:
             logger.error(f"Failed to save jobs: {str(e)}", exc_info=True)
             raise VRPSystemError(
@@ -72,7 +99,7 @@ class VRPRepository:
     def save_solution(self, output_dto: VRPOutput, input_data: VRPInput, 
                      vehicle_ids: List[str], job_ids: List[str]) -> str:
         try:
-            solution_dict = output_dto.dict()
+            solution_dict = output_dto.model_dump()
             
             solution_dict['timestamp'] = datetime.utcnow()
             solution_dict['vehicle_refs'] = vehicle_ids
@@ -87,28 +114,148 @@ class VRPRepository:
                 f"Failed to save solution to database: {str(e)}"
             )
     
-    def get_solution_by_id(self, solution_id: str) -> Optional[dict]:
+    def save_solutions_batch(self, entries: Sequence[Tuple[List[Vehicle], List[Job], VRPOutput]]) -> List[str]:
+        # one bulk upsert per reference collection and one insert_many for the whole batch
+        try:
+            vehicle_docs = [[self._vehicle_doc(v) for v in vehicles] for vehicles, _, _ in entries]
+            job_docs = [[self._job_doc(j) for j in jobs] for _, jobs, _ in entries]
+            vehicle_refs = self._split(self._upsert_by_hash(self.vehicles_col, sum(vehicle_docs, [])), vehicle_docs)
+            job_refs = self._split(self._upsert_by_hash(self.jobs_col, sum(job_docs, [])), job_docs)
+            
+            now = datetime.utcnow()
+            solution_docs = []
+            for (_, _, output_dto), v_refs, j_refs in zip(entries, vehicle_refs, job_refs):
+                solution_dict = output_dto.model_dump()
+                solution_dict['timestamp'] = now
+                solution_dict['vehicle_refs'] = v_refs
+                solution_dict['job_refs'] = j_refs
+                solution_docs.append(solution_dict)
+            
+            if not solution_docs:
+                return []
+            result = self.solutions_col.insert_many(solution_docs, ordered=False)
+            return [str(id) for id in result.inserted_ids]
+        except Exception as e:
+            logger.error(f"Failed to save solution batch: {str(e)}", exc_info=True)
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
+                f"Failed to save solution batch of {len(entries)} to database: {str(e)}"
+            )
+    
+    @staticmethod
+    def _split(flat: List[str], groups: List[list]) -> List[List[str]]:
+        out, offset = [], 0
+        for group in groups:
+            out.append(flat[offset:offset + len(group)])
+            offset += len(group)
+        return out
+    
+    @staticmethod
+    def _projection(fields: Optional[Sequence[str]]) -> Optional[Dict[str, int]]:
+        # timestamp and _id always come back, they make up the page cursor
+        if not fields:
+            return None
+        return {"timestamp": 1, **{field: 1 for field in fields}}
+    
+    def get_solution_by_id(self, solution_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         from bson import ObjectId
+        from bson.errors import InvalidId
         try:
-            return self.solutions_col.find_one({"_id": ObjectId(solution_id)})
+            return self.solutions_col.find_one({"_id": ObjectId(solution_id)}, self._projection(fields))
+        except InvalidId:
+            return None
         except Exception as e:
             logger.error(f"Failed to retrieve solution {solution_id}: {str(e)}", exc_info=True)
-            raise VRPDatabaseError(
-                ErrorCode.DATABASE_OPERATION_ERROR,
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
                 f"Failed to retrieve solution {solution_id}: {str(e)}"
             )
     
     def get_recent_solutions(self, limit: int = 10) -> List[dict]:
+        return self.list_solutions(limit)
+    
+    def list_solutions(self, limit: int, after: Optional[Tuple[datetime, Any]] = None,
+                       fields: Optional[Sequence[str]] = None) -> List[dict]:
+        # newest first, strictly after the (timestamp, _id) of the previous page's last solution;
+        # walks the index from the cursor instead of skipping over earlier pages
+        query: Dict[str, Any] = {}
+        if after is not None:
+            timestamp, last_id = after
+            query = {"$or": [
+                {"timestamp": {"$lt": timestamp}},
+                {"timestamp": timestamp, "_id": {"$lt": last_id}}
+            ]}
+        try:
+            cursor = self.solutions_col.find(query, self._projection(fields)).sort(SOLUTION_ORDER).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            logger.error(f"Failed to list solutions: {str(e)}", exc_info=True)
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
+                f"Failed to list solutions: {str(e)}"
+            )
+    
+    def ensure_cache_index(self, ttl_seconds: int) -> None:
+        try:
+            self.cache_col.create_index("key", unique=True)
+            self.cache_col.create_index("created_at", expireAfterSeconds=ttl_seconds)
+        except Exception as e:
+            logger.error(f"Failed to create solution cache indexes: {str(e)}", exc_info=True)
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
+                f"Failed to create solution cache indexes: {str(e)}"
+            )
+    
+    def get_cached_solution(self, key: str, ttl_seconds: int) -> Optional[dict]:
+        try:
+            # the TTL monitor only runs periodically, so expired entries are filtered here too
+            doc = self.cache_col.find_one({
+                "key": key,
+                "created_at": {"$gte": datetime.utcnow() - timedelta(seconds=ttl_seconds)}
+            })
+            return doc["solution"] if doc else None
+        except Exception as e:
+            logger.error(f"Failed to read cached solution {key}: {str(e)}", exc_info=True)
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
+                f"Failed to read cached solution {key}: {str(e)}"
+            )
+    
+    def save_cached_solution(self, key: str, output_dto: VRPOutput) -> None:
+        try:
+            self.cache_col.replace_one(
+                {"key": key},
+                {"key": key, "solution": output_dto.model_dump(), "created_at": datetime.utcnow()},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to save cached solution {key}: {str(e)}", exc_info=True)
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
+                f"Failed to save cached solution {key}: {str(e)}"
+            )
+    
+    def save_solve_record(self, record: Dict[str, Any]) -> None:
+        try:
+            self.history_col.insert_one(record)
+        except Exception as e:
+            logger.error(f"Failed to save solve record: {str(e)}", exc_info=True)
+            raise VRPSystemError(
+                ErrorCode.DATABASE_ERROR,
+                f"Failed to save solve record: {str(e)}"
+            )
+    
+    def load_solve_history(self, limit: int) -> List[Dict[str, Any]]:
+        # newest first
         try:
-            return list(self.solutions_col.find().sort("timestamp", -1).limit(limit))
+            return list(self.history_col.find({}, {"_id": 0}).sort("created_at", -1).limit(limit))
         except Exception as e:
-            logger.error(f"Failed to retrieve recent solutions: {str(e)}", exc_info=True)
+            logger.error(f"Failed to load solve history: {str(e)}", exc_info=True)
             raise VRPSystemError(
                 ErrorCode.DATABASE_ERROR,
-                f"Failed to retrieve recent solutions: {str(e)}"
+                f"Failed to load solve history: {str(e)}"
             )
     
     def close_connection(self):
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
\ No newline at end of file
+        # the client is shared by the process; closing it ends every repository's pool
+        self.db_config.close_connection()
\ No newline at end of file
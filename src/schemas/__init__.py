@@ -1,13 +1,23 @@
 """Schemas package for VRP API request and response models."""
 
-from .request_models import VRPInput, Vehicle, Job
-from .response_models import VRPOutput, Route, VRPMetadata
+from .request_models import VRPInput, Vehicle, Job, WarmStart, BatchSolveInput, MatrixUpload, PlanDelta
+from .response_models import VRPOutput, Route, VRPMetadata, JobStatus, BatchItemResult, BatchSolveOutput, MatrixInfo, PlanStatus, SolutionPage
 
 __all__ = [
     "VRPInput",
     "Vehicle", 
     "Job",
+    "WarmStart",
+    "BatchSolveInput",
+    "MatrixUpload",
+    "PlanDelta",
     "VRPOutput",
     "Route",
-    "VRPMetadata"
+    "VRPMetadata",
+    "JobStatus",
+    "BatchItemResult",
+    "BatchSolveOutput",
+    "MatrixInfo",
+    "PlanStatus",
+    "SolutionPage"
 ]
\ No newline at end of file
@@ -1,7 +1,17 @@
 """Input models for VRP API requests."""
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field, PrivateAttr, validator, model_validator
+
+from ..utils.matrix import (
+    as_matrix_array,
+    decode_base64_matrix,
+    decode_int32_buffer,
+    decode_neighbor_lists,
+    infer_square_size
+)
 
 
 class Vehicle(BaseModel):
@@ -17,11 +27,42 @@ class Job(BaseModel):
     service: Optional[int] = Field(None, ge=0, description="Service time (must be non-negative if provided)")
 
 
+class WarmStart(BaseModel):
+    solution_id: Optional[str] = Field(None, description="Id of a stored solution to start from")
+    routes: Optional[Dict[str, List[int]]] = Field(None, description="Job id sequence per vehicle id to start from")
+
+
 class VRPInput(BaseModel):
     vehicles: List[Vehicle] = Field(..., min_items=1, description="List of vehicles (at least one required)")
     jobs: List[Job] = Field(..., description="List of jobs to be delivered")
-    matrix: List[List[int]] = Field(..., description="Distance matrix between locations")
+    matrix: Optional[List[List[int]]] = Field(None, description="Distance matrix between locations")
+    # compact alternatives to `matrix`; exactly one matrix encoding must be given
+    matrix_b64: Optional[str] = Field(None, description="Base64 of the row-major matrix as little-endian int32")
+    matrix_bytes: Optional[bytes] = Field(None, description="Raw row-major little-endian int32 matrix (msgpack bodies only)")
+    matrix_flat: Optional[List[int]] = Field(None, description="Row-major flattened matrix")
+    matrix_sparse: Optional[List[List[List[int]]]] = Field(
+        None, description="Per location, the [to_index, travel] pairs of its allowed successors; unlisted arcs are never used"
+    )
+    matrix_id: Optional[str] = Field(None, description="Id of a matrix uploaded via POST /matrices")
+    locations: Optional[List[int]] = Field(
+        None, description="With matrix_id: the stored matrix's locations this problem uses; start_index/location_index refer to positions in this list"
+    )
+    size: Optional[int] = Field(None, ge=1, description="Matrix dimension for compact encodings (inferred if omitted)")
     random_seed: Optional[int] = Field(None, description="Random seed for reproducible results")
+    warm_start: Optional[WarmStart] = Field(None, description="Previous plan to seed the search with; unknown jobs are dropped")
+    portfolio_size: Optional[int] = Field(None, ge=1, description="Number of differently configured searches to run in parallel")
+    include_timings: bool = Field(False, description="Return per-phase timings and search statistics in metadata")
+    deadline_seconds: Optional[float] = Field(None, gt=0, allow_inf_nan=False, description="End-to-end time budget, counted from when the request was received")
+    candidate_neighbors: Optional[int] = Field(None, ge=0, description="Successors considered per location (nearest first); 0: all")
+    decompose: Optional[bool] = Field(None, description="Solve as clustered subproblems; unset: decided by VRP_DECOMPOSE_MIN_JOBS")
+
+    # flat decoded buffer for compact encodings, or the cached 2-D array once built
+    _matrix_buffer: Optional[np.ndarray] = PrivateAttr(None)
+    _matrix_array: Optional[np.ndarray] = PrivateAttr(None)
+    # allowed successors per location, only for matrix_sparse
+    _neighbors: Optional[List[np.ndarray]] = PrivateAttr(None)
+    # wall-clock time (time.time()) the API received the request; the deadline budget starts here
+    _received_at: Optional[float] = PrivateAttr(None)
         
     @validator('vehicles')
     def validate_unique_vehicle_ids(cls, v):
@@ -40,10 +81,123 @@ class VRPInput(BaseModel):
                 duplicates = [jid for jid in job_ids if job_ids.count(jid) > 1]
                 raise ValueError(f'Job IDs must be unique. Duplicates: {list(set(duplicates))}')
         return v
-    
+
+    @model_validator(mode='after')
+    def decode_matrix(self):
+        encodings = [name for name in ('matrix', 'matrix_b64', 'matrix_bytes', 'matrix_flat', 'matrix_sparse', 'matrix_id')
+                     if getattr(self, name) is not None]
+        if len(encodings) != 1:
+            raise ValueError(
+                f'Exactly one of matrix, matrix_b64, matrix_bytes, matrix_flat, matrix_sparse or matrix_id is required, got {encodings or "none"}'
+            )
+        if (self.matrix_id is None) != (self.locations is None):
+            raise ValueError('matrix_id and locations must be given together')
+
+        # shape/sign checks happen later in BusinessValidator, on the decoded buffer
+        try:
+            if self.matrix_b64 is not None:
+                self._matrix_buffer = decode_base64_matrix(self.matrix_b64)
+            elif self.matrix_bytes is not None:
+                self._matrix_buffer = decode_int32_buffer(self.matrix_bytes)
+            elif self.matrix_flat is not None:
+                self._matrix_buffer = as_matrix_array(self.matrix_flat)
+            elif self.matrix_sparse is not None:
+                self._matrix_buffer, self._neighbors = decode_neighbor_lists(self.matrix_sparse)
+            elif self.matrix is not None and all(len(row) == len(self.matrix) for row in self.matrix):
+                # square, so the array the validator and solver reuse can be built here; other shapes
+                # are left to BusinessValidator's row-by-row report
+                self._matrix_array = as_matrix_array(self.matrix)
+        except (OverflowError, TypeError) as e:
+            # pydantic only turns ValueError into a validation error
+            raise ValueError(f"Matrix values must be 64-bit integers: {e}")
+        return self
+
+    def matrix_buffer(self) -> Optional[np.ndarray]:
+        return self._matrix_buffer
+
+    def neighbor_lists(self) -> Optional[List[np.ndarray]]:
+        return self._neighbors
+
+    def matrix_size(self) -> int:
+        if self._matrix_buffer is None:
+            return len(self.locations) if self.matrix_id is not None else len(self.matrix)
+        return self.size or infer_square_size(self._matrix_buffer.size)
+
+    def matrix_array(self) -> np.ndarray:
+        # only valid once the matrix passed BusinessValidator.validate_matrix
+        if self._matrix_array is None:
+            if self._matrix_buffer is None:
+                self._matrix_array = as_matrix_array(self.matrix)
+            else:
+                n = self.matrix_size()
+                self._matrix_array = self._matrix_buffer.reshape(n, n)
+        return self._matrix_array
+
+    @classmethod
+    def from_matrix_array(cls, vehicles: List[Vehicle], jobs: List[Job], matrix: np.ndarray, **fields: Any) -> "VRPInput":
+        # internal construction from already validated parts: no field validation, no matrix decoding
+        data = cls.model_construct(vehicles=vehicles, jobs=jobs, size=len(matrix), **fields)
+        data.attach_matrix(matrix)
+        return data
+
+    def attach_matrix(self, matrix: np.ndarray) -> None:
+        # a matrix resolved outside the request body, e.g. sliced from a stored one
+        self._matrix_buffer = matrix.ravel()
+        self._matrix_array = matrix
+
+    def mark_received(self, at: float) -> None:
+        self._received_at = at
+
+    def received_at(self) -> Optional[float]:
+        return self._received_at
 
     def get_max_location_index(self) -> int:
         return max(
             max(v.start_index for v in self.vehicles),
             max(j.location_index for j in self.jobs)
-        )
\ No newline at end of file
+        )
+
+
+class MatrixUpload(BaseModel):
+    # JSON/msgpack body of POST /matrices; large matrices are better sent raw (application/octet-stream)
+    matrix: Optional[List[List[int]]] = Field(None, description="Distance matrix between locations")
+    matrix_b64: Optional[str] = Field(None, description="Base64 of the row-major matrix as little-endian int32")
+    matrix_bytes: Optional[bytes] = Field(None, description="Raw row-major little-endian int32 matrix (msgpack bodies only)")
+    matrix_flat: Optional[List[int]] = Field(None, description="Row-major flattened matrix")
+    size: Optional[int] = Field(None, ge=1, description="Matrix dimension for compact encodings (inferred if omitted)")
+
+    @model_validator(mode='after')
+    def check_encoding(self):
+        encodings = [name for name in ('matrix', 'matrix_b64', 'matrix_bytes', 'matrix_flat')
+                     if getattr(self, name) is not None]
+        if len(encodings) != 1:
+            raise ValueError(
+                f'Exactly one of matrix, matrix_b64, matrix_bytes or matrix_flat is required, got {encodings or "none"}'
+            )
+        return self
+
+    def matrix_buffer(self) -> np.ndarray:
+        if self.matrix_b64 is not None:
+            return decode_base64_matrix(self.matrix_b64)
+        if self.matrix_bytes is not None:
+            return decode_int32_buffer(self.matrix_bytes)
+        if self.matrix_flat is not None:
+            return as_matrix_array(self.matrix_flat)
+        if any(len(row) != len(self.matrix) for row in self.matrix):
+            raise ValueError("Matrix must be square")
+        return as_matrix_array(self.matrix).ravel()
+
+    def matrix_size(self, buffer: np.ndarray) -> int:
+        return self.size or infer_square_size(buffer.size)
+
+
+class PlanDelta(BaseModel):
+    add_jobs: List[Job] = Field(default_factory=list, description="New jobs; their locations must be in the plan's matrix")
+    remove_jobs: List[int] = Field(default_factory=list, description="Ids of cancelled jobs")
+    unavailable_vehicles: List[int] = Field(default_factory=list, description="Ids of vehicles taken out of the plan")
+    refine_seconds: Optional[float] = Field(None, gt=0, description="Time box for the re-optimisation (defaults to VRP_PLAN_REFINE_SECONDS)")
+
+
+class BatchSolveInput(BaseModel):
+    # items are validated one by one so a malformed problem only fails its own slot
+    problems: List[Dict[str, Any]] = Field(..., min_items=1, description="Independent VRPInput payloads")
@@ -1,6 +1,7 @@
 """Output models for VRP API responses."""
 
-from typing import List, Optional, Dict
+from datetime import datetime
+from typing import Any, List, Optional, Dict
 from pydantic import BaseModel
 
 
@@ -19,9 +20,69 @@ class VRPMetadata(BaseModel):
     algorithm: str = "OR-Tools"
     objective_value: Optional[int] = None
     random_seed: int
+    cache_hit: bool = False
+    warm_started: bool = False
+    stopped_early: bool = False
+    # the search was cut short by the time budget; the best solution found by then is returned
+    truncated: bool = False
+    strategy: Optional[str] = None
+    portfolio_size: int = 1
+    # number of subproblems when the problem was solved by decomposition
+    clusters: Optional[int] = None
+    # strategy and time budget were picked from the history of similar solves
+    autotuned: bool = False
+    # only returned when the request sets include_timings
+    phases: Optional[Dict[str, float]] = None
+    search_stats: Optional[Dict[str, int]] = None
+    # [elapsed seconds, objective] per improving solution of the search
+    convergence: Optional[List[List[float]]] = None
 
 
 class VRPOutput(BaseModel):
     total_delivery_duration: int
     routes: Dict[str, Route]
-    metadata: Optional[VRPMetadata] = None
\ No newline at end of file
+    metadata: Optional[VRPMetadata] = None
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    created_at: datetime
+    elapsed_seconds: float
+    improvements: int = 0
+    best_objective: Optional[int] = None
+    best_routes: Optional[Dict[str, List[int]]] = None
+    result: Optional[VRPOutput] = None
+    error: Optional[Dict[str, Any]] = None
+
+class PlanStatus(BaseModel):
+    plan_id: str
+    version: int
+    created_at: datetime
+    updated_at: datetime
+    result: VRPOutput
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str
+    result: Optional[VRPOutput] = None
+    error: Optional[Dict[str, Any]] = None
+
+
+class BatchSolveOutput(BaseModel):
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class MatrixInfo(BaseModel):
+    matrix_id: str
+    size: int
+    bytes: int
+
+
+class SolutionPage(BaseModel):
+    # stored solutions, newest first; items hold only the requested fields plus id and timestamp
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,6 @@
 """Services module."""
 
 from .vrp_service import VRPService
+from .solver_executor import SolverExecutor
 
-__all__ = ['VRPService']
\ No newline at end of file
+__all__ = ['VRPService', 'SolverExecutor']
\ No newline at end of file
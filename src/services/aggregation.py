@@ -0,0 +1,43 @@
+"""Collapsing co-located jobs into one routing node per location.
+
+The routing model has one node per location that hosts jobs or a vehicle start; locations with
+neither are left out, so the search never has to visit them. All jobs at an address are served in
+a single visit: the node carries their summed demand and service time, and extracted routes list
+the node's jobs in input order.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from ..schemas.request_models import Job, VRPInput
+
+
+class JobAggregation:
+
+    def __init__(self, data: VRPInput):
+        self.location_jobs: Dict[int, List[Job]] = {}
+        # jobs without a delivery still take one unit of capacity
+        self.demands: Dict[int, int] = {}
+        self.services: Dict[int, int] = {}
+        for job in data.jobs:
+            location = job.location_index
+            self.location_jobs.setdefault(location, []).append(job)
+            self.demands[location] = self.demands.get(location, 0) + (job.delivery[0] if job.delivery else 1)
+            self.services[location] = self.services.get(location, 0) + (job.service or 0)
+        self.job_count = len(data.jobs)
+        # model node -> matrix location, in location order
+        self.locations = np.asarray(
+            sorted(set(self.location_jobs) | {v.start_index for v in data.vehicles}), dtype=np.int64
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.location_jobs)
+
+    def demand_vector(self, size: int) -> np.ndarray:
+        # indexed by location
+        vec = np.zeros(size, dtype=np.int64)
+        for location, demand in self.demands.items():
+            vec[location] = demand
+        return vec
@@ -0,0 +1,68 @@
+"""Fan a batch of independent VRP problems out over the solver pool."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Union
+
+from pydantic import ValidationError
+
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import BatchItemResult, VRPOutput
+from ..exceptions import VRPException, VRPError, VRPSystemError, ErrorCode
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+OK = "ok"
+ERROR = "error"
+
+
+def parse_problems(payloads: List[Dict[str, Any]]) -> List[Union[VRPInput, VRPException]]:
+    # validate item by item so one malformed problem does not reject the whole batch
+    problems = []
+    for payload in payloads:
+        try:
+            problems.append(VRPInput.model_validate(payload))
+        except ValidationError as e:
+            problems.append(VRPError(ErrorCode.VALIDATION_ERROR, details={"details": str(e)}))
+        except Exception as e:
+            # decoding errors pydantic does not wrap, e.g. OverflowError for out-of-range matrix values
+            problems.append(VRPError(ErrorCode.VALIDATION_ERROR, details={"details": f"{type(e).__name__}: {e}"}))
+    return problems
+
+
+def item_result(index: int, outcome: Union[VRPOutput, VRPException]) -> BatchItemResult:
+    if isinstance(outcome, VRPException):
+        return BatchItemResult(
+            index=index,
+            status=ERROR,
+            error={"code": outcome.error_code.value, "message": outcome.message, "details": outcome.details or None}
+        )
+    return BatchItemResult(index=index, status=OK, result=outcome)
+
+
+async def solve_batch(problems: List[Union[VRPInput, VRPException]],
+                      solve: Callable[[VRPInput], Awaitable[VRPOutput]],
+                      concurrency: int) -> AsyncIterator[BatchItemResult]:
+    # yields one result per problem, in completion order; at most `concurrency` solves run at once
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index: int, problem: Union[VRPInput, VRPException]) -> BatchItemResult:
+        if isinstance(problem, VRPException):
+            return item_result(index, problem)
+        async with semaphore:
+            try:
+                return item_result(index, await solve(problem))
+            except VRPException as e:
+                return item_result(index, e)
+            except Exception as e:
+                logger.error(f"Batch item {index} failed: {str(e)}", exc_info=True)
+                return item_result(index, VRPSystemError(ErrorCode.INTERNAL_ERROR, f"Unexpected error: {str(e)}"))
+
+    tasks = [asyncio.ensure_future(run(index, problem)) for index, problem in enumerate(problems)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # client went away mid-stream: do not keep solving for nobody
+        for task in tasks:
+            task.cancel()
\ No newline at end of file
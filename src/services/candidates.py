@@ -0,0 +1,52 @@
+"""Candidate successor lists that restrict which arcs the routing model may use."""
+
+from typing import List
+
+import numpy as np
+
+# rows of the matrix ranked at a time, bounding the temporary copy to ROW_CHUNK x N
+ROW_CHUNK = 1024
+
+
+def nearest_neighbors(matrix: np.ndarray, k: int) -> np.ndarray:
+    # (N, k) indices of each location's k nearest successors, self excluded, in no particular order
+    n = len(matrix)
+    k = min(k, n - 1)
+    out = np.empty((n, k), dtype=np.int64)
+    for lo in range(0, n, ROW_CHUNK):
+        rows = matrix[lo:lo + ROW_CHUNK].astype(np.float64)
+        rows[np.arange(len(rows)), np.arange(lo, lo + len(rows))] = np.inf
+        out[lo:lo + len(rows)] = np.argpartition(rows, k - 1, axis=1)[:, :k]
+    return out
+
+
+def spanning_tree(matrix: np.ndarray) -> np.ndarray:
+    # (N-1, 2) edges of a minimum spanning tree over round-trip distances (Prim, one vectorised row per step)
+    n = len(matrix)
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    best = (matrix[0] + matrix[:, 0]).astype(np.float64)
+    parent = np.zeros(n, dtype=np.int64)
+    edges = np.empty((n - 1, 2), dtype=np.int64)
+    for step in range(n - 1):
+        best[in_tree] = np.inf
+        node = int(best.argmin())
+        edges[step] = (parent[node], node)
+        in_tree[node] = True
+        round_trip = matrix[node] + matrix[:, node]
+        closer = round_trip < best
+        best[closer] = round_trip[closer]
+        parent[closer] = node
+    return edges
+
+
+def candidate_successors(matrix: np.ndarray, k: int) -> List[np.ndarray]:
+    # j is a candidate after i when j is among i's k nearest or i among j's; spanning tree arcs are added
+    # so that clustered instances do not fall apart into unconnected groups
+    n = len(matrix)
+    knn = nearest_neighbors(matrix, k)
+    tree = spanning_tree(matrix)
+    src = np.concatenate([np.repeat(np.arange(n), knn.shape[1]), tree[:, 0]])
+    dst = np.concatenate([knn.ravel(), tree[:, 1]])
+    keys = np.unique(np.concatenate([src * n + dst, dst * n + src]))
+    return np.split(keys % n, np.searchsorted(keys // n, np.arange(1, n)))
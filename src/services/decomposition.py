@@ -0,0 +1,259 @@
+"""Cluster-first, route-second solving of large instances.
+
+Job locations are grouped by k-medoids on the (symmetrised) travel matrix, every cluster gets
+vehicles by capacity, the clusters are solved as independent subproblems and the merged plan
+gets a relocate pass across cluster boundaries.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .aggregation import JobAggregation
+from .route_repair import insertion_deltas, route_loads
+from .solve_context import SolveContext
+from ..schemas.request_models import VRPInput, WarmStart
+from ..schemas.response_models import Route, VRPOutput
+
+DEFAULT_CLUSTER_SIZE = 150
+MAX_KMEDOIDS_ITERATIONS = 10
+# medoid updates compare members against at most this many others of the same cluster
+MEDOID_SAMPLE = 500
+# a node is on a boundary when another medoid is at most this much farther than its own
+BOUNDARY_RATIO = 1.5
+MAX_REPAIR_PASSES = 3
+
+
+def pair_distances(matrix: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # round-trip distance, so clustering also works on asymmetric matrices
+    return matrix[np.ix_(rows, cols)].astype(np.int64) + matrix[np.ix_(cols, rows)].T
+
+
+def k_medoids(matrix: np.ndarray, nodes: np.ndarray, k: int, seed: int):
+    # k-medoids++ seeding followed by alternating assignment / medoid update; returns (medoids, labels, distances)
+    rng = np.random.default_rng(seed)
+    medoids = [int(nodes[rng.integers(len(nodes))])]
+    closest = pair_distances(matrix, nodes, np.asarray(medoids))[:, 0].astype(np.float64)
+    while len(medoids) < k:
+        weights = closest ** 2
+        if weights.sum() > 0:
+            pick = rng.choice(len(nodes), p=weights / weights.sum())
+        else:
+            pick = rng.choice(np.flatnonzero(~np.isin(nodes, medoids)))
+        medoids.append(int(nodes[pick]))
+        closest = np.minimum(closest, pair_distances(matrix, nodes, nodes[pick:pick + 1])[:, 0])
+
+    medoids = np.asarray(medoids)
+    for _ in range(MAX_KMEDOIDS_ITERATIONS):
+        distances = pair_distances(matrix, nodes, medoids)
+        labels = distances.argmin(axis=1)
+        updated = medoids.copy()
+        for c in range(k):
+            members = nodes[labels == c]
+            if len(members) == 0:
+                continue
+            sample = members if len(members) <= MEDOID_SAMPLE else rng.choice(members, MEDOID_SAMPLE, replace=False)
+            updated[c] = members[pair_distances(matrix, members, sample).sum(axis=1).argmin()]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+    distances = pair_distances(matrix, nodes, medoids)
+    return medoids, distances.argmin(axis=1), distances
+
+
+class Decomposition:
+    # how one problem was split: node clusters, the vehicles of each cluster, and the merge/repair back
+
+    def __init__(self, data: VRPInput, nodes: np.ndarray, medoids: np.ndarray, labels: np.ndarray,
+                 distances: np.ndarray, vehicle_clusters: List[List[int]]):
+        self.data = data
+        self.matrix = data.matrix_array()
+        self.nodes = nodes
+        self.medoids = medoids
+        self.labels = labels
+        self.distances = distances
+        # vehicle positions (in data.vehicles) per cluster
+        self.vehicle_clusters = vehicle_clusters
+        self.starts = [v.start_index for v in data.vehicles]
+        self.job_nodes = {j.id: j.location_index for j in data.jobs}
+        # same per-node demand/service the solver model uses, so rebuilt routes report the same figures
+        aggregation = JobAggregation(data)
+        self.ctx = SolveContext(data, self.matrix, aggregation)
+        # merged plans and the repair work on locations, not model nodes
+        self.demand = aggregation.demand_vector(len(self.matrix))
+
+    @property
+    def clusters(self) -> int:
+        return len(self.vehicle_clusters)
+
+    def subproblems(self, budget_seconds: float) -> List[VRPInput]:
+        # one VRPInput per cluster over local indices; vehicle and job ids stay global
+        hint = self.data.warm_start.routes if self.data.warm_start and self.data.warm_start.routes else None
+        out = []
+        for c, vehicle_positions in enumerate(self.vehicle_clusters):
+            vehicles = [self.data.vehicles[v] for v in vehicle_positions]
+            starts = list(dict.fromkeys(v.start_index for v in vehicles))
+            local = np.asarray(starts + self.nodes[self.labels == c].tolist())
+            position = {int(node): i for i, node in enumerate(local)}
+            warm_start = None
+            if hint:
+                warm_start = WarmStart(routes={str(v.id): hint.get(str(v.id), []) for v in vehicles})
+            out.append(VRPInput.from_matrix_array(
+                vehicles=[v.model_copy(update={"start_index": position[v.start_index]}) for v in vehicles],
+                jobs=[j.model_copy(update={"location_index": position[j.location_index]})
+                      for j in self.data.jobs if j.location_index in position],
+                matrix=np.ascontiguousarray(self.matrix[np.ix_(local, local)]),
+                random_seed=self.data.random_seed,
+                warm_start=warm_start,
+                deadline_seconds=budget_seconds,
+                candidate_neighbors=self.data.candidate_neighbors,
+                decompose=False
+            ))
+        return out
+
+    def merge(self, outputs: Sequence[VRPOutput]) -> List[List[int]]:
+        # per vehicle (in data.vehicles order), the global node sequence after its start
+        routes: List[List[int]] = [[] for _ in self.data.vehicles]
+        index = {str(v.id): i for i, v in enumerate(self.data.vehicles)}
+        for output in outputs:
+            for vehicle_id, route in output.routes.items():
+                v = index[vehicle_id]
+                for job_id in route.jobs:
+                    node = self.job_nodes[job_id]
+                    if node != self.starts[v] and (not routes[v] or routes[v][-1] != node):
+                        routes[v].append(node)
+        return routes
+
+    def boundary_nodes(self) -> Dict[int, List[int]]:
+        # boundary node -> vehicles of every cluster whose medoid is about as close as its own
+        if self.clusters < 2:
+            return {}
+        nearest = self.distances.min(axis=1, keepdims=True)
+        near = self.distances <= np.maximum(nearest * BOUNDARY_RATIO, nearest)
+        out = {}
+        for i in np.flatnonzero(near.sum(axis=1) > 1):
+            out[int(self.nodes[i])] = [v for c in np.flatnonzero(near[i]) for v in self.vehicle_clusters[c]]
+        return out
+
+    def repair(self, routes: List[List[int]], deadline: float) -> int:
+        # relocate boundary nodes to a neighbouring cluster's route when that shortens the plan
+        boundary = self.boundary_nodes()
+        if not boundary:
+            return 0
+        matrix, demand = self.matrix, self.demand
+        caps = [v.capacity[0] if v.capacity else None for v in self.data.vehicles]
+        loads = route_loads(demand, routes)
+        route_of = {node: v for v, route in enumerate(routes) for node in route}
+        moves = 0
+        for _ in range(MAX_REPAIR_PASSES):
+            improved = False
+            for node, candidates in boundary.items():
+                if time.time() >= deadline:
+                    return moves
+                v = route_of[node]
+                route = routes[v]
+                p = route.index(node)
+                prev = self.starts[v] if p == 0 else route[p - 1]
+                gain = int(matrix[prev, node])
+                if p + 1 < len(route):
+                    gain += int(matrix[node, route[p + 1]] - matrix[prev, route[p + 1]])
+
+                best = None
+                for w in candidates:
+                    if w == v or (caps[w] is not None and loads[w] + demand[node] > caps[w]):
+                        continue
+                    deltas = insertion_deltas(matrix, self.starts[w], routes[w], node)
+                    position = int(np.argmin(deltas))
+                    if deltas[position] < gain and (best is None or deltas[position] < best[0]):
+                        best = (deltas[position], w, position)
+                if best is None:
+                    continue
+                _, w, position = best
+                route.pop(p)
+                routes[w].insert(position, node)
+                loads[v] -= int(demand[node])
+                loads[w] += int(demand[node])
+                route_of[node] = w
+                moves += 1
+                improved = True
+            if not improved:
+                break
+        return moves
+
+    def to_routes(self, routes: List[List[int]]) -> Dict[str, Route]:
+        # Route figures as VRPService._extract_routes reports them for the same location sequence
+        return self.ctx.routes_from_nodes([self.ctx.to_nodes([start] + route) for start, route in zip(self.starts, routes)])
+
+
+def decompose(data: VRPInput, cluster_size: int, seed: int) -> Optional[Decomposition]:
+    # None when splitting does not pay off or no capacity-feasible split was found
+    starts = {v.start_index for v in data.vehicles}
+    nodes = np.asarray(sorted({j.location_index for j in data.jobs} - starts), dtype=np.int64)
+    k = min(math.ceil(len(nodes) / max(cluster_size, 1)), len(data.vehicles))
+    if k <= 1:
+        return None
+
+    matrix = data.matrix_array()
+    medoids, labels, distances = k_medoids(matrix, nodes, k, seed)
+    demand = JobAggregation(data).demand_vector(len(matrix))
+    vehicle_clusters = _assign_vehicles(data, matrix, medoids, labels, demand[nodes])
+    if not _rebalance(labels, distances, vehicle_clusters, data, demand[nodes]):
+        return None
+    return Decomposition(data, nodes, medoids, labels, distances, vehicle_clusters)
+
+
+def _capacities(data: VRPInput) -> np.ndarray:
+    return np.asarray([v.capacity[0] if v.capacity else np.inf for v in data.vehicles], dtype=np.float64)
+
+
+def _assign_vehicles(data: VRPInput, matrix: np.ndarray, medoids: np.ndarray, labels: np.ndarray,
+                     node_demand: np.ndarray) -> List[List[int]]:
+    # every cluster first gets its nearest free vehicle, heaviest cluster first; the remaining vehicles
+    # go to whichever cluster is short of capacity, or else most loaded relative to its capacity
+    k = len(medoids)
+    caps = _capacities(data)
+    starts = np.asarray([v.start_index for v in data.vehicles])
+    reach = pair_distances(matrix, starts, medoids)
+    demand = np.bincount(labels, weights=node_demand, minlength=k)
+    capacity = np.zeros(k)
+    clusters: List[List[int]] = [[] for _ in range(k)]
+    free = set(range(len(data.vehicles)))
+
+    def give(c: int) -> None:
+        v = min(free, key=lambda i: (reach[i, c], i))
+        free.remove(v)
+        clusters[c].append(v)
+        capacity[c] += caps[v]
+
+    for c in np.argsort(-demand, kind="stable"):
+        give(int(c))
+    while free:
+        shortfall = demand - capacity
+        if shortfall.max() > 0:
+            give(int(shortfall.argmax()))
+        else:
+            give(int(np.divide(demand, capacity, out=np.zeros(k), where=np.isfinite(capacity)).argmax()))
+    return clusters
+
+
+def _rebalance(labels: np.ndarray, distances: np.ndarray, vehicle_clusters: List[List[int]], data: VRPInput,
+               node_demand: np.ndarray) -> bool:
+    # moves the outermost nodes of over-capacity clusters to the nearest cluster with room; updates labels
+    k = len(vehicle_clusters)
+    caps = _capacities(data)
+    capacity = np.asarray([caps[vs].sum() for vs in vehicle_clusters])
+    load = np.bincount(labels, weights=node_demand, minlength=k)
+    for c in np.flatnonzero(load > capacity):
+        members = np.flatnonzero(labels == c)
+        for i in members[np.argsort(-distances[members, c], kind="stable")]:
+            if load[c] <= capacity[c]:
+                break
+            for target in np.argsort(distances[i], kind="stable"):
+                if target != c and load[target] + node_demand[i] <= capacity[target]:
+                    labels[i] = target
+                    load[c] -= node_demand[i]
+                    load[target] += node_demand[i]
+                    break
+    return bool((load <= capacity).all())
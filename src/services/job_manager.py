@@ -0,0 +1,235 @@
+"""Asynchronous solve jobs: submit, poll, stream progress and stop early."""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from .solver_executor import SolverExecutor
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import JobStatus, VRPOutput
+from ..exceptions import VRPException, VRPError, VRPSystemError, ErrorCode
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class SolveJob:
+
+    def __init__(self, job_id: str, stop_event: Any):
+        self.id = job_id
+        self.status = QUEUED
+        self.created_at = datetime.utcnow()
+        self._started = time.monotonic()
+        self._finished_at: Optional[float] = None
+        self.best_objective: Optional[int] = None
+        self.best_routes: Optional[Dict[str, List[int]]] = None
+        self.result: Optional[VRPOutput] = None
+        self.error: Optional[Dict[str, Any]] = None
+        self.events: List[Dict[str, Any]] = []
+        self.improvements = 0
+        # manager proxy shared with the solver worker
+        self.stop_event = stop_event
+        self._updated = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        if event["type"] == "started":
+            self.status = RUNNING
+        elif event["type"] == "improvement":
+            # portfolio searches report independently; only keep what beats every search so far
+            if self.best_objective is not None and event["objective"] >= self.best_objective:
+                return
+            self.improvements += 1
+            self.best_objective = event["objective"]
+            self.best_routes = event["routes"]
+        self.events.append(event)
+        # wake every waiter, then arm a fresh event for the next update
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def complete(self, result: VRPOutput) -> None:
+        self.result = result
+        self.best_objective = result.metadata.objective_value if result.metadata else self.best_objective
+        self.best_routes = {vid: route.jobs for vid, route in result.routes.items()}
+        self.status = COMPLETED
+        self._finished_at = time.monotonic()
+        self.publish({"type": COMPLETED})
+
+    def fail(self, error: VRPException) -> None:
+        self.error = {"code": error.error_code.value, "message": error.message}
+        self.status = FAILED
+        self._finished_at = time.monotonic()
+        self.publish({"type": FAILED, "error": self.error})
+
+    async def wait_for_update(self, seen: int) -> None:
+        while len(self.events) <= seen and not self.finished:
+            await self._updated.wait()
+
+    def snapshot(self) -> JobStatus:
+        end = self._finished_at or time.monotonic()
+        return JobStatus(
+            job_id=self.id,
+            status=self.status,
+            created_at=self.created_at,
+            elapsed_seconds=round(end - self._started, 3),
+            improvements=self.improvements,
+            best_objective=self.best_objective,
+            best_routes=self.best_routes,
+            result=self.result,
+            error=self.error
+        )
+
+
+class JobManager:
+
+    def __init__(self, executor: SolverExecutor, max_jobs: Optional[int] = None):
+        self.executor = executor
+        self.max_jobs = max_jobs or int(os.getenv("VRP_JOBS_MAX", 1000))
+        self._jobs: "OrderedDict[str, SolveJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self._channel_manager = None
+        self._starting: Optional[asyncio.Future] = None
+        self._events: Any = None
+        self._pump: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # jobs whose solve has returned, waiting for the pump to hand over their last events
+        self._flushed: Dict[str, asyncio.Future] = {}
+
+    async def _channels(self):
+        # queues/events that solver worker processes can reach; the manager process is started on first use,
+        # in a thread, since spawning it would otherwise block the event loop
+        if self._starting is None:
+            self._loop = asyncio.get_running_loop()
+            self._starting = asyncio.ensure_future(self._loop.run_in_executor(None, self._start_channels))
+        await asyncio.shield(self._starting)
+        return self._channel_manager
+
+    def _start_channels(self) -> None:
+        self._channel_manager = multiprocessing.Manager()
+        # one event queue for every job, read by one pump thread
+        self._events = self._channel_manager.Queue()
+        self._pump = threading.Thread(target=self._run_pump, name="vrp-job-events", daemon=True)
+        self._pump.start()
+
+    def _run_pump(self) -> None:
+        # blocks on the shared queue and hands each event to the loop; None stops the pump
+        while True:
+            try:
+                item = self._events.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._dispatch, *item)
+            except RuntimeError:
+                # the loop has closed under us
+                return
+
+    def _dispatch(self, job_id: str, event: Optional[Dict[str, Any]]) -> None:
+        # a None event is _run's flush marker: every event the worker sent has been published
+        if event is None:
+            flushed = self._flushed.pop(job_id, None)
+            if flushed is not None and not flushed.done():
+                flushed.set_result(None)
+            return
+        job = self._jobs.get(job_id)
+        if job is not None and not job.finished:
+            job.publish(event)
+
+    async def submit(self, data: VRPInput) -> SolveJob:
+        if self.executor.in_flight >= self.executor.capacity:
+            raise VRPSystemError(
+                ErrorCode.SOLVER_BUSY,
+                details={"in_flight": self.executor.in_flight, "capacity": self.executor.capacity}
+            )
+
+        channels = await self._channels()
+        loop = asyncio.get_running_loop()
+        job = SolveJob(uuid.uuid4().hex, await loop.run_in_executor(None, channels.Event))
+        self._jobs[job.id] = job
+        self._evict_finished()
+
+        task = loop.create_task(self._run(job, data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Solve job {job.id} submitted: {len(data.vehicles)} vehicles, {len(data.jobs)} jobs")
+        return job
+
+    def get(self, job_id: str) -> SolveJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise VRPError(ErrorCode.JOB_NOT_FOUND, details={"job_id": job_id})
+        return job
+
+    def stop(self, job_id: str) -> SolveJob:
+        job = self.get(job_id)
+        if not job.finished:
+            job.stop_event.set()
+            logger.info(f"Solve job {job_id} asked to stop early")
+        return job
+
+    async def _run(self, job: SolveJob, data: VRPInput) -> None:
+        try:
+            try:
+                result = await self.executor.solve(data, channel=(self._events, job.stop_event, job.id))
+            finally:
+                await self._flush(job)
+            job.complete(result)
+        except VRPException as e:
+            job.fail(e)
+        except Exception as e:
+            logger.error(f"Solve job {job.id} failed: {str(e)}", exc_info=True)
+            job.fail(VRPSystemError(ErrorCode.INTERNAL_ERROR, f"Unexpected error in solve job: {str(e)}"))
+        logger.info(f"Solve job {job.id} {job.status}")
+
+    async def _flush(self, job: SolveJob) -> None:
+        # the worker's puts all landed before its result came back, so a marker queued now reaches the pump
+        # after the job's last event
+        loop = asyncio.get_running_loop()
+        flushed = self._flushed[job.id] = loop.create_future()
+        await loop.run_in_executor(None, self._events.put, (job.id, None))
+        await flushed
+
+    def _evict_finished(self) -> None:
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished]:
+            del self._jobs[job_id]
+            if len(self._jobs) <= self.max_jobs:
+                return
+
+    async def shutdown(self) -> None:
+        for job in self._jobs.values():
+            if not job.finished:
+                job.stop_event.set()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._starting is not None:
+            await asyncio.gather(self._starting, return_exceptions=True)
+        if self._channel_manager is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._stop_channels)
+            self._channel_manager = None
+            self._starting = None
+
+    def _stop_channels(self) -> None:
+        self._events.put(None)
+        self._pump.join(5.0)
+        self._channel_manager.shutdown()
@@ -0,0 +1,131 @@
+"""Stateful plan sessions: solve once, then re-optimise incrementally as jobs and vehicles change."""
+
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .solver_executor import SolverExecutor
+from ..schemas.request_models import PlanDelta, VRPInput, WarmStart
+from ..schemas.response_models import PlanStatus, VRPOutput
+from ..exceptions import VRPError, ErrorCode
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+
+class PlanSession:
+
+    def __init__(self, plan_id: str, data: VRPInput, result: VRPOutput):
+        self.id = plan_id
+        # the problem as it stands after every applied delta, without per-request fields
+        self.data = data
+        self.result = result
+        self.version = 1
+        self.created_at = datetime.utcnow()
+        self.updated_at = self.created_at
+        # deltas of one plan are applied one at a time, each on top of the previous result
+        self.lock = asyncio.Lock()
+
+    def update(self, data: VRPInput, result: VRPOutput) -> None:
+        self.data = data
+        self.result = result
+        self.version += 1
+        self.updated_at = datetime.utcnow()
+
+    def snapshot(self) -> PlanStatus:
+        return PlanStatus(
+            plan_id=self.id,
+            version=self.version,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            result=self.result
+        )
+
+
+class PlanManager:
+
+    def __init__(self, executor: SolverExecutor, max_plans: Optional[int] = None, refine_seconds: Optional[float] = None):
+        self.executor = executor
+        self.max_plans = max_plans or int(os.getenv("VRP_PLANS_MAX", 1000))
+        # budget of the local search after a delta; the insertion/removal heuristics run before it
+        self.refine_seconds = refine_seconds or float(os.getenv("VRP_PLAN_REFINE_SECONDS", 0.5))
+        self._plans: "OrderedDict[str, PlanSession]" = OrderedDict()
+
+    async def create(self, data: VRPInput) -> PlanSession:
+        result = await self.executor.solve(data)
+        plan = PlanSession(uuid.uuid4().hex, data.model_copy(update={"warm_start": None, "deadline_seconds": None}), result)
+        self._plans[plan.id] = plan
+        # least recently used plans go first
+        while len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+        logger.info(f"Plan {plan.id} created: {len(data.vehicles)} vehicles, {len(data.jobs)} jobs")
+        return plan
+
+    def get(self, plan_id: str) -> PlanSession:
+        plan = self._plans.get(plan_id)
+        if plan is None:
+            raise VRPError(ErrorCode.PLAN_NOT_FOUND, details={"plan_id": plan_id})
+        self._plans.move_to_end(plan_id)
+        return plan
+
+    def delete(self, plan_id: str) -> None:
+        self.get(plan_id)
+        del self._plans[plan_id]
+        logger.info(f"Plan {plan_id} deleted")
+
+    async def apply(self, plan_id: str, delta: PlanDelta, received_at: Optional[float] = None) -> PlanSession:
+        plan = self.get(plan_id)
+        async with plan.lock:
+            data = self._edited_problem(plan, delta)
+            # current routes minus removed jobs and vehicles are the warm start; the solver inserts the
+            # new and orphaned jobs at their cheapest feasible positions before the short search
+            request = data.model_copy(update={
+                "warm_start": WarmStart(routes=self._current_routes(plan, data)),
+                "deadline_seconds": delta.refine_seconds or self.refine_seconds,
+                "portfolio_size": 1,
+                "decompose": False
+            })
+            request.mark_received(received_at or time.time())
+            result = await self.executor.solve(request)
+            plan.update(data, result)
+        logger.info(
+            f"Plan {plan_id} v{plan.version}: +{len(delta.add_jobs)} jobs, -{len(delta.remove_jobs)} jobs, "
+            f"-{len(delta.unavailable_vehicles)} vehicles, total={result.total_delivery_duration}"
+        )
+        return plan
+
+    def _edited_problem(self, plan: PlanSession, delta: PlanDelta) -> VRPInput:
+        data = plan.data
+        job_ids = {j.id for j in data.jobs}
+        vehicle_ids = {v.id for v in data.vehicles}
+        problems: List[str] = []
+        unknown_jobs = sorted(set(delta.remove_jobs) - job_ids)
+        if unknown_jobs:
+            problems.append(f"jobs not in the plan: {unknown_jobs}")
+        added = [j.id for j in delta.add_jobs]
+        duplicates = sorted({jid for jid in added if added.count(jid) > 1} | (set(added) & (job_ids - set(delta.remove_jobs))))
+        if duplicates:
+            problems.append(f"jobs already in the plan: {duplicates}")
+        unknown_vehicles = sorted(set(delta.unavailable_vehicles) - vehicle_ids)
+        if unknown_vehicles:
+            problems.append(f"vehicles not in the plan: {unknown_vehicles}")
+        if not vehicle_ids - set(delta.unavailable_vehicles):
+            problems.append("no vehicle would be left")
+        if problems:
+            raise VRPError(ErrorCode.VALIDATION_ERROR, details={"details": "; ".join(problems)})
+
+        removed = set(delta.remove_jobs)
+        unavailable = set(delta.unavailable_vehicles)
+        # the matrix keeps every location; one left without jobs is not a routing node, so it is not visited
+        return data.model_copy(update={
+            "jobs": [j for j in data.jobs if j.id not in removed] + list(delta.add_jobs),
+            "vehicles": [v for v in data.vehicles if v.id not in unavailable]
+        })
+
+    def _current_routes(self, plan: PlanSession, data: VRPInput) -> Dict[str, List[int]]:
+        kept = {str(v.id) for v in data.vehicles}
+        return {vid: route.jobs for vid, route in plan.result.routes.items() if vid in kept}
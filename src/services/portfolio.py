@@ -0,0 +1,62 @@
+"""Multi-start portfolio: several differently configured searches on the same problem, best one wins."""
+
+from typing import List, Optional, Sequence, Tuple
+
+from ..schemas.response_models import VRPOutput
+
+# (first solution strategy, local search metaheuristic); the first entry is the single-search default.
+# SWEEP is left out: it needs node coordinates, which the models do not have, so it never finds a solution
+PORTFOLIO: List[Tuple[str, str]] = [
+    ("PATH_CHEAPEST_ARC", "GUIDED_LOCAL_SEARCH"),
+    ("SAVINGS", "GUIDED_LOCAL_SEARCH"),
+    ("PARALLEL_CHEAPEST_INSERTION", "GUIDED_LOCAL_SEARCH"),
+    ("PATH_CHEAPEST_ARC", "SIMULATED_ANNEALING"),
+    ("CHRISTOFIDES", "GUIDED_LOCAL_SEARCH"),
+    ("PATH_CHEAPEST_ARC", "TABU_SEARCH"),
+    ("LOCAL_CHEAPEST_INSERTION", "GUIDED_LOCAL_SEARCH"),
+]
+
+
+class SearchConfig:
+    # one member of a portfolio; picklable so it can travel to a solver worker process
+
+    def __init__(self, first_solution_strategy: str, metaheuristic: str, seed: int, time_budget: Optional[float] = None):
+        self.first_solution_strategy = first_solution_strategy
+        self.metaheuristic = metaheuristic
+        self.seed = seed
+        # seconds of search chosen by the tuner; the request deadline still applies on top
+        self.time_budget = time_budget
+
+    @property
+    def label(self) -> str:
+        return f"{self.first_solution_strategy}+{self.metaheuristic}/seed={self.seed}"
+
+    def first_solution_enum(self) -> int:
+        from ortools.constraint_solver import routing_enums_pb2
+        return getattr(routing_enums_pb2.FirstSolutionStrategy, self.first_solution_strategy)
+
+    def metaheuristic_enum(self) -> int:
+        from ortools.constraint_solver import routing_enums_pb2
+        return getattr(routing_enums_pb2.LocalSearchMetaheuristic, self.metaheuristic)
+
+
+def strategy_pair(label: str) -> Optional[Tuple[str, str]]:
+    # inverse of SearchConfig.label, without the seed
+    pair = label.split("/", 1)[0].split("+")
+    return (pair[0], pair[1]) if len(pair) == 2 else None
+
+
+def portfolio_configs(size: int, base_seed: int) -> List[SearchConfig]:
+    # strategy pairs first, then the same pairs again with fresh seeds; all members share the request deadline
+    return [SearchConfig(*PORTFOLIO[i % len(PORTFOLIO)], seed=base_seed + i) for i in range(size)]
+
+
+def pick_best(outcomes: Sequence[Optional[VRPOutput]]) -> Optional[int]:
+    # lowest total duration wins; ties go to the earlier (more conventional) configuration
+    best = None
+    for i, output in enumerate(outcomes):
+        if output is None:
+            continue
+        if best is None or output.total_delivery_duration < outcomes[best].total_delivery_duration:
+            best = i
+    return best
\ No newline at end of file
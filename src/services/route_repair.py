@@ -0,0 +1,79 @@
+"""Cheap construction heuristics for completing partial route plans."""
+
+from typing import List, Optional
+
+import numpy as np
+
+from .solve_context import SolveContext
+
+
+def route_loads(demand: np.ndarray, routes: List[List[int]]) -> List[int]:
+    return [int(demand[route].sum()) if route else 0 for route in routes]
+
+
+def insertion_deltas(matrix: np.ndarray, start: int, route: List[int], node: int) -> np.ndarray:
+    # extra travel for inserting node after each position of start + route; the virtual sink costs 0
+    path = np.asarray([start] + route)
+    d_in = matrix[path, node]
+    d_out = np.append(matrix[node, path[1:]], 0)
+    d_old = np.append(matrix[path[:-1], path[1:]], 0)
+    return d_in + d_out - d_old
+
+
+def insert_missing_nodes(ctx: SolveContext, routes: List[List[int]]) -> Optional[List[List[int]]]:
+    # every non-start node must be visited; place uncovered ones at their cheapest capacity-feasible slot
+    vehicles = ctx.data.vehicles
+    starts = ctx.starts
+    covered = set(starts)
+    for route in routes:
+        covered.update(route)
+    missing = [node for node in range(ctx.sink_index) if node not in covered]
+    if not missing:
+        return routes
+
+    routes = [list(route) for route in routes]
+    demand = ctx.demand_vector()
+    caps = [v.capacity[0] if v.capacity else None for v in vehicles]
+    loads = route_loads(demand, routes)
+
+    for node in missing:
+        best = None
+        for v, route in enumerate(routes):
+            if caps[v] is not None and loads[v] + demand[node] > caps[v]:
+                continue
+            deltas = insertion_deltas(ctx.matrix, starts[v], route, node)
+            position = int(np.argmin(deltas))
+            if best is None or deltas[position] < best[0]:
+                best = (deltas[position], v, position)
+        if best is None:
+            return None
+        _, v, position = best
+        routes[v].insert(position, node)
+        loads[v] += int(demand[node])
+    return routes
+
+
+def nearest_neighbor_routes(ctx: SolveContext) -> Optional[List[List[int]]]:
+    # greedy plan: each vehicle in turn drives to the nearest unvisited node that still fits; None when
+    # nodes are left over once every vehicle is full
+    vehicles = ctx.data.vehicles
+    starts = set(ctx.starts)
+    demand = ctx.demand_vector()
+    remaining = np.ones(ctx.sink_index, dtype=bool)
+    remaining[list(starts)] = False
+    routes: List[List[int]] = []
+    for vehicle, start in zip(vehicles, ctx.starts):
+        room = vehicle.capacity[0] if vehicle.capacity else np.inf
+        route: List[int] = []
+        current = start
+        while remaining.any():
+            reachable = remaining & (demand[:ctx.sink_index] <= room)
+            if not reachable.any():
+                break
+            node = int(np.where(reachable, ctx.matrix[current], np.iinfo(np.int64).max).argmin())
+            route.append(node)
+            remaining[node] = False
+            room -= demand[node]
+            current = node
+        routes.append(route)
+    return None if remaining.any() else routes
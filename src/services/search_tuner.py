@@ -0,0 +1,213 @@
+"""Search parameters picked from the history of earlier solves on similar instances.
+
+Every solve records the instance features, the strategy pair it ran and its objective-over-time
+curve. New requests look up their nearest recorded neighbours: the strategy pair with the best
+size-normalised objective wins, and the time budget is what those neighbours needed to converge.
+Tuned searches that found no solution are recorded too, and pairs that failed on similar instances
+more often than they succeeded are no longer picked for them.
+"""
+
+import math
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .candidates import ROW_CHUNK
+from .portfolio import PORTFOLIO, SearchConfig, strategy_pair
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import VRPOutput
+from ..repositories.vrp_repository import VRPRepository
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+# nearest records consulted per request, and how far (in feature distance) they may be
+NEIGHBORS = 25
+MAX_FEATURE_DISTANCE = 1.0
+# a run has converged once it is within this fraction of its final objective
+CONVERGENCE_TOLERANCE = 0.01
+# budget = this quantile of the neighbours' convergence times, times the margin
+BUDGET_QUANTILE = 0.9
+BUDGET_MARGIN = 1.5
+MIN_BUDGET_SECONDS = 0.5
+# curve points kept per record; later points matter most, so thinning keeps the tail
+MAX_CURVE_POINTS = 50
+
+
+def instance_features(data: VRPInput, matrix: np.ndarray, candidate_neighbors: int = 0) -> Dict[str, float]:
+    n = len(matrix)
+    if data.matrix_sparse is not None:
+        listed = sum(len(row) for row in data.neighbor_lists())
+        density = listed / max(n * (n - 1), 1)
+    elif candidate_neighbors and candidate_neighbors < n - 1:
+        density = candidate_neighbors / (n - 1)
+    else:
+        density = 1.0
+
+    tightness = 0.0
+    if data.vehicles and all(v.capacity for v in data.vehicles):
+        demand = sum(j.delivery[0] if j.delivery else 1 for j in data.jobs)
+        tightness = demand / max(sum(v.capacity[0] for v in data.vehicles), 1)
+
+    # jobs x mean distance to the nearest other location: a tour length proxy that makes objectives
+    # of differently sized and scaled instances comparable
+    scale = max(len(data.jobs), 1) * max(mean_nearest_distance(matrix), 1.0)
+    return {
+        "jobs": len(data.jobs),
+        "vehicles": len(data.vehicles),
+        "density": round(density, 4),
+        "tightness": round(tightness, 4),
+        "scale": scale
+    }
+
+
+def mean_nearest_distance(matrix: np.ndarray) -> float:
+    n = len(matrix)
+    if n < 2:
+        return 0.0
+    total = 0.0
+    for lo in range(0, n, ROW_CHUNK):
+        rows = matrix[lo:lo + ROW_CHUNK].astype(np.float64)
+        rows[np.arange(len(rows)), np.arange(lo, lo + len(rows))] = np.inf
+        total += float(rows.min(axis=1).sum())
+    return total / n
+
+
+def feature_distance(a: Dict[str, float], b: Dict[str, float]) -> float:
+    return (abs(math.log1p(a["jobs"]) - math.log1p(b["jobs"]))
+            + abs(math.log1p(a["vehicles"]) - math.log1p(b["vehicles"]))
+            + abs(a["density"] - b["density"])
+            + abs(a["tightness"] - b["tightness"]))
+
+
+def converged_at(curve: List[List[float]], objective: float) -> float:
+    # elapsed seconds of the first improvement within tolerance of the final objective
+    for elapsed, value in curve:
+        if value <= objective * (1 + CONVERGENCE_TOLERANCE):
+            return elapsed
+    return curve[-1][0] if curve else 0.0
+
+
+def thin_curve(curve: List[List[float]]) -> List[List[float]]:
+    if len(curve) <= MAX_CURVE_POINTS:
+        return curve
+    step = len(curve) / MAX_CURVE_POINTS
+    kept = [curve[int(i * step)] for i in range(MAX_CURVE_POINTS - 1)]
+    return kept + [curve[-1]]
+
+
+class SearchTuner:
+    # in-memory history, optionally mirrored to MongoDB so it survives restarts and is shared
+
+    def __init__(self, time_limit: float, repository: Optional[VRPRepository] = None, max_records: int = 5000,
+                 explore: float = 0.1, min_history: int = 5, seed: Optional[int] = None):
+        self.time_limit = time_limit
+        self.repository = None
+        self.max_records = max_records
+        # share of tuned requests that try the least explored strategy pair instead of the best one
+        self.explore = explore
+        self.min_history = min_history
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+        if repository:
+            self.attach(repository)
+
+    def attach(self, repository: VRPRepository) -> None:
+        # stored history goes before whatever was recorded in memory until the connection came up
+        try:
+            stored = repository.load_solve_history(self.max_records)
+        except Exception as e:
+            logger.warning(f"Solve history MongoDB tier unavailable: {str(e)}")
+            return
+        with self._lock:
+            merged = list(reversed(stored)) + list(self._records)
+            self._records = deque(merged[-self.max_records:], maxlen=self.max_records)
+            self.repository = repository
+        logger.info(f"Search tuner loaded {len(stored)} solve records")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def recommend(self, features: Dict[str, float], seed: int) -> Optional[SearchConfig]:
+        # None until enough similar instances were solved; callers then use the default search
+        with self._lock:
+            records = list(self._records)
+        ranked = sorted(((feature_distance(features, r), r) for r in records), key=lambda x: x[0])
+        nearest = [r for d, r in ranked[:NEIGHBORS] if d <= MAX_FEATURE_DISTANCE]
+        neighbors = [r for r in nearest if not r.get("failed")]
+        if len(neighbors) < self.min_history:
+            return None
+
+        by_pair: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for r in neighbors:
+            by_pair.setdefault((r["first_solution_strategy"], r["metaheuristic"]), []).append(r)
+        failures: Dict[Tuple[str, str], int] = {}
+        for r in nearest:
+            if r.get("failed"):
+                pair = (r["first_solution_strategy"], r["metaheuristic"])
+                failures[pair] = failures.get(pair, 0) + 1
+
+        def usable(p: Tuple[str, str]) -> bool:
+            # skip pairs that failed on similar instances more often than they succeeded
+            return failures.get(p, 0) <= len(by_pair.get(p, ()))
+
+        viable = [p for p in PORTFOLIO if usable(p)]
+        if self._rng.random() < self.explore and viable:
+            # least tried pair first, failed attempts included; ties keep portfolio order
+            pair = min(viable, key=lambda p: len(by_pair.get(p, ())) + failures.get(p, 0))
+        else:
+            ranked_pairs = [p for p in by_pair if usable(p)]
+            if not ranked_pairs:
+                return None
+            pair = min(ranked_pairs, key=lambda p: np.mean([r["objective"] / r["scale"] for r in by_pair[p]]))
+
+        converged = [r["converged_at"] for r in by_pair.get(pair) or neighbors]
+        budget = float(np.quantile(converged, BUDGET_QUANTILE)) * BUDGET_MARGIN
+        budget = min(max(budget, MIN_BUDGET_SECONDS), self.time_limit)
+        logger.info(f"Tuned search for {features['jobs']} jobs from {len(neighbors)} similar solves: {pair[0]}+{pair[1]}, {budget:.2f}s")
+        return SearchConfig(*pair, seed=seed, time_budget=budget)
+
+    def record(self, features: Dict[str, float], result: VRPOutput) -> None:
+        metadata = result.metadata
+        pair = strategy_pair(metadata.strategy) if metadata and metadata.strategy else None
+        if pair is None or not metadata.convergence:
+            return
+        objective = metadata.convergence[-1][1]
+        record = {
+            **features,
+            "first_solution_strategy": pair[0],
+            "metaheuristic": pair[1],
+            "objective": objective,
+            "curve": thin_curve(metadata.convergence),
+            "converged_at": converged_at(metadata.convergence, objective),
+            "solve_time": metadata.solve_time_seconds,
+            "truncated": metadata.truncated,
+            "autotuned": metadata.autotuned,
+            "created_at": datetime.utcnow()
+        }
+        self._store(record)
+
+    def record_failure(self, features: Dict[str, float], search: SearchConfig) -> None:
+        # a tuned search that found no solution; counts against its pair for similar instances
+        self._store({
+            **features,
+            "first_solution_strategy": search.first_solution_strategy,
+            "metaheuristic": search.metaheuristic,
+            "failed": True,
+            "created_at": datetime.utcnow()
+        })
+
+    def _store(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._records.append(record)
+        if self.repository:
+            try:
+                self.repository.save_solve_record(dict(record))
+            except Exception as e:
+                logger.warning(f"Failed to write solve record: {str(e)}")
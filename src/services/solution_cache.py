@@ -0,0 +1,119 @@
+"""Content-addressed cache of solved VRP problems."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import VRPOutput
+from ..repositories.vrp_repository import VRPRepository
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+
+def problem_key(data: VRPInput, settings: Dict[str, Any]) -> str:
+    # same vehicles, jobs, matrix, seed and search settings -> same key, whatever the matrix encoding
+    digest = hashlib.blake2b(digest_size=20)
+    header = {
+        "vehicles": [v.model_dump() for v in data.vehicles],
+        "jobs": [j.model_dump() for j in data.jobs],
+        "random_seed": data.random_seed,
+        "warm_start": data.warm_start.model_dump() if data.warm_start else None,
+        "portfolio_size": data.portfolio_size,
+        "decompose": data.decompose,
+        "candidate_neighbors": data.candidate_neighbors,
+        "sparse": data.matrix_sparse is not None,
+        "settings": settings,
+    }
+    digest.update(json.dumps(header, sort_keys=True, separators=(",", ":")).encode())
+    if data.matrix_id is not None:
+        # stored matrices are content-addressed, so the id and the locations stand for the submatrix
+        digest.update(json.dumps([data.matrix_id, data.locations]).encode())
+        return digest.hexdigest()
+    matrix = data.matrix_array()
+    digest.update(np.asarray(matrix.shape, dtype="<i8").tobytes())
+    digest.update(np.ascontiguousarray(matrix, dtype="<i8").tobytes())
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    # in-memory LRU tier with TTL, optionally backed by a MongoDB tier shared between instances
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 3600, repository: Optional[VRPRepository] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.repository = None
+        self._entries: "OrderedDict[str, Tuple[float, VRPOutput]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if repository:
+            self.attach(repository)
+
+    def attach(self, repository: VRPRepository) -> None:
+        # the MongoDB tier may arrive after startup, once the background connection succeeds
+        try:
+            repository.ensure_cache_index(self.ttl_seconds)
+            self.repository = repository
+        except Exception as e:
+            logger.warning(f"Solution cache MongoDB tier unavailable: {str(e)}")
+
+    def get(self, key: str) -> Optional[VRPOutput]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, output = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return output
+                del self._entries[key]
+
+        output = self._get_persistent(key)
+        with self._lock:
+            if output is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_local(key, output, now)
+        return output
+
+    def put(self, key: str, output: VRPOutput) -> None:
+        with self._lock:
+            self._store_local(key, output, time.monotonic())
+        if self.repository:
+            try:
+                self.repository.save_cached_solution(key, output)
+            except Exception as e:
+                logger.warning(f"Failed to write solution cache entry: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store_local(self, key: str, output: VRPOutput, stored_at: float) -> None:
+        self._entries[key] = (stored_at, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_persistent(self, key: str) -> Optional[VRPOutput]:
+        if not self.repository:
+            return None
+        try:
+            doc = self.repository.get_cached_solution(key, self.ttl_seconds)
+            return VRPOutput(**doc) if doc else None
+        except Exception as e:
+            logger.warning(f"Failed to read solution cache entry: {str(e)}")
+            return None
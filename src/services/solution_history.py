@@ -0,0 +1,48 @@
+"""Paging through stored solutions: opaque keyset cursors, field projections, public documents."""
+
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..exceptions import VRPError, ErrorCode
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# dotted paths into a stored solution, e.g. total_delivery_duration or metadata.solve_time_seconds
+_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$")
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    # position after doc in (timestamp, _id) order
+    raw = json.dumps([doc["timestamp"].isoformat(), str(doc["_id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    from bson import ObjectId
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, solution_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), ObjectId(solution_id)
+    except Exception:
+        raise VRPError(ErrorCode.VALIDATION_ERROR, details={"details": "invalid page cursor"})
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    # comma separated projection; None returns whole documents
+    if not fields:
+        return None
+    parsed = [f.strip() for f in fields.split(",") if f.strip()]
+    invalid = [f for f in parsed if not _FIELD_PATTERN.match(f) or f == "_id" or f.startswith("_id.")]
+    if invalid:
+        raise VRPError(ErrorCode.VALIDATION_ERROR, details={"details": f"invalid fields: {invalid}"})
+    return parsed or None
+
+
+def public_solution(doc: Dict[str, Any]) -> Dict[str, Any]:
+    # ObjectIds do not serialise; the id is the string form GET /solutions/{id} takes
+    out = {"id": str(doc["_id"])}
+    out.update((k, v) for k, v in doc.items() if k != "_id")
+    return out
@@ -0,0 +1,123 @@
+"""Per-solve state shared by the VRPService model-building helpers."""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .aggregation import JobAggregation
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import Route
+
+
+class SolveContext:
+    # everything one solve needs lives here, so a single VRPService can serve concurrent solves.
+    # Nodes are the model's: vehicle starts and job locations only; locations maps them back to the matrix
+
+    def __init__(self, data: VRPInput, matrix: np.ndarray, aggregation: JobAggregation):
+        self.data = data
+        self.locations = aggregation.locations
+        self.node_of: Dict[int, int] = {int(location): node for node, location in enumerate(self.locations)}
+        # travel between model nodes; the full matrix when every location is used
+        if len(self.locations) == len(matrix):
+            self.matrix = matrix
+        else:
+            self.matrix = np.ascontiguousarray(matrix[np.ix_(self.locations, self.locations)])
+        # the sink is virtual: it is the node right after the last location and is never stored in matrix
+        self.sink_index = len(self.locations)
+        self.starts = [self.node_of[v.start_index] for v in data.vehicles]
+        # per node, summed over the jobs at that location
+        self.demands = {self.node_of[location]: d for location, d in aggregation.demands.items()}
+        self.services = {self.node_of[location]: s for location, s in aggregation.services.items()}
+        self.location_jobs = {self.node_of[location]: jobs for location, jobs in aggregation.location_jobs.items()}
+        self.manager = None
+        self.routing = None
+        # search monitors/callbacks must outlive the solve, so they are kept referenced here
+        self.monitors = []
+        self.stopped_early = False
+        self._job_tables = None
+
+    def to_nodes(self, locations: Sequence[int]) -> List[int]:
+        return [self.node_of[int(location)] for location in locations]
+
+    def job_tables(self) -> Tuple[List[Tuple[int, ...]], np.ndarray, np.ndarray]:
+        # per node: job ids (expanding the node back to its jobs), load and service time; built once per solve
+        if self._job_tables is None:
+            node_jobs: List[Tuple[int, ...]] = [()] * self.node_count
+            for node, jobs in self.location_jobs.items():
+                node_jobs[node] = tuple(j.id for j in jobs)
+            self._job_tables = (node_jobs, self.demand_vector(), self.service_vector())
+        return self._job_tables
+
+    def route_nodes(self, solution) -> List[List[int]]:
+        # start node then visited nodes per vehicle, sink left out; one pass over the successor variables
+        routing, manager = self.routing, self.manager
+        size = routing.Size()
+        out = []
+        for v_idx in range(len(self.data.vehicles)):
+            index = routing.Start(v_idx)
+            nodes = [manager.IndexToNode(index)]
+            index = solution.Value(routing.NextVar(index))
+            # indices past Size() are route ends, which all map to the sink
+            while index < size:
+                nodes.append(manager.IndexToNode(index))
+                index = solution.Value(routing.NextVar(index))
+            out.append(nodes)
+        return out
+
+    def routes_from_nodes(self, node_routes: Sequence[Sequence[int]]) -> Dict[str, Route]:
+        # jobs at a start node are delivered but, like the model's time dimension, not charged service time
+        node_jobs, node_load, node_service = self.job_tables()
+        out: Dict[str, Route] = {}
+        for vehicle, nodes in zip(self.data.vehicles, node_routes):
+            seq = np.asarray(nodes, dtype=np.int64)
+            travel = int(self.matrix[seq[:-1], seq[1:]].sum()) if len(seq) > 1 else 0
+            service_sum = int(node_service[seq[1:]].sum())
+            jobs: List[int] = []
+            for node in nodes:
+                jobs.extend(node_jobs[node])
+            # the figures were just computed from validated input, so the model is built without revalidation
+            out[str(vehicle.id)] = Route.model_construct(
+                jobs=jobs,
+                delivery_duration=travel + service_sum,
+                capacity_used=int(node_load[seq].sum()),
+                total_service_time=service_sum,
+                total_distance=travel,
+                start_location=int(self.locations[nodes[0]]),
+                end_location=int(self.locations[nodes[-1]])
+            )
+        return out
+
+    @property
+    def node_count(self) -> int:
+        return self.sink_index + 1
+
+    def travel(self, from_node: int, to_node: int) -> int:
+        if from_node == self.sink_index or to_node == self.sink_index:
+            return 0
+        return int(self.matrix[from_node, to_node])
+
+    def demand_vector(self) -> np.ndarray:
+        # indexed by node; sink has no demand
+        vec = np.zeros(self.node_count, dtype=np.int64)
+        for node, demand in self.demands.items():
+            vec[node] = demand
+        return vec
+
+    def service_vector(self) -> np.ndarray:
+        vec = np.zeros(self.node_count, dtype=np.int64)
+        for node, service in self.services.items():
+            vec[node] = service
+        return vec
+
+    def transit_matrix(self, include_service: bool = False) -> List[List[int]]:
+        # OR-Tools' matrix registration takes nested lists, so the sink row/column only exists here
+        n = self.sink_index
+        out = np.zeros((n + 1, n + 1), dtype=np.int64)
+        out[:n, :n] = self.matrix
+        if include_service:
+            out += self.service_vector()
+        return out.tolist()
+
+    def horizon(self) -> int:
+        # worst case: every row travelled in full plus every service
+        return int(self.matrix.sum(axis=1).max()) + sum(self.services.values())
@@ -0,0 +1,51 @@
+"""Hooks for observing and stopping a running OR-Tools search."""
+
+import time
+from typing import Any, Dict, List
+
+# how often (seconds) the stop flag is polled from inside the search
+STOP_CHECK_INTERVAL = 0.1
+
+
+class SolveProgress:
+    # default hooks do nothing; called from inside the search, so implementations must be cheap
+
+    def on_start(self) -> None:
+        pass
+
+    def on_improvement(self, objective: int, routes: Dict[str, List[int]], elapsed: float) -> None:
+        pass
+
+    def should_stop(self) -> bool:
+        return False
+
+
+class ChannelProgress(SolveProgress):
+    # forwards progress over a (manager) queue and polls a (manager) event; works across processes.
+    # The queue is shared by every job, so events go out as (job_id, event) pairs
+
+    def __init__(self, events: Any, stop_event: Any, job_id: str):
+        self.events = events
+        self.stop_event = stop_event
+        self.job_id = job_id
+        self._last_check = 0.0
+
+    def on_start(self) -> None:
+        self.events.put((self.job_id, {"type": "started"}))
+
+    def on_improvement(self, objective: int, routes: Dict[str, List[int]], elapsed: float) -> None:
+        self.events.put((self.job_id, {
+            "type": "improvement",
+            "objective": objective,
+            "routes": routes,
+            "elapsed_seconds": round(elapsed, 3)
+        }))
+
+    def should_stop(self) -> bool:
+        # the stop flag lives in another process; only ask for it every STOP_CHECK_INTERVAL
+        now = time.monotonic()
+        if now - self._last_check < STOP_CHECK_INTERVAL:
+            return False
+        self._last_check = now
+        return self.stop_event.is_set()
+
@@ -0,0 +1,195 @@
+"""Bounded worker pool that runs VRP solves off the event loop."""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from .vrp_service import VRPService, worker_outcome
+from .solve_progress import ChannelProgress
+from .portfolio import SearchConfig, portfolio_configs
+from ..schemas.request_models import VRPInput
+from ..schemas.response_models import VRPOutput
+from ..exceptions import VRPException, VRPSystemError, ErrorCode
+from ..utils import metrics
+from ..utils.timing import PhaseTimer
+from ..utils.logger import get_service_logger
+
+logger = get_service_logger()
+
+PROCESS_MODE = "process"
+THREAD_MODE = "thread"
+
+# each worker (process or thread) owns one service instance and runs one solve at a time
+_worker_state = threading.local()
+
+
+def _init_worker(service_settings: Dict[str, Any]) -> None:
+    _worker_state.service = VRPService(repository=None, **service_settings)
+
+
+def _worker_service() -> VRPService:
+    return _worker_state.service
+
+
+def _compute_in_worker(data: VRPInput, channel: Optional[Tuple[Any, Any, str]] = None,
+                       search: Optional[SearchConfig] = None, deadline: Optional[float] = None) -> VRPOutput:
+    progress = ChannelProgress(*channel) if channel else None
+    return _worker_service().compute_solution(data, progress=progress, search=search, deadline=deadline)
+
+
+class SolverExecutor:
+
+    def __init__(self, service: VRPService, mode: Optional[str] = None, max_workers: Optional[int] = None,
+                 max_queue: Optional[int] = None):
+        self.service = service
+        self.mode = (mode or os.getenv("VRP_SOLVER_MODE", PROCESS_MODE)).lower()
+        if self.mode not in (PROCESS_MODE, THREAD_MODE):
+            raise ValueError(f"Unknown solver executor mode: {self.mode}")
+
+        self.max_workers = max_workers or int(os.getenv("VRP_SOLVER_WORKERS", 0)) or os.cpu_count() or 1
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("VRP_SOLVER_QUEUE_SIZE", self.max_workers * 2))
+        self.capacity = self.max_workers + self.max_queue
+
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pool = self._create_pool()
+        logger.info(
+            f"Solver executor started: mode={self.mode}, workers={self.max_workers}, queue={self.max_queue}"
+        )
+
+    def _create_pool(self) -> Executor:
+        initargs = (self.service.settings(),)
+        if self.mode == PROCESS_MODE:
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=initargs)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vrp-solver",
+                                  initializer=_init_worker, initargs=initargs)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    def _acquire(self, count: int = 1) -> None:
+        with self._lock:
+            if self._in_flight + count > self.capacity:
+                logger.warning(f"Solver executor saturated: {self._in_flight}/{self.capacity} in flight")
+                raise VRPSystemError(
+                    ErrorCode.SOLVER_BUSY,
+                    details={"in_flight": self._in_flight, "capacity": self.capacity}
+                )
+            self._in_flight += count
+
+    def _release(self, count: int = 1) -> None:
+        with self._lock:
+            self._in_flight -= count
+
+    async def solve(self, data: VRPInput, channel: Optional[Tuple[Any, Any, str]] = None) -> VRPOutput:
+        # channel: optional (events queue, stop event, job id) for progress reporting; the first two are manager proxies
+        timer = PhaseTimer()
+        try:
+            result = await self._solve(data, channel, timer)
+        except VRPException:
+            metrics.record_failure()
+            raise
+        return self.service.finish(data, result, timer)
+
+    async def _solve(self, data: VRPInput, channel: Optional[Tuple[Any, Any, str]], timer: PhaseTimer) -> VRPOutput:
+        loop = asyncio.get_running_loop()
+        # the budget also covers the cache lookup and waiting for a worker
+        deadline = self.service.deadline_for(data)
+        # cache and persistence stay in the parent process, shared by all workers
+        cache_key = None
+        if self.service.cache is not None:
+            with timer.span("cache_lookup"):
+                cache_key = await loop.run_in_executor(None, self.service.cache_key, data)
+                cached = await loop.run_in_executor(None, self.service.get_cached_solution, cache_key)
+            if cached is not None:
+                return cached
+
+        if data.warm_start is not None:
+            with timer.span("warm_start"):
+                data = await loop.run_in_executor(None, self.service.resolve_warm_start, data)
+
+        result = None
+        features = None
+        if self.service.should_decompose(data):
+            result = await self._solve_decomposed(data, timer, deadline)
+        if result is None:
+            # a portfolio takes one worker per search
+            size = self.service.portfolio_size_for(data, max_parallel=self.max_workers)
+            search = None
+            if size == 1 and self.service.tuner is not None:
+                with timer.span("tuning"):
+                    features, search = await loop.run_in_executor(None, self.service.tune, data)
+            self._acquire(size)
+            try:
+                dispatched = time.perf_counter()
+                if size > 1:
+                    result = await self._solve_portfolio(data, channel, size, deadline)
+                else:
+                    try:
+                        result = await loop.run_in_executor(self._pool, _compute_in_worker, data, channel, search, deadline)
+                    except VRPException as e:
+                        if not await loop.run_in_executor(None, self.service.retry_untuned, e, features, search):
+                            raise
+                        result = await loop.run_in_executor(self._pool, _compute_in_worker, data, channel, None, deadline)
+                # waiting for a free worker plus shipping the problem and result between processes
+                if result.metadata:
+                    timer.phases["queue_wait"] = max(0.0, time.perf_counter() - dispatched - result.metadata.solve_time_seconds)
+            finally:
+                self._release(size)
+
+        if features is not None:
+            await loop.run_in_executor(None, self.service.record_solve, features, result)
+        if cache_key is not None:
+            await loop.run_in_executor(None, self.service.cache_solution, cache_key, result)
+        with timer.span("persistence"):
+            await loop.run_in_executor(None, self.service.persist_solution, data, result)
+        return result
+
+    async def _solve_portfolio(self, data: VRPInput, channel: Optional[Tuple[Any, Any, str]], size: int,
+                               deadline: float) -> VRPOutput:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        configs = portfolio_configs(size, self.service.effective_seed(data))
+        futures = [
+            asyncio.wrap_future(self._pool.submit(_compute_in_worker, data, channel, config, deadline), loop=loop)
+            for config in configs
+        ]
+        await asyncio.wait(futures)
+        outcomes = [worker_outcome(future) for future in futures]
+        return self.service.select_portfolio_result(outcomes, configs, started)
+
+    async def _solve_decomposed(self, data: VRPInput, timer: PhaseTimer, deadline: float) -> Optional[VRPOutput]:
+        # None when the problem is not worth splitting; progress events are not reported for subproblems
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        planned = await loop.run_in_executor(None, self.service.plan_decomposition, data, timer, deadline, self.max_workers)
+        if planned is None:
+            return None
+
+        plan, subproblems = planned
+        slots = min(len(subproblems), self.max_workers)
+        self._acquire(slots)
+        try:
+            futures = [
+                asyncio.wrap_future(self._pool.submit(_compute_in_worker, sub, None, None, deadline), loop=loop)
+                for sub in subproblems
+            ]
+            await asyncio.wait(futures)
+        finally:
+            self._release(slots)
+        outcomes = [worker_outcome(future) for future in futures]
+        return await loop.run_in_executor(
+            None, self.service.merge_decomposition, data, plan, outcomes, timer, deadline, started
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Solver executor stopped")
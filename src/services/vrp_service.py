@@ -1,76 +1,497 @@
-from ortools.constraint_solver import routing_enums_pb2, pywrapcp
+import math
 import time
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from ..schemas.request_models import VRPInput
+import numpy as np
+
+from ..schemas.request_models import VRPInput, WarmStart
 from ..schemas.response_models import VRPOutput, Route, VRPMetadata
 from ..exceptions import (
-    VRPError, VRPSystemError,
+    VRPException, VRPError, VRPSystemError,
     ErrorCode
 )
 from ..repositories.vrp_repository import VRPRepository
+from ..repositories.persistence_writer import PersistenceWriter
+from ..repositories.matrix_store import MatrixStore
 from ..validators.business_validator import BusinessValidator
+from .aggregation import JobAggregation
+from .solve_context import SolveContext
+from .solution_cache import SolutionCache, problem_key
+from .route_repair import insert_missing_nodes, nearest_neighbor_routes
+from .solve_progress import SolveProgress
+from .portfolio import PORTFOLIO, SearchConfig, pick_best, portfolio_configs
+from .search_tuner import SearchTuner, instance_features
+from .decomposition import DEFAULT_CLUSTER_SIZE, Decomposition, decompose
+from .candidates import candidate_successors
+from ..utils import metrics
 from ..utils.logger import get_service_logger
+from ..utils.timing import PhaseTimer
 
 logger = get_service_logger()
 
 
+# share of the budget left after model build that is kept back for extraction, caching and the response
+POST_SEARCH_RESERVE = 0.05
+# below this OR-Tools cannot be expected to find even a first solution
+MIN_SEARCH_SECONDS = 0.01
+# share of a decomposed solve's budget kept back for merging and the boundary repair
+REPAIR_RESERVE = 0.1
+
+
+def routing_status(name: str) -> int:
+    # OR-Tools is imported where a model is first built, not when the API loads this module
+    from ortools.constraint_solver import routing_enums_pb2
+    return getattr(routing_enums_pb2.RoutingSearchStatus, name)
+
+
+def _compute_in_process(service_settings: Dict[str, Any], data: VRPInput, search: Optional[SearchConfig] = None,
+                        deadline: Optional[float] = None) -> VRPOutput:
+    return VRPService(repository=None, **service_settings).compute_solution(data, search=search, deadline=deadline)
+
+
+def worker_outcome(future: Future) -> Union[VRPOutput, VRPException]:
+    # a failed portfolio member or subproblem is reported, not raised; the caller decides what it means
+    try:
+        return future.result()
+    except VRPException as e:
+        return e
+    except Exception as e:
+        return VRPSystemError(ErrorCode.SOLVER_ERROR, f"Solver worker failed: {str(e)}")
+
+
 class VRPService:
-    def __init__(self, time_limit: int = None, solution_limit: int = None, random_seed: int = None, repository: Optional[VRPRepository] = None):
+    def __init__(self, time_limit: int = None, solution_limit: int = None, random_seed: int = None, repository: Optional[VRPRepository] = None,
+                 native_transits: bool = None, cache: Optional[SolutionCache] = None, writer: Optional[PersistenceWriter] = None,
+                 portfolio_size: int = None, decompose_min_jobs: int = None, cluster_size: int = None,
+                 candidate_neighbors: int = None, matrix_dir: str = None, tuner: Optional[SearchTuner] = None):
         self.time_limit = time_limit if time_limit is not None else int(os.getenv("VRP_TIME_LIMIT", 30))
         self.solution_limit = solution_limit if solution_limit is not None else int(os.getenv("VRP_SOLUTION_LIMIT", 100))
         self.random_seed = random_seed if random_seed is not None else int(os.getenv("VRP_RANDOM_SEED", 0))
-        self.repository = repository or VRPRepository()
+        # native: transits registered as precomputed matrix/vector, no Python inside the search loop
+        # python: legacy closures, kept for A/B comparison
+        self.native_transits = native_transits if native_transits is not None else os.getenv("VRP_NATIVE_TRANSITS", "1") != "0"
+        self.repository = repository
+        self.cache = cache
+        # when set, solutions are queued for batched background writes instead of saved inline
+        self.writer = writer
+        # >1: run that many differently configured searches in parallel processes and keep the best
+        self.portfolio_size = portfolio_size if portfolio_size is not None else int(os.getenv("VRP_PORTFOLIO_SIZE", 1))
+        self.portfolio_max = int(os.getenv("VRP_PORTFOLIO_MAX", len(PORTFOLIO)))
+        # problems with at least this many jobs are solved by decomposition unless the request says otherwise; 0: never
+        self.decompose_min_jobs = decompose_min_jobs if decompose_min_jobs is not None else int(os.getenv("VRP_DECOMPOSE_MIN_JOBS", 0))
+        self.cluster_size = cluster_size or int(os.getenv("VRP_DECOMPOSE_CLUSTER_SIZE", DEFAULT_CLUSTER_SIZE))
+        self.decompose_workers = int(os.getenv("VRP_DECOMPOSE_WORKERS", 0)) or os.cpu_count() or 1
+        # >0: each location's successors are limited to its that many nearest locations (starts stay free)
+        self.candidate_neighbors = candidate_neighbors if candidate_neighbors is not None else int(os.getenv("VRP_CANDIDATE_NEIGHBORS", 0))
+        # matrices uploaded once and referenced by matrix_id; each process maps them read-only
+        self.matrix_store = MatrixStore(matrix_dir)
+        # auto-tuning: strategy and time budget from the history of similar solves; lives in the parent process
+        self.tuner = tuner
         self.validator = BusinessValidator()
 
-    def solve(self, data: VRPInput) -> VRPOutput:
-        start = time.time()
+    def settings(self) -> Dict[str, Any]:
+        # constructor kwargs needed to rebuild an equivalent service inside a solver worker
+        return {
+            "time_limit": self.time_limit,
+            "solution_limit": self.solution_limit,
+            "random_seed": self.random_seed,
+            "native_transits": self.native_transits,
+            "portfolio_size": self.portfolio_size,
+            "decompose_min_jobs": self.decompose_min_jobs,
+            "cluster_size": self.cluster_size,
+            "candidate_neighbors": self.candidate_neighbors,
+            "matrix_dir": self.matrix_store.directory,
+        }
+
+    def effective_seed(self, data: VRPInput) -> int:
+        return getattr(data, 'random_seed', None) or self.random_seed
+
+    def portfolio_size_for(self, data: VRPInput, max_parallel: Optional[int] = None) -> int:
+        # a request may ask for its own portfolio size, capped by VRP_PORTFOLIO_MAX and the parallel workers
+        size = min(data.portfolio_size or self.portfolio_size, self.portfolio_max)
+        if max_parallel is not None:
+            size = min(size, max_parallel)
+        return max(1, size)
+
+    def resolve_matrix(self, data: VRPInput) -> VRPInput:
+        # matrix_id requests get the submatrix of their locations, sliced in whichever process solves
+        if data.matrix_id is not None and data.matrix_buffer() is None:
+            data.attach_matrix(self.matrix_store.submatrix(data.matrix_id, data.locations))
+        return data
+
+    def tuning_features(self, data: VRPInput) -> Optional[Dict[str, float]]:
+        # None when the solve neither uses nor feeds the history: warm starts, portfolios and decomposition
+        # have their own dynamics
+        if (self.tuner is None or data.warm_start is not None or self.portfolio_size_for(data) > 1
+                or self.should_decompose(data)):
+            return None
+        try:
+            if data.matrix_id is not None and data.matrix_buffer() is None:
+                # sliced without attaching, so the request still travels to the worker by reference
+                matrix = self.matrix_store.submatrix(data.matrix_id, data.locations)
+            else:
+                matrix = data.matrix_array()
+            k = data.candidate_neighbors if data.candidate_neighbors is not None else self.candidate_neighbors
+            return instance_features(data, matrix, k)
+        except (ValueError, VRPException):
+            # malformed input; the solve reports it
+            return None
+
+    def tune(self, data: VRPInput) -> Tuple[Optional[Dict[str, float]], Optional[SearchConfig]]:
+        # (features to record the solve under, tuned search or None for the default one)
+        features = self.tuning_features(data)
+        if features is None:
+            return None, None
+        return features, self.tuner.recommend(features, self.effective_seed(data))
+
+    def retry_untuned(self, error: VRPException, features: Optional[Dict[str, float]],
+                      search: Optional[SearchConfig]) -> bool:
+        # a tuned search that found no solution is held against its pair, and the request gets the default search
+        if search is None or features is None or error.error_code != ErrorCode.NO_SOLUTION_FOUND:
+            return False
+        self.tuner.record_failure(features, search)
+        logger.warning(f"Tuned search {search.label} found no solution, retrying with the default search")
+        return True
+
+    def record_solve(self, features: Optional[Dict[str, float]], result: VRPOutput) -> None:
+        if features is not None and not (result.metadata and (result.metadata.stopped_early or result.metadata.cache_hit)):
+            self.tuner.record(features, result)
+
+    def should_decompose(self, data: VRPInput) -> bool:
+        if data.decompose is not None:
+            return data.decompose
+        return 0 < self.decompose_min_jobs <= len(data.jobs)
+
+    def deadline_for(self, data: VRPInput) -> float:
+        # wall-clock end of the request budget: the request's own deadline, capped by time_limit,
+        # counted from when the API received it (or from now for direct calls)
+        budget = min(data.deadline_seconds or self.time_limit, self.time_limit)
+        return (data.received_at() or time.time()) + budget
+
+    def solve(self, data: VRPInput, timer: Optional[PhaseTimer] = None) -> VRPOutput:
+        timer = timer or PhaseTimer()
+        deadline = self.deadline_for(data)
+        try:
+            with timer.span("cache_lookup"):
+                cache_key = self.cache_key(data)
+                result = self.get_cached_solution(cache_key)
+            if result is None:
+                if data.warm_start is not None:
+                    with timer.span("warm_start"):
+                        data = self.resolve_warm_start(data)
+                with timer.span("tuning"):
+                    features, search = self.tune(data)
+                try:
+                    result = self.compute(data, timer, deadline, search)
+                except VRPException as e:
+                    if not self.retry_untuned(e, features, search):
+                        raise
+                    result = self.compute(data, timer, deadline)
+                self.record_solve(features, result)
+                self.cache_solution(cache_key, result)
+                with timer.span("persistence"):
+                    self.persist_solution(data, result)
+        except VRPException:
+            metrics.record_failure()
+            raise
+        return self.finish(data, result, timer)
+
+    def finish(self, data: VRPInput, result: VRPOutput, timer: PhaseTimer) -> VRPOutput:
+        # merge request-level phases into the solve's own, export them, and hide them unless asked for
+        if result.metadata is None:
+            return result
+        phases = {**(result.metadata.phases or {}), **timer.phases}
+        metadata = result.metadata.model_copy(update={"phases": {name: round(t, 6) for name, t in phases.items()}})
+        result = result.model_copy(update={"metadata": metadata})
+        metrics.record_solve(result)
+        if data.include_timings:
+            return result
+        return result.model_copy(update={"metadata": metadata.model_copy(update={"phases": None, "search_stats": None, "convergence": None})})
+
+    def compute(self, data: VRPInput, timer: Optional[PhaseTimer] = None, deadline: Optional[float] = None,
+                search: Optional[SearchConfig] = None) -> VRPOutput:
+        deadline = deadline or self.deadline_for(data)
+        if self.should_decompose(data):
+            return self.compute_decomposed(data, timer, deadline)
+        size = self.portfolio_size_for(data)
+        if size <= 1:
+            return self.compute_solution(data, search=search, timer=timer, deadline=deadline)
+
+        started = time.perf_counter()
+        configs = portfolio_configs(size, self.effective_seed(data))
+        with ProcessPoolExecutor(max_workers=size) as pool:
+            futures = [pool.submit(_compute_in_process, self.settings(), data, config, deadline) for config in configs]
+            outcomes = [worker_outcome(future) for future in futures]
+        return self.select_portfolio_result(outcomes, configs, started)
+
+    def compute_decomposed(self, data: VRPInput, timer: Optional[PhaseTimer] = None,
+                           deadline: Optional[float] = None) -> VRPOutput:
+        timer = timer or PhaseTimer()
+        deadline = deadline or self.deadline_for(data)
+        started = time.perf_counter()
+        planned = self.plan_decomposition(data, timer, deadline, self.decompose_workers)
+        if planned is None:
+            return self.compute_solution(data, timer=timer, deadline=deadline)
+
+        plan, subproblems = planned
+        with ProcessPoolExecutor(max_workers=min(len(subproblems), self.decompose_workers)) as pool:
+            futures = [pool.submit(_compute_in_process, self.settings(), sub, None, deadline) for sub in subproblems]
+            outcomes = [worker_outcome(future) for future in futures]
+        return self.merge_decomposition(data, plan, outcomes, timer, deadline, started)
+
+    def plan_decomposition(self, data: VRPInput, timer: PhaseTimer, deadline: float,
+                           workers: int) -> Optional[Tuple[Decomposition, List[VRPInput]]]:
+        # None: not worth splitting, solve the problem as a whole
+        timer.reset()
+        if time.time() >= deadline:
+            raise VRPSystemError(
+                ErrorCode.TIMEOUT_ERROR,
+                "Time budget exhausted before the solve started",
+                details={"timeout_seconds": 0}
+            )
+        self.validator.validate_business_rules(self.resolve_matrix(data))
+        timer.lap("validation")
+
+        plan = decompose(data, self.cluster_size, self.effective_seed(data))
+        if plan is None:
+            logger.info(f"Decomposition of {len(data.jobs)} jobs not applicable, solving as a whole")
+            return None
+
+        # subproblems beyond the worker count run in later waves, so each gets a share of the budget
+        waves = math.ceil(plan.clusters / max(workers, 1))
+        budget = (deadline - time.time()) * (1 - REPAIR_RESERVE) / waves
+        if budget < MIN_SEARCH_SECONDS:
+            raise VRPSystemError(
+                ErrorCode.TIMEOUT_ERROR,
+                f"Time budget too short to solve {plan.clusters} subproblems",
+                details={"timeout_seconds": round(max(budget, 0), 3)}
+            )
+        subproblems = plan.subproblems(budget)
+        timer.lap("decomposition")
+        logger.info(
+            f"Decomposed {len(data.jobs)} jobs into {plan.clusters} subproblems "
+            f"of {min(len(s.jobs) for s in subproblems)}-{max(len(s.jobs) for s in subproblems)} jobs, {budget:.2f}s each"
+        )
+        return plan, subproblems
+
+    def merge_decomposition(self, data: VRPInput, plan: Decomposition, outcomes: Sequence[Union[VRPOutput, VRPException]],
+                            timer: PhaseTimer, deadline: float, started: float) -> VRPOutput:
+        # every subproblem must be solved for the plan to cover all jobs
+        failed = next((o for o in outcomes if isinstance(o, VRPException)), None)
+        if failed is not None:
+            raise failed
+        timer.lap("search")
+
+        node_routes = plan.merge(outcomes)
+        moves = plan.repair(node_routes, deadline - (deadline - time.time()) * POST_SEARCH_RESERVE)
+        timer.lap("repair")
+        routes = plan.to_routes(node_routes)
+        self._validate_routes(routes, data)
+        timer.lap("extraction")
+
+        search_stats: Dict[str, int] = {}
+        for output in outcomes:
+            for stat, value in (output.metadata.search_stats or {}).items():
+                search_stats[stat] = search_stats.get(stat, 0) + value
+        total = sum(r.delivery_duration for r in routes.values())
+        solve_time = time.perf_counter() - started
+        logger.info(f"Decomposed solve in {solve_time:.2f}s, total={total}, {moves} boundary moves")
+        return self._convert_to_output_dto(
+            routes, total, solve_time, total, self.effective_seed(data),
+            warm_started=any(o.metadata.warm_started for o in outcomes),
+            stopped_early=any(o.metadata.stopped_early for o in outcomes),
+            truncated=any(o.metadata.truncated for o in outcomes),
+            strategy=outcomes[0].metadata.strategy, phases=dict(timer.phases), search_stats=search_stats,
+            algorithm="OR-Tools+decomposition", clusters=plan.clusters
+        )
+
+    def select_portfolio_result(self, outcomes: Sequence[Union[VRPOutput, VRPException]],
+                                configs: Sequence[SearchConfig], started: float) -> VRPOutput:
+        solved = [o if isinstance(o, VRPOutput) else None for o in outcomes]
+        best = pick_best(solved)
+        if best is None:
+            raise next(o for o in outcomes if isinstance(o, VRPException))
+
+        totals = [o.total_delivery_duration for o in solved if o is not None]
+        logger.info(
+            f"Portfolio of {len(configs)} searches: {configs[best].label} won with {min(totals)}, "
+            f"worst {max(totals)}, {len(totals)} succeeded"
+        )
+        winner = solved[best]
+        # search effort is the portfolio's total; phases are the winner's
+        search_stats: Dict[str, int] = {}
+        for output in solved:
+            for stat, value in ((output and output.metadata.search_stats) or {}).items():
+                search_stats[stat] = search_stats.get(stat, 0) + value
+        metadata = winner.metadata.model_copy(update={
+            "solve_time_seconds": time.perf_counter() - started,
+            "search_stats": search_stats,
+            "strategy": configs[best].label,
+            "portfolio_size": len(configs),
+            "stopped_early": any(o.metadata.stopped_early for o in solved if o is not None and o.metadata),
+            "truncated": any(o.metadata.truncated for o in solved if o is not None and o.metadata)
+        })
+        return winner.model_copy(update={"metadata": metadata})
+
+    def cache_key(self, data: VRPInput) -> Optional[str]:
+        if self.cache is None:
+            return None
+        try:
+            return problem_key(data, self.settings())
+        except ValueError:
+            # malformed matrix: not cacheable, compute_solution reports the real error
+            return None
+
+    def get_cached_solution(self, cache_key: Optional[str]) -> Optional[VRPOutput]:
+        if cache_key is None:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        logger.info(f"Solution cache hit: {cache_key}")
+        metadata = cached.metadata.model_copy(update={"cache_hit": True, "phases": None, "search_stats": None, "convergence": None}) if cached.metadata else None
+        return cached.model_copy(update={"metadata": metadata})
+
+    def cache_solution(self, cache_key: Optional[str], result: VRPOutput) -> None:
+        # early-stopped or deadline-truncated searches are not the answer to the problem, only to that request
+        if cache_key is not None and not (result.metadata and (result.metadata.stopped_early or result.metadata.truncated)):
+            self.cache.put(cache_key, result)
+
+    def resolve_warm_start(self, data: VRPInput) -> VRPInput:
+        # turns a solution_id hint into explicit routes; needs the repository, so runs before dispatch
+        hint = data.warm_start
+        if hint is None or hint.routes is not None or not hint.solution_id:
+            return data
+
+        routes = None
+        if self.repository:
+            try:
+                doc = self.repository.get_solution_by_id(hint.solution_id)
+                if doc:
+                    routes = {vid: route.get("jobs", []) for vid, route in doc.get("routes", {}).items()}
+            except Exception as e:
+                logger.warning(f"Failed to load warm start solution {hint.solution_id}: {str(e)}")
+
+        if routes is None:
+            logger.warning(f"Warm start solution {hint.solution_id} not available, solving from scratch")
+            return data.model_copy(update={"warm_start": None})
+        return data.model_copy(update={"warm_start": WarmStart(routes=routes)})
+
+    def persist_solution(self, data: VRPInput, result: VRPOutput) -> None:
+        if self.writer is not None:
+            self.writer.submit(data, result)
+            return
+        if not self.repository:
+            return
+        try:
+            vehicle_ids = self.repository.save_vehicles(data.vehicles)
+            job_ids = self.repository.save_jobs(data.jobs)
+            solution_id = self.repository.save_solution(result, data, vehicle_ids, job_ids)
+            logger.info(f"Solution saved to MongoDB with id: {solution_id}")
+        except Exception as e:
+            logger.warning(f"Failed to save solution to database: {str(e)}")
+
+    def compute_solution(self, data: VRPInput, progress: Optional[SolveProgress] = None,
+                         search: Optional[SearchConfig] = None, timer: Optional[PhaseTimer] = None,
+                         deadline: Optional[float] = None) -> VRPOutput:
+        start = time.perf_counter()
+        timer = timer or PhaseTimer()
+        timer.reset()
+        # the caller's deadline, or the request's own budget if that ends first
+        deadline = min(deadline, self.deadline_for(data)) if deadline else self.deadline_for(data)
         
-        effective_random_seed = getattr(data, 'random_seed', None) or self.random_seed
+        effective_random_seed = self.effective_seed(data)
+        search = search or SearchConfig(*PORTFOLIO[0], seed=effective_random_seed)
         
         try:
-            self.validator.validate_business_rules(data)
+            if time.time() >= deadline:
+                raise VRPSystemError(
+                    ErrorCode.TIMEOUT_ERROR,
+                    "Time budget exhausted before the solve started",
+                    details={"timeout_seconds": 0}
+                )
+            self.validator.validate_business_rules(self.resolve_matrix(data))
+            timer.lap("validation")
             
-            demands = {j.location_index: (j.delivery[0] if j.delivery else 1) for j in data.jobs}
-            services = {j.location_index: (j.service or 0) for j in data.jobs}
+            aggregation = JobAggregation(data)
+            if aggregation.node_count < aggregation.job_count:
+                logger.info(f"Aggregated {aggregation.job_count} jobs into {aggregation.node_count} locations")
 
-            manager, routing = self._create_model(data)
+            ctx = self._create_model(data, aggregation)
+            routing = ctx.routing
 
             # if any service times -> register time callback 
             time_cb = None
             if any(j.service for j in data.jobs):
-                time_cb = self._add_time_dimension(manager, routing, data, services)
+                time_cb = self._add_time_dimension(ctx)
 
             if any(v.capacity for v in data.vehicles):
-                self._add_capacity_dimension(manager, routing, data, demands)
+                self._add_capacity_dimension(ctx)
 
             # time_cb (travel+service) if present
             if time_cb is not None:
                 routing.SetArcCostEvaluatorOfAllVehicles(time_cb)
             else:
-                self._set_distance_evaluator(manager, routing, data.matrix)
-
-            params = self._search_parameters()
-            solution = routing.SolveWithParameters(params)
+                self._set_distance_evaluator(ctx)
+
+            params = self._search_parameters(search)
+            routing.solver().ReSeed(search.seed)
+            if progress is not None:
+                progress.on_start()
+                self._attach_progress(ctx, progress)
+            convergence = self._attach_convergence(ctx)
+            solution = None
+            started_from_routes = False
+            initial_routes = self._initial_routes(ctx)
+            restricted, initial_routes = self._restrict_successors(ctx, initial_routes)
+            timer.lap("model_build")
+            # whatever validation and model build left of the budget goes to the search
+            search_budget = self._apply_search_budget(params, deadline, search.time_budget)
+            if initial_routes:
+                routing.CloseModelWithParameters(params)
+                initial = routing.ReadAssignmentFromRoutes(initial_routes, True)
+                if initial:
+                    solution = routing.SolveFromAssignmentWithParameters(initial, params)
+                    started_from_routes = True
+                else:
+                    logger.warning("Initial routes are infeasible for this problem, solving from scratch")
+            if not started_from_routes:
+                solution = routing.SolveWithParameters(params)
+            warm_started = started_from_routes and data.warm_start is not None
+            search_time = timer.lap("search")
             
+            if not solution and routing.status() == routing_status("ROUTING_FAIL_TIMEOUT"):
+                raise VRPSystemError(
+                    ErrorCode.TIMEOUT_ERROR,
+                    f"No solution found within the {search_budget:.2f}s left for the search",
+                    details={"timeout_seconds": round(search_budget, 3)}
+                )
             if not solution:
+                hint = ", allowing more candidate successors may help" if restricted else ""
                 raise VRPSystemError(
                     ErrorCode.NO_SOLUTION_FOUND,
-                    f"OR-Tools solver could not find a solution for {len(data.vehicles)} vehicles and {len(data.jobs)} jobs"
+                    f"OR-Tools solver could not find a solution for {len(data.vehicles)} vehicles and {len(data.jobs)} jobs{hint}"
                 )
 
-            routes = self._extract_routes(manager, routing, solution, data, demands, services)
+            routes = self._extract_routes(ctx, solution)
             self._validate_routes(routes, data)
-
-            solve_time = time.time() - start
-            
-            if solve_time > self.time_limit:
-                logger.warning(f"Solver exceeded time limit: {solve_time:.2f}s > {self.time_limit}s")
-                raise VRPSystemError(
-                    ErrorCode.SYSTEM_ERROR,
-                    f"Solver exceeded time limit: {solve_time:.2f}s > {self.time_limit}s"
-                )
+            timer.lap("extraction")
+            solver = routing.solver()
+            search_stats = {
+                "solutions": solver.Solutions(),
+                "branches": solver.Branches(),
+                "failures": solver.Failures()
+            }
+
+            # ran into the time budget rather than the solution limit or an early stop; a tuned budget is a choice
+            truncated = (not ctx.stopped_early and search_stats["solutions"] < self.solution_limit
+                         and search_time >= search_budget * 0.95 and search.time_budget is None)
+            if truncated:
+                logger.info(f"Search truncated by the time budget after {search_time:.2f}s")
+
+            solve_time = time.perf_counter() - start
 
             total = sum(r.delivery_duration for r in routes.values())
             objective_value = solution.ObjectiveValue()
@@ -84,19 +505,10 @@ class VRPService:
 
             logger.info("Solved in %.2fs, total=%s", solve_time, total)
             
-            result = self._convert_to_output_dto(routes, total, solve_time, objective_value, effective_random_seed)
-            
-
-            if self.repository:
-                try:
-                    vehicle_ids = self.repository.save_vehicles(data.vehicles)
-                    job_ids = self.repository.save_jobs(data.jobs)
-                    solution_id = self.repository.save_solution(result, data, vehicle_ids, job_ids)
-                    logger.info(f"Solution saved to MongoDB with id: {solution_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to save solution to database: {str(e)}")
-            
-            return result
+            return self._convert_to_output_dto(routes, total, solve_time, objective_value, effective_random_seed, warm_started,
+                                               stopped_early=ctx.stopped_early, truncated=truncated, strategy=search.label,
+                                               phases=dict(timer.phases), search_stats=search_stats,
+                                               autotuned=search.time_budget is not None, convergence=convergence)
             
         except (VRPError, VRPSystemError):
             raise
@@ -112,151 +524,247 @@ class VRPService:
             )
 
     
-    def _convert_to_output_dto(self, routes: Dict[str, Route], total: int, solve_time: float, objective_value: int, effective_random_seed: int) -> VRPOutput:
-        metadata = VRPMetadata(
+    def _convert_to_output_dto(self, routes: Dict[str, Route], total: int, solve_time: float, objective_value: int, effective_random_seed: int,
+                               warm_started: bool = False, stopped_early: bool = False, truncated: bool = False,
+                               strategy: Optional[str] = None,
+                               phases: Optional[Dict[str, float]] = None, search_stats: Optional[Dict[str, int]] = None,
+                               algorithm: str = "OR-Tools", clusters: Optional[int] = None, autotuned: bool = False,
+                               convergence: Optional[List[List[float]]] = None) -> VRPOutput:
+        # everything here was produced by the service itself, so the models skip revalidation
+        metadata = VRPMetadata.model_construct(
             solve_time_seconds=solve_time,
-            algorithm="OR-Tools",
+            algorithm=algorithm,
             objective_value=objective_value,
-            random_seed=effective_random_seed
+            random_seed=effective_random_seed,
+            warm_started=warm_started,
+            stopped_early=stopped_early,
+            truncated=truncated,
+            strategy=strategy,
+            phases=phases,
+            search_stats=search_stats,
+            clusters=clusters,
+            autotuned=autotuned,
+            convergence=convergence
         )
         
-        return VRPOutput(
+        return VRPOutput.model_construct(
             total_delivery_duration=total,
             routes=routes,
             metadata=metadata
         )
 
-    def _augment_matrix_with_sink(self, matrix: List[List[int]]):
-        n = len(matrix)
-        # new matrix with sink node
-        new_matrix = []
-        for row in matrix:
-            new_matrix.append(row + [0])  
-        new_matrix.append([0] * (n + 1)) 
-        sink_index = n
-        return new_matrix, sink_index
-
-    def _create_model(self, data: VRPInput):
-        n_loc = len(data.matrix)
+    def _create_model(self, data: VRPInput, aggregation: JobAggregation) -> SolveContext:
+        from ortools.constraint_solver import pywrapcp
         n_veh = len(data.vehicles)
 
-        starts = [int(v.start_index) for v in data.vehicles]
-
-        matrix, sink_index = self._augment_matrix_with_sink(data.matrix)
-
-        ends = [int(sink_index)] * n_veh
-
-        self._original_matrix = data.matrix
-        self._matrix = matrix
-        self._sink_index = sink_index
-
-        mgr = pywrapcp.RoutingIndexManager(len(matrix), n_veh, starts, ends)
-        routing = pywrapcp.RoutingModel(mgr)
-        return mgr, routing
-
-    def _set_distance_evaluator(self, manager, routing, matrix: List[List[int]]):
-        def dist_cb(from_index, to_index):
-            return self._matrix[manager.IndexToNode(from_index)][manager.IndexToNode(to_index)]
-        cb_idx = routing.RegisterTransitCallback(dist_cb)
+        matrix = data.matrix_array()
+        ctx = SolveContext(data, matrix, aggregation)
+        if ctx.sink_index < len(matrix):
+            logger.info(f"Routing on {ctx.sink_index} of {len(matrix)} locations (starts and job locations)")
+
+        ends = [ctx.sink_index] * n_veh
+
+        ctx.manager = pywrapcp.RoutingIndexManager(ctx.node_count, n_veh, ctx.starts, ends)
+        ctx.routing = pywrapcp.RoutingModel(ctx.manager)
+        return ctx
+
+    def _set_distance_evaluator(self, ctx: SolveContext):
+        manager, routing = ctx.manager, ctx.routing
+        if self.native_transits:
+            cb_idx = routing.RegisterTransitMatrix(ctx.transit_matrix())
+        else:
+            def dist_cb(from_index, to_index):
+                return ctx.travel(manager.IndexToNode(from_index), manager.IndexToNode(to_index))
+            cb_idx = routing.RegisterTransitCallback(dist_cb)
         routing.SetArcCostEvaluatorOfAllVehicles(cb_idx)
         return cb_idx
 
-    def _add_capacity_dimension(self, manager, routing, data: VRPInput, demands: Dict[int, int]):
-        def demand_cb(index):
-            node = manager.IndexToNode(index)
-
-            if node == self._sink_index:
-                return 0
-            return demands.get(node, 0)
-        demand_idx = routing.RegisterUnaryTransitCallback(demand_cb)
+    def _add_capacity_dimension(self, ctx: SolveContext):
+        manager, routing, demands, sink_index = ctx.manager, ctx.routing, ctx.demands, ctx.sink_index
+        if self.native_transits:
+            demand_idx = routing.RegisterUnaryTransitVector(ctx.demand_vector().tolist())
+        else:
+            def demand_cb(index):
+                node = manager.IndexToNode(index)
+
+                if node == sink_index:
+                    return 0
+                return demands.get(node, 0)
+            demand_idx = routing.RegisterUnaryTransitCallback(demand_cb)
         total_demand = sum(demands.values()) or 1_000_000
-        caps = [v.capacity[0] if v.capacity else total_demand for v in data.vehicles]
+        caps = [v.capacity[0] if v.capacity else total_demand for v in ctx.data.vehicles]
         routing.AddDimensionWithVehicleCapacity(demand_idx, 0, caps, True, "Capacity")
 
-    def _add_time_dimension(self, manager, routing, data: VRPInput, services: Dict[int, int]):
-        def time_cb(from_index, to_index):
-            f = manager.IndexToNode(from_index)
-            t = manager.IndexToNode(to_index)
+    def _add_time_dimension(self, ctx: SolveContext):
+        manager, routing, services, sink_index = ctx.manager, ctx.routing, ctx.services, ctx.sink_index
+        if self.native_transits:
+            idx = routing.RegisterTransitMatrix(ctx.transit_matrix(include_service=True))
+        else:
+            def time_cb(from_index, to_index):
+                f = manager.IndexToNode(from_index)
+                t = manager.IndexToNode(to_index)
 
-            travel = self._matrix[f][t]
+                travel = ctx.travel(f, t)
 
-            service = 0 if t == self._sink_index else services.get(t, 0)
-            return travel + service
-        idx = routing.RegisterTransitCallback(time_cb)
+                service = 0 if t == sink_index else services.get(t, 0)
+                return travel + service
+            idx = routing.RegisterTransitCallback(time_cb)
         
-        max_travel = max(
-        sum(row) for row in self._original_matrix
-        )  
-        max_service = sum(services.values())  
-        horizon_max = max_travel + max_service
+        horizon_max = ctx.horizon()
         slack_max = int(horizon_max * 0.1)  # %10 slack
         routing.AddDimension(idx,slack_max, horizon_max, False, "Time")
         return idx
 
-    def _search_parameters(self):
+    def _restrict_successors(self, ctx: SolveContext, initial_routes: List[List[int]]) -> Tuple[bool, List[List[int]]]:
+        # sparse input: only the listed arcs, from every location. Candidate mode: the k nearest successors
+        # of each non-start location plus the arcs of a start plan, which the search then starts from, so a
+        # feasible solution always exists. The route end stays reachable from everywhere.
+        data, manager, routing = ctx.data, ctx.manager, ctx.routing
+        neighbors = data.neighbor_lists()
+        restrict_starts = neighbors is not None
+        if neighbors is not None:
+            # listed per location; arcs to locations outside the model are dropped
+            neighbors = [
+                np.asarray([ctx.node_of[int(j)] for j in neighbors[location] if int(j) in ctx.node_of], dtype=np.int64)
+                for location in ctx.locations
+            ]
+        else:
+            k = data.candidate_neighbors if data.candidate_neighbors is not None else self.candidate_neighbors
+            if not k or k >= ctx.sink_index - 1:
+                return False, initial_routes
+            initial_routes = initial_routes or nearest_neighbor_routes(ctx)
+            if not initial_routes:
+                logger.warning("No capacity-feasible start plan, searching over all arcs")
+                return False, []
+            neighbors = candidate_successors(ctx.matrix, k)
+            for route in initial_routes:
+                for node, successor in zip(route, route[1:]):
+                    neighbors[node] = np.append(neighbors[node], successor)
+
+        start_vehicles: Dict[int, List[int]] = {}
+        for v_idx, start in enumerate(ctx.starts):
+            start_vehicles.setdefault(start, []).append(v_idx)
+        ends = [routing.End(v_idx) for v_idx in range(len(data.vehicles))]
+        for node, successors in enumerate(neighbors):
+            if node in start_vehicles:
+                if not restrict_starts:
+                    continue
+                indices = [routing.Start(v_idx) for v_idx in start_vehicles[node]]
+            else:
+                indices = [manager.NodeToIndex(node)]
+            allowed = [manager.NodeToIndex(int(j)) for j in successors if int(j) not in start_vehicles] + ends
+            for index in indices:
+                routing.NextVar(index).SetValues(allowed)
+        return True, initial_routes
+
+    def _attach_progress(self, ctx: SolveContext, progress: SolveProgress) -> None:
+        # reports each improving solution and lets the caller end the search once one exists
+        routing = ctx.routing
+        started = time.monotonic()
+        best = [None]
+
+        def on_solution():
+            objective = routing.CostVar().Max()
+            if best[0] is not None and objective >= best[0]:
+                return
+            best[0] = objective
+            progress.on_improvement(objective, self._current_job_sequences(ctx), time.monotonic() - started)
+
+        def stop_limit():
+            if best[0] is not None and not ctx.stopped_early:
+                ctx.stopped_early = progress.should_stop()
+            return ctx.stopped_early
+
+        limit = routing.solver().CustomLimit(stop_limit)
+        routing.AddAtSolutionCallback(on_solution)
+        routing.AddSearchMonitor(limit)
+        ctx.monitors.extend([on_solution, limit])
+
+    def _attach_convergence(self, ctx: SolveContext) -> List[List[float]]:
+        # [elapsed seconds, objective] per improving solution; filled in while the search runs
+        routing = ctx.routing
+        started = time.monotonic()
+        curve: List[List[float]] = []
+
+        def on_solution():
+            objective = routing.CostVar().Max()
+            if not curve or objective < curve[-1][1]:
+                curve.append([round(time.monotonic() - started, 4), objective])
+
+        routing.AddAtSolutionCallback(on_solution)
+        ctx.monitors.append(on_solution)
+        return curve
+
+    def _current_job_sequences(self, ctx: SolveContext) -> Dict[str, List[int]]:
+        # job ids per vehicle for the assignment currently bound inside the search
+        routing, manager = ctx.routing, ctx.manager
+        node_jobs = ctx.job_tables()[0]
+        size = routing.Size()
+        out: Dict[str, List[int]] = {}
+        for v_idx, vehicle in enumerate(ctx.data.vehicles):
+            index = routing.Start(v_idx)
+            seq: List[int] = list(node_jobs[manager.IndexToNode(index)])
+            index = routing.NextVar(index).Value()
+            while index < size:
+                seq.extend(node_jobs[manager.IndexToNode(index)])
+                index = routing.NextVar(index).Value()
+            out[str(vehicle.id)] = seq
+        return out
+
+    def _initial_routes(self, ctx: SolveContext) -> List[List[int]]:
+        # job id sequences -> node sequences per vehicle; unknown jobs, start nodes and repeats are dropped
+        hint = ctx.data.warm_start
+        if hint is None or not hint.routes:
+            return []
+
+        job_nodes = {j.id: ctx.node_of[j.location_index] for j in ctx.data.jobs}
+        start_nodes = set(ctx.starts)
+        seen = set()
+        routes = []
+        for vehicle in ctx.data.vehicles:
+            nodes = []
+            for job_id in hint.routes.get(str(vehicle.id), []):
+                node = job_nodes.get(job_id)
+                if node is None or node in start_nodes or node in seen:
+                    continue
+                seen.add(node)
+                nodes.append(node)
+            routes.append(nodes)
+        if not seen:
+            return []
+
+        # new jobs (and other uncovered nodes) are mandatory too, so slot them in before restoring
+        completed = insert_missing_nodes(ctx, routes)
+        if completed is None:
+            logger.warning("Could not complete warm start routes within vehicle capacities, solving from scratch")
+            return []
+        return completed
+
+    def _search_parameters(self, search: SearchConfig):
+        from ortools.constraint_solver import pywrapcp
         params = pywrapcp.DefaultRoutingSearchParameters()
-        params.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
-        params.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+        params.first_solution_strategy = search.first_solution_enum()
+        params.local_search_metaheuristic = search.metaheuristic_enum()
         params.time_limit.FromSeconds(self.time_limit)
         params.solution_limit = self.solution_limit
         return params
 
-    def _extract_routes(self, manager, routing, solution, data: VRPInput, demands: Dict[int, int], services: Dict[int, int]) -> Dict[str, Route]:
-        loc_jobs: Dict[int, List] = {}
-        for job in data.jobs:
-            loc_jobs.setdefault(job.location_index, []).append(job)
-
-        out: Dict[str, Route] = {}
-        for v_idx, vehicle in enumerate(data.vehicles):
-            jobs_seq: List[int] = []
-            travel = 0
-            service_sum = 0
-            capacity_used = 0
-            start_index = vehicle.start_index
-            end_index = start_index  # default to start if no moves
-
-            index = routing.Start(v_idx)
-            prev_node = manager.IndexToNode(index)
-
-            if prev_node in loc_jobs:
-                for j in loc_jobs[prev_node]:
-                    jobs_seq.append(j.id)
-                    capacity_used += demands.get(prev_node, 0)
-
-            while not routing.IsEnd(index):
-                from_node = manager.IndexToNode(index)
-                next_index = solution.Value(routing.NextVar(index))
-                to_node = manager.IndexToNode(next_index)
-
-                if not routing.IsEnd(next_index) or to_node != self._sink_index:
-                    if 0 <= from_node < len(data.matrix) and 0 <= to_node < len(data.matrix):
-                        travel += data.matrix[from_node][to_node]
-
-                if not routing.IsEnd(next_index) and to_node != self._sink_index and to_node in loc_jobs:
-                    for j in loc_jobs[to_node]:
-                        jobs_seq.append(j.id)
-                        capacity_used += demands.get(to_node, 0)
-                        service_sum += services.get(to_node, 0)
-
-                # Update end location -> use the last  location before sink
-                if not routing.IsEnd(next_index) and to_node != self._sink_index:
-                    end_index = to_node
-                elif routing.IsEnd(next_index) and to_node == self._sink_index:
-
-                    end_index = from_node
-
-                index = next_index
-
-            out[str(vehicle.id)] = Route(
-                jobs=jobs_seq,
-                delivery_duration=travel + service_sum,
-                capacity_used=capacity_used,
-                total_service_time=service_sum,
-                total_distance=travel,
-                start_location=start_index,
-                end_location=end_index
+    def _apply_search_budget(self, params, deadline: float, time_budget: Optional[float] = None) -> float:
+        remaining = deadline - time.time()
+        budget = remaining * (1 - POST_SEARCH_RESERVE)
+        if time_budget is not None:
+            budget = min(budget, time_budget)
+        if budget < MIN_SEARCH_SECONDS:
+            raise VRPSystemError(
+                ErrorCode.TIMEOUT_ERROR,
+                f"Time budget exhausted before the search could start ({max(remaining, 0):.3f}s left)",
+                details={"timeout_seconds": round(max(remaining, 0), 3)}
             )
-        return out
+        params.time_limit.FromMilliseconds(int(budget * 1000))
+        return budget
+
+    def _extract_routes(self, ctx: SolveContext, solution) -> Dict[str, Route]:
+        return ctx.routes_from_nodes(ctx.route_nodes(solution))
 
     def _validate_routes(self, routes: Dict[str, Route], data: VRPInput):
         self.validator.validate_solution(routes, data)
@@ -0,0 +1,63 @@
+"""Helpers for the compact (NumPy) travel-matrix representation."""
+
+import base64
+import binascii
+import math
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+MATRIX_DTYPE = np.int64
+WIRE_DTYPE = np.dtype("<i4")  # little-endian int32, the binary wire format
+
+MatrixLike = Union[np.ndarray, Sequence[Sequence[int]]]
+
+
+def as_matrix_array(matrix: MatrixLike) -> np.ndarray:
+    # no copy when the matrix is already a contiguous array of the right dtype
+    return np.ascontiguousarray(matrix, dtype=MATRIX_DTYPE)
+
+
+def decode_int32_buffer(buf: bytes) -> np.ndarray:
+    # zero-copy view over the raw bytes; flat, row-major
+    if len(buf) % WIRE_DTYPE.itemsize:
+        raise ValueError(f"Binary matrix length {len(buf)} is not a multiple of {WIRE_DTYPE.itemsize} bytes")
+    return np.frombuffer(buf, dtype=WIRE_DTYPE)
+
+
+def decode_base64_matrix(encoded: str) -> np.ndarray:
+    try:
+        raw = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"matrix_b64 is not valid base64: {e}")
+    return decode_int32_buffer(raw)
+
+
+def encode_base64_matrix(matrix: MatrixLike) -> str:
+    return base64.b64encode(np.ascontiguousarray(matrix, dtype=WIRE_DTYPE).tobytes()).decode("ascii")
+
+
+def infer_square_size(flat_length: int) -> int:
+    # best guess for an omitted size; the business validator reports non-square buffers
+    return math.isqrt(flat_length)
+
+
+# travel value stored for arcs a sparse matrix does not list; the solver never takes them, other
+# consumers (clustering, repair heuristics) see them as prohibitively long
+UNLISTED_ARC_COST = 10 ** 9
+
+
+def decode_neighbor_lists(rows: Sequence[Sequence[Sequence[int]]]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    # one [to, travel] pair list per location -> dense matrix (flat) plus the listed successors per location
+    n = len(rows)
+    matrix = np.full((n, n), UNLISTED_ARC_COST, dtype=MATRIX_DTYPE)
+    np.fill_diagonal(matrix, 0)
+    neighbors = []
+    for i, pairs in enumerate(rows):
+        arcs = np.asarray(pairs, dtype=MATRIX_DTYPE).reshape(-1, 2) if len(pairs) else np.zeros((0, 2), dtype=MATRIX_DTYPE)
+        targets = arcs[:, 0]
+        if len(targets) and (targets.min() < 0 or targets.max() >= n):
+            raise ValueError(f"matrix_sparse row {i} lists a location outside 0..{n - 1}")
+        matrix[i, targets] = arcs[:, 1]
+        neighbors.append(np.unique(targets[targets != i]))
+    return matrix.ravel(), neighbors
@@ -0,0 +1,71 @@
+"""Prometheus metrics for the solve pipeline, exported on /metrics."""
+
+from typing import Any, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+from ..schemas.response_models import VRPOutput
+
+REGISTRY = CollectorRegistry()
+
+# 1 ms .. ~2 min, roughly doubling
+PHASE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+SOLVE_PHASE_SECONDS = Histogram(
+    "vrp_solve_phase_seconds", "Time spent per solve pipeline phase", ["phase"],
+    buckets=PHASE_BUCKETS, registry=REGISTRY
+)
+SOLVE_SECONDS = Histogram(
+    "vrp_solve_seconds", "End-to-end solve time", buckets=PHASE_BUCKETS, registry=REGISTRY
+)
+SOLVES = Counter("vrp_solves_total", "Solve requests by outcome", ["outcome"], registry=REGISTRY)
+SOLVER_SOLUTIONS = Counter("vrp_solver_solutions_total", "Solutions found by the OR-Tools search", registry=REGISTRY)
+SOLVER_BRANCHES = Counter("vrp_solver_branches_total", "Branches explored by the OR-Tools search", registry=REGISTRY)
+SOLVER_FAILURES = Counter("vrp_solver_failures_total", "Failures encountered by the OR-Tools search", registry=REGISTRY)
+SOLVER_IN_FLIGHT = Gauge("vrp_solver_in_flight", "Solves running or waiting in the solver pool", registry=REGISTRY)
+SOLVER_QUEUE_DEPTH = Gauge("vrp_solver_queue_depth", "Solves waiting for a solver worker", registry=REGISTRY)
+PERSISTENCE_QUEUE_DEPTH = Gauge("vrp_persistence_queue_depth", "Solutions waiting to be written", registry=REGISTRY)
+PERSISTENCE_BATCH_SECONDS = Histogram(
+    "vrp_persistence_batch_seconds", "Time to write one batch of solutions", buckets=PHASE_BUCKETS, registry=REGISTRY
+)
+
+_STAT_COUNTERS = {
+    "solutions": SOLVER_SOLUTIONS,
+    "branches": SOLVER_BRANCHES,
+    "failures": SOLVER_FAILURES,
+}
+
+
+def record_solve(result: VRPOutput) -> None:
+    metadata = result.metadata
+    if metadata is None:
+        return
+    SOLVES.labels(outcome="cache_hit" if metadata.cache_hit else "ok").inc()
+    if metadata.cache_hit:
+        return
+    SOLVE_SECONDS.observe(metadata.solve_time_seconds)
+    for phase, seconds in (metadata.phases or {}).items():
+        SOLVE_PHASE_SECONDS.labels(phase=phase).observe(seconds)
+    for stat, value in (metadata.search_stats or {}).items():
+        counter = _STAT_COUNTERS.get(stat)
+        if counter is not None:
+            counter.inc(value)
+
+
+def record_failure() -> None:
+    SOLVES.labels(outcome="error").inc()
+
+
+def track_executor(executor: Any) -> None:
+    # gauges read the live values at scrape time
+    SOLVER_IN_FLIGHT.set_function(lambda: executor.in_flight)
+    SOLVER_QUEUE_DEPTH.set_function(lambda: executor.queue_depth)
+
+
+def track_writer(writer: Optional[Any]) -> None:
+    if writer is not None:
+        PERSISTENCE_QUEUE_DEPTH.set_function(lambda: writer.pending)
+
+
+def render() -> Tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
\ No newline at end of file
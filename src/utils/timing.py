@@ -0,0 +1,35 @@
+"""Monotonic per-phase timing for the solve pipeline."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class PhaseTimer:
+    # lap-style: each lap records the time since the previous one under a phase name;
+    # span-style: span(name) records the time spent inside a with-block
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, name: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+    def reset(self) -> None:
+        # start the next lap now, e.g. after time that belongs to no phase
+        self._last = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases[name] = self.phases.get(name, 0.0) + (now - start)
+            self._last = now
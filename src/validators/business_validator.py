@@ -1,15 +1,23 @@
 """Business logic validation for VRP API."""
 
+from collections import Counter
 from typing import List, Dict, Set
+
+import numpy as np
 from ..exceptions import VRPError, ErrorCode
 from ..schemas.request_models import VRPInput
 from ..schemas.response_models import Route
 
 
 class BusinessValidator:
+    # matrix checks are O(N^2) in NumPy, everything else O(J+V) via precomputed maps
     
     @classmethod
     def validate_matrix(cls, data: VRPInput) -> None:
+        if data.matrix_buffer() is not None:
+            cls.validate_matrix_buffer(data.matrix_buffer(), data.matrix_size())
+            return
+
         matrix = data.matrix
         if not matrix:
             raise VRPError(
@@ -24,17 +32,35 @@ class BusinessValidator:
                     ErrorCode.INVALID_MATRIX_DATA,
                     f"Matrix must be square. Row {i} has {len(row)} elements, expected {n}"
                 )
-            
-            for j, distance in enumerate(row):
-                if distance < 0:
-                    raise VRPError(
-                        ErrorCode.INVALID_MATRIX_DATA,
-                        f"Distance cannot be negative at position [{i}][{j}]: {distance}"
-                    )
+        
+        # square now, so the cached array the solver reuses can be built here
+        cls.validate_matrix_buffer(data.matrix_array().ravel(), n)
+    
+    @staticmethod
+    def validate_matrix_buffer(buffer: np.ndarray, n: int) -> None:
+        if buffer.size == 0:
+            raise VRPError(
+                ErrorCode.INVALID_MATRIX_DATA,
+                "Matrix cannot be empty"
+            )
+        
+        if buffer.size != n * n:
+            raise VRPError(
+                ErrorCode.INVALID_MATRIX_DATA,
+                f"Matrix must be square. Got {buffer.size} values, expected {n}x{n}={n * n}"
+            )
+        
+        if buffer.min() < 0:
+            first = int(np.argmax(buffer < 0))
+            i, j = divmod(first, n)
+            raise VRPError(
+                ErrorCode.INVALID_MATRIX_DATA,
+                f"Distance cannot be negative at position [{i}][{j}]: {buffer[first]}"
+            )
     
     @staticmethod
     def validate_location_indices(data: VRPInput) -> None:
-        matrix_size = len(data.matrix)
+        matrix_size = data.matrix_size()
         
         for vehicle in data.vehicles:
             if vehicle.start_index >= matrix_size:
@@ -52,58 +78,60 @@ class BusinessValidator:
     
     @staticmethod
     def validate_vehicle_capacity_constraints(data: VRPInput) -> None:
-        for vehicle in data.vehicles:
-            if vehicle.capacity:
-                vehicle_capacity = vehicle.capacity[0]
-                
-                total_demand = sum(
-                    job.delivery[0] if job.delivery else 1 
-                    for job in data.jobs
-                )
-                
-                if vehicle_capacity < total_demand and len(data.vehicles) == 1:
-                    raise VRPError(
-                        ErrorCode.CAPACITY_EXCEEDED,
-                        f"Vehicle {vehicle.id} capacity {vehicle_capacity} cannot handle total demand {total_demand}"
-                    )
+        if len(data.vehicles) != 1 or not data.vehicles[0].capacity:
+            return
+        
+        vehicle = data.vehicles[0]
+        vehicle_capacity = vehicle.capacity[0]
+        total_demand = sum(job.delivery[0] if job.delivery else 1 for job in data.jobs)
+        
+        if vehicle_capacity < total_demand:
+            raise VRPError(
+                ErrorCode.CAPACITY_EXCEEDED,
+                f"Vehicle {vehicle.id} capacity {vehicle_capacity} cannot handle total demand {total_demand}"
+            )
     
     
     @staticmethod
     def validate_route_assignment(routes: Dict[str, Route], data: VRPInput) -> None:
-        assigned_jobs = []
+        assigned_counts: Counter = Counter()
         for route in routes.values():
-            assigned_jobs.extend(route.jobs)
+            assigned_counts.update(route.jobs)
         
-        expected_jobs = set(job.id for job in data.jobs)
-        actual_jobs = set(assigned_jobs)
+        expected_jobs: Set[int] = {job.id for job in data.jobs}
         
-        missing_jobs = expected_jobs - actual_jobs
+        missing_jobs = expected_jobs.difference(assigned_counts)
         if missing_jobs:
             raise VRPError(
                 ErrorCode.INVALID_ROUTE_ASSIGNMENT,
                 f"Some jobs are not assigned to any route: {list(missing_jobs)}"
             )
         
-        if len(assigned_jobs) != len(actual_jobs):
-            duplicates = [jid for jid in assigned_jobs if assigned_jobs.count(jid) > 1]
+        duplicates = [jid for jid, count in assigned_counts.items() if count > 1]
+        if duplicates:
             raise VRPError(
                 ErrorCode.INVALID_ROUTE_ASSIGNMENT,
-                f"Some jobs are assigned to multiple routes: {list(set(duplicates))}"
+                f"Some jobs are assigned to multiple routes: {duplicates}"
             )
     
     @staticmethod
     def validate_route_capacity(routes: Dict[str, Route], data: VRPInput) -> None:
+        vehicles_by_id = {str(v.id): v for v in data.vehicles if v.capacity}
+        if not vehicles_by_id:
+            return
+        
+        job_demands: Dict[int, int] = {
+            job.id: (job.delivery[0] if job.delivery else 0) for job in data.jobs
+        }
+        
         for vehicle_id, route in routes.items():
-            vehicle = next((v for v in data.vehicles if str(v.id) == vehicle_id), None)
-            if not vehicle or not vehicle.capacity:
+            vehicle = vehicles_by_id.get(vehicle_id)
+            if not vehicle:
                 continue
             
             vehicle_capacity = vehicle.capacity[0]
-            route_demand = sum(
-                job.delivery[0] if job.delivery else 0 
-                for job in data.jobs 
-                if job.id in route.jobs
-            )
+            # each job counted once, as with the previous membership test
+            route_demand = sum(job_demands.get(jid, 0) for jid in set(route.jobs))
             
             if route_demand > vehicle_capacity:
                 raise VRPError(
@@ -120,4 +148,4 @@ class BusinessValidator:
     @classmethod
     def validate_solution(cls, routes: Dict[str, Route], data: VRPInput) -> None:
         cls.validate_route_assignment(routes, data)
-        cls.validate_route_capacity(routes, data)
\ No newline at end of file
+        cls.validate_route_capacity(routes, data)
@@ -0,0 +1,18 @@
+import pytest
+
+
+def _grid_payload(size: int, jobs: int = None, vehicles: int = 2) -> dict:
+    # scattered points with Manhattan travel times; jobs (default: one per location) sit at locations 1..jobs,
+    # so a matrix larger than the jobs leaves room for jobs added later
+    jobs = size - 1 if jobs is None else jobs
+    coords = [((i * 37) % 101, (i * 53) % 97) for i in range(size)]
+    return {
+        "vehicles": [{"id": v, "start_index": 0} for v in range(1, vehicles + 1)],
+        "jobs": [{"id": i, "location_index": i} for i in range(1, jobs + 1)],
+        "matrix": [[abs(a[0] - b[0]) + abs(a[1] - b[1]) for b in coords] for a in coords]
+    }
+
+
+@pytest.fixture
+def grid_payload():
+    return _grid_payload
@@ -1,7 +1,23 @@
+import json
 import pytest
+import msgpack
+import numpy as np
 from fastapi.testclient import TestClient
 from src.app import create_app
 from src.services.vrp_service import VRPService
+from src.utils.matrix import encode_base64_matrix
+
+
+MATRIX = [
+    [0, 100, 200],
+    [100, 0, 150],
+    [200, 150, 0]
+]
+VEHICLES = [{"id": 1, "start_index": 0, "capacity": [10]}]
+JOBS = [
+    {"id": 1, "location_index": 1, "delivery": [2]},
+    {"id": 2, "location_index": 2, "delivery": [3]}
+]
 
 
 class TestVRPAPI:
@@ -19,6 +35,38 @@ class TestVRPAPI:
         assert data["status"] == "healthy"
         assert "version" in data
     
+    def test_solution_history_needs_persistence(self):
+        response = self.client.get("/solutions", params={"limit": 10})
+        
+        assert response.status_code == 503
+        assert response.json()["error"]["code"] == "DATABASE_ERROR"
+        assert self.client.get("/solutions", params={"limit": 0}).status_code == 422
+    
+    def test_ready_without_mongo_serves_and_reports_persistence(self, monkeypatch):
+        monkeypatch.setenv("MONGO_URI", "mongodb://127.0.0.1:1")
+        monkeypatch.setenv("MONGO_TIMEOUT", "200")
+        monkeypatch.setenv("MONGO_RETRY_INTERVAL", "0")
+        monkeypatch.setenv("VRP_SOLVER_MODE", "thread")
+        
+        assert self.client.get("/ready").status_code == 503
+        with TestClient(create_app()) as client:
+            # startup does not wait for MongoDB
+            ready = client.get("/ready")
+            assert ready.status_code == 200
+            assert ready.json()["serving"] is True
+            assert ready.json()["persistence"] in ("connecting", "unavailable")
+            
+            strict = client.get("/ready", params={"require_persistence": "true"})
+            assert strict.status_code == 503
+            assert strict.json()["status"] == "degraded"
+            
+            solved = client.post("/solve", json={
+                "vehicles": [{"id": 1, "start_index": 0}],
+                "jobs": [{"id": 1, "location_index": 1}],
+                "matrix": [[0, 5], [5, 0]]
+            })
+            assert solved.status_code == 200
+    
     def test_solve_vrp_endpoint(self):
         payload = {
             "vehicles": [
@@ -53,4 +101,207 @@ class TestVRPAPI:
         
         response = self.client.post("/solve", json=payload)
         
-        assert response.status_code == 422
\ No newline at end of file
+        assert response.status_code == 422
+    
+    def test_solve_with_base64_matrix(self):
+        payload = {"vehicles": VEHICLES, "jobs": JOBS, "matrix_b64": encode_base64_matrix(MATRIX)}
+        
+        response = self.client.post("/solve", json=payload)
+        expected = self.client.post("/solve", json={"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX})
+        
+        assert response.status_code == 200
+        assert response.json()["total_delivery_duration"] == expected.json()["total_delivery_duration"]
+    
+    def test_solve_with_flat_matrix(self):
+        payload = {"vehicles": VEHICLES, "jobs": JOBS, "matrix_flat": sum(MATRIX, []), "size": 3}
+        
+        response = self.client.post("/solve", json=payload)
+        
+        assert response.status_code == 200
+        assert len(response.json()["routes"]["1"]["jobs"]) == 2
+    
+    def test_solve_with_msgpack_body(self):
+        body = msgpack.packb({
+            "vehicles": VEHICLES,
+            "jobs": JOBS,
+            "matrix_bytes": np.asarray(MATRIX, dtype="<i4").tobytes(),
+            "size": 3
+        })
+        
+        response = self.client.post("/solve", content=body, headers={"content-type": "application/x-msgpack"})
+        
+        assert response.status_code == 200
+        assert len(response.json()["routes"]["1"]["jobs"]) == 2
+    
+    def test_non_square_binary_matrix_returns_400(self):
+        payload = {"vehicles": VEHICLES, "jobs": JOBS, "matrix_flat": [0, 1, 2, 3, 4], "size": 2}
+        
+        response = self.client.post("/solve", json=payload)
+        
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_MATRIX_DATA"
+    
+    def test_multiple_matrix_encodings_returns_422(self):
+        payload = {"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX, "matrix_b64": encode_base64_matrix(MATRIX)}
+        
+        response = self.client.post("/solve", json=payload)
+        
+        assert response.status_code == 422
+    
+    def test_out_of_range_matrix_values_are_rejected(self):
+        flat = {"vehicles": VEHICLES, "jobs": JOBS, "matrix_flat": [0, 2 ** 70, 2, 3, 0, 5, 6, 7, 0], "size": 3}
+        nested = {"vehicles": VEHICLES, "jobs": JOBS, "matrix": [[0, 2 ** 70, 2], [3, 0, 5], [6, 7, 0]]}
+        
+        for payload in (flat, nested):
+            response = self.client.post("/solve", json=payload)
+            
+            assert response.status_code == 422
+            assert "64-bit integers" in response.json()["detail"][0]["msg"]
+    
+    def test_solve_batch_returns_results_in_input_order(self):
+        problems = [
+            {"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX},
+            {"vehicles": VEHICLES, "jobs": JOBS},
+            {"vehicles": VEHICLES, "jobs": [{"id": 1, "location_index": 7}], "matrix": MATRIX},
+            {"vehicles": VEHICLES, "jobs": JOBS[:1], "matrix_flat": sum(MATRIX, []), "size": 3},
+            {"vehicles": VEHICLES, "jobs": JOBS, "matrix_flat": [0, 2 ** 70, 2, 3, 0, 5, 6, 7, 0], "size": 3}
+        ]
+        
+        response = self.client.post("/solve/batch", json={"problems": problems})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["index"] for item in data["results"]] == [0, 1, 2, 3, 4]
+        assert [item["status"] for item in data["results"]] == ["ok", "error", "error", "ok", "error"]
+        assert data["results"][1]["error"]["code"] == "VALIDATION_ERROR"
+        assert data["results"][2]["error"]["code"] == "INVALID_LOCATION_INDEX"
+        assert data["results"][3]["result"]["routes"]["1"]["jobs"] == [1]
+        assert data["results"][4]["error"]["code"] == "VALIDATION_ERROR"
+        assert (data["succeeded"], data["failed"]) == (2, 3)
+    
+    def test_solve_batch_streams_ndjson(self):
+        problems = [{"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX}, {"vehicles": VEHICLES, "jobs": JOBS}]
+        
+        response = self.client.post("/solve/batch?stream=true", json={"problems": problems})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda item: item["index"])
+        assert [item["status"] for item in items] == ["ok", "error"]
+    
+    def test_solve_batch_rejects_empty_batch(self):
+        response = self.client.post("/solve/batch", json={"problems": []})
+        
+        assert response.status_code == 422
+    
+    def test_phase_timings_only_when_requested(self):
+        plain = self.client.post("/solve", json={"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX}).json()
+        timed = self.client.post("/solve", json={"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX, "include_timings": True}).json()
+        
+        assert plain["metadata"]["phases"] is None
+        assert {"validation", "model_build", "search", "extraction"} <= set(timed["metadata"]["phases"])
+        assert timed["metadata"]["search_stats"]["solutions"] >= 1
+    
+    def test_metrics_endpoint_exports_phase_histograms(self):
+        self.client.post("/solve", json={"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX})
+        
+        response = self.client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'vrp_solve_phase_seconds_count{phase="search"}' in response.text
+        assert 'vrp_solves_total{outcome="ok"}' in response.text
+        assert "vrp_solver_solutions_total" in response.text
+        assert "vrp_solver_queue_depth" in response.text
+    
+    def test_deadline_header_bounds_the_solve(self):
+        from src.benchmarks.generators import uniform
+        
+        self.app.state.vrp_service = VRPService(time_limit=30, solution_limit=10_000_000, repository=None)
+        response = self.client.post("/solve", json=uniform(80, seed=1), headers={"X-Deadline-Seconds": "0.4"})
+        invalid = [
+            self.client.post("/solve", json={"vehicles": VEHICLES, "jobs": JOBS, "matrix": MATRIX},
+                             headers={"X-Deadline-Seconds": header})
+            for header in ("soon", "nan", "inf", "-1")
+        ]
+        
+        assert response.status_code == 200
+        assert response.json()["metadata"]["truncated"] is True
+        assert response.json()["metadata"]["solve_time_seconds"] < 0.6
+        for rejected in invalid:
+            assert rejected.status_code == 400
+            assert rejected.json()["error"]["code"] == "VALIDATION_ERROR"
+    
+    def test_shared_matrix_registry(self, tmp_path):
+        self.app.state.vrp_service = VRPService(repository=None, matrix_dir=str(tmp_path))
+        city = np.array([
+            [0, 7, 100, 9, 200],
+            [7, 0, 3, 100, 150],
+            [100, 3, 0, 4, 200],
+            [9, 100, 4, 0, 250],
+            [200, 150, 200, 250, 0],
+        ])
+        
+        raw = self.client.post(
+            "/matrices?size=5", content=city.astype("<i4").tobytes(),
+            headers={"Content-Type": "application/octet-stream"}
+        )
+        json_upload = self.client.post("/matrices", json={"matrix": city.tolist()})
+        
+        assert raw.status_code == 201
+        info = raw.json()
+        assert info["size"] == 5 and info["bytes"] == 100
+        # content-addressed: the same matrix in another encoding gets the same id
+        assert json_upload.json()["matrix_id"] == info["matrix_id"]
+        assert self.client.get(f"/matrices/{info['matrix_id']}").json() == info
+        
+        # locations 0, 2, 4 of the stored matrix; indices in the problem are positions in that list
+        response = self.client.post("/solve", json={
+            "vehicles": [{"id": 1, "start_index": 0}],
+            "jobs": [{"id": 1, "location_index": 1}, {"id": 2, "location_index": 2}],
+            "matrix_id": info["matrix_id"],
+            "locations": [0, 2, 4],
+        })
+        
+        assert response.status_code == 200
+        route = response.json()["routes"]["1"]
+        assert route["jobs"] == [1, 2]
+        assert route["total_distance"] == 300
+        
+        out_of_range = self.client.post("/solve", json={
+            "vehicles": [{"id": 1, "start_index": 0}],
+            "jobs": [{"id": 1, "location_index": 1}],
+            "matrix_id": info["matrix_id"],
+            "locations": [0, 9],
+        })
+        assert out_of_range.json()["error"]["code"] == "INVALID_LOCATION_INDEX"
+        
+        truncated = self.client.post(
+            "/matrices?size=5", content=b"\x00" * 12, headers={"Content-Type": "application/octet-stream"}
+        )
+        assert truncated.json()["error"]["code"] == "INVALID_MATRIX_DATA"
+        
+        assert self.client.delete(f"/matrices/{info['matrix_id']}").status_code == 204
+        assert self.client.get(f"/matrices/{info['matrix_id']}").status_code == 404
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_matrix_size_cap_and_delete_from_another_process(self, tmp_path, monkeypatch):
+        from src.repositories.matrix_store import MatrixStore
+        
+        monkeypatch.setenv("VRP_MATRIX_MAX_SIZE", "4")
+        self.app.state.vrp_service = VRPService(repository=None, matrix_dir=str(tmp_path))
+        
+        too_big = self.client.post("/matrices?size=100000", content=b"", headers={"Content-Type": "application/octet-stream"})
+        assert too_big.status_code == 400
+        assert "VRP_MATRIX_MAX_SIZE" in too_big.json()["error"]["message"]
+        assert not list(tmp_path.iterdir())
+        
+        matrix_id = self.client.post("/matrices", json={"matrix": MATRIX}).json()["matrix_id"]
+        assert self.client.get(f"/matrices/{matrix_id}").status_code == 200
+        # another worker's store deletes the file; this process' cached map must not keep serving it
+        MatrixStore(str(tmp_path)).delete(matrix_id)
+        assert self.client.get(f"/matrices/{matrix_id}").status_code == 404
+        solve = self.client.post("/solve", json={
+            "vehicles": VEHICLES, "jobs": JOBS, "matrix_id": matrix_id, "locations": [0, 1, 2]
+        })
+        assert solve.json()["error"]["code"] == "MATRIX_NOT_FOUND"
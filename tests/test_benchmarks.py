@@ -0,0 +1,69 @@
+import numpy as np
+from src.benchmarks.generators import GENERATORS, asymmetric, clustered
+from src.benchmarks.harness import compare, run_benchmark
+from src.benchmarks.transport import measure
+from src.benchmarks import validation
+from src.services.vrp_service import VRPService
+from src.schemas.request_models import VRPInput
+
+
+class TestBenchmarks:
+    
+    def setup_method(self):
+        self.vrp_service = VRPService(time_limit=20, solution_limit=10, repository=None)
+    
+    def test_generators_are_seeded_and_valid(self):
+        for kind, generate in GENERATORS.items():
+            payload = generate(60, seed=3)
+            
+            assert payload == generate(60, seed=3)
+            assert payload != generate(60, seed=4)
+            data = VRPInput(**payload)
+            assert len(data.jobs) == 60
+            assert data.matrix_array().shape == (61, 61)
+            assert sum(j.delivery[0] for j in data.jobs) <= sum(v.capacity[0] for v in data.vehicles)
+        
+        matrix = np.asarray(asymmetric(30, seed=1)["matrix"])
+        assert (matrix != matrix.T).any()
+        assert (np.diag(np.asarray(clustered(30, seed=1)["matrix"])) == 0).all()
+    
+    def test_report_has_phase_timings(self):
+        report = run_benchmark(self.vrp_service, ["clustered"], [50], seed=5)
+        
+        result = report["results"][0]
+        assert result["instance"] == "clustered-50-s5"
+        assert set(result["phases"]) == {"parse", "validation", "model_build", "search", "extraction"}
+        assert result["total_delivery_duration"] > 0
+        assert report["meta"]["settings"]["solution_limit"] == 10
+    
+    def test_transport_report_covers_requests_and_responses(self):
+        result = measure(60, seed=2, repeat=1)
+        
+        request = result["request"]["json"]
+        assert request["gzip"]["bytes"] < request["identity"]["bytes"]
+        assert result["request"]["msgpack"]["identity"]["bytes"] < request["identity"]["bytes"]
+        assert set(result["response"]["serialize_seconds"]) == {"fastapi_response_model", "orjson"}
+        assert result["response"]["wire"]["identity"]["bytes"] > 0
+    
+    def test_validation_report_covers_every_matrix_encoding(self):
+        result = validation.measure(60, seed=2, repeat=3)
+        
+        assert result["jobs"] == 60
+        assert set(result["median_ms"]) == {"matrix", "matrix_flat", "matrix_b64"}
+        assert all(median > 0 for median in result["median_ms"].values())
+    
+    def test_compare_flags_slowdowns_and_worse_solutions(self):
+        baseline = {"results": [
+            {"instance": "a", "phases": {"search": 1.0, "parse": 0.001}, "total_delivery_duration": 1000},
+            {"instance": "b", "phases": {"search": 1.0}, "total_delivery_duration": 1000},
+        ]}
+        current = {"results": [
+            {"instance": "a", "phases": {"search": 1.5, "parse": 0.005}, "total_delivery_duration": 1005},
+            {"instance": "b", "phases": {"search": 1.1}, "total_delivery_duration": 1100},
+            {"instance": "new", "phases": {"search": 9.0}, "total_delivery_duration": 1},
+        ]}
+        
+        regressions = compare(current, baseline, time_tolerance=0.25, quality_tolerance=0.01)
+        
+        assert [(r["instance"], r["metric"]) for r in regressions] == [("a", "search"), ("b", "total_delivery_duration")]
+        assert regressions[0]["change"] == 0.5
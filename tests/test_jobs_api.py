@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import httpx
+from src.app import create_app
+from src.services.vrp_service import VRPService
+from src.services.solver_executor import SolverExecutor
+from src.services.job_manager import JobManager
+
+
+class TestJobsAPI:
+    
+    def setup_method(self):
+        self.app = create_app()
+    
+    def teardown_method(self):
+        self.app.state.solver_executor.shutdown()
+    
+    def _attach_solver(self, solution_limit, workers=1):
+        self.app.state.vrp_service = VRPService(time_limit=20, solution_limit=solution_limit, repository=None)
+        self.app.state.solver_executor = SolverExecutor(self.app.state.vrp_service, mode="thread", max_workers=workers, max_queue=1)
+        self.app.state.job_manager = JobManager(self.app.state.solver_executor)
+    
+    def _run(self, scenario):
+        async def runner():
+            async with httpx.AsyncClient(app=self.app, base_url="http://test") as client:
+                try:
+                    return await scenario(client)
+                finally:
+                    await self.app.state.job_manager.shutdown()
+        return asyncio.run(runner())
+    
+    async def _wait_for(self, client, job_id, predicate, timeout=15.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            status = (await client.get(f"/jobs/{job_id}")).json()
+            if predicate(status):
+                return status
+            assert asyncio.get_running_loop().time() < deadline, status
+            await asyncio.sleep(0.05)
+    
+    def test_submit_poll_and_stop_early(self, grid_payload):
+        self._attach_solver(solution_limit=1_000_000)
+        
+        async def scenario(client):
+            submitted = await client.post("/jobs", json=grid_payload(60))
+            assert submitted.status_code == 202
+            job_id = submitted.json()["job_id"]
+            
+            await self._wait_for(client, job_id, lambda s: s["best_objective"] is not None)
+            stopped = await client.post(f"/jobs/{job_id}/stop")
+            assert stopped.status_code == 200
+            
+            return await self._wait_for(client, job_id, lambda s: s["status"] == "completed")
+        
+        status = self._run(scenario)
+        
+        assert status["result"]["metadata"]["stopped_early"] is True
+        assert status["elapsed_seconds"] < 15
+        assert sorted(j for jobs in status["best_routes"].values() for j in jobs) == list(range(1, 60))
+    
+    def test_event_stream_reports_improvements(self, grid_payload):
+        self._attach_solver(solution_limit=50)
+        
+        async def scenario(client):
+            job_id = (await client.post("/jobs", json=grid_payload(12))).json()["job_id"]
+            return (await client.get(f"/jobs/{job_id}/events")).text
+        
+        body = self._run(scenario)
+        events = [block.split("\n") for block in body.strip().split("\n\n")]
+        names = [lines[0].removeprefix("event: ") for lines in events]
+        
+        assert names[0] == "started"
+        assert "improvement" in names
+        assert names[-1] == "completed"
+        objectives = [json.loads(lines[1].removeprefix("data: "))["objective"]
+                      for lines in events if lines[0] == "event: improvement"]
+        assert objectives == sorted(objectives, reverse=True)
+    
+    def test_concurrent_jobs_share_one_event_pump(self, grid_payload):
+        self._attach_solver(solution_limit=50, workers=2)
+        
+        async def scenario(client):
+            ids = [(await client.post("/jobs", json=grid_payload(size))).json()["job_id"] for size in (12, 20)]
+            pumps = [t for t in threading.enumerate() if t.name == "vrp-job-events"]
+            statuses = [await self._wait_for(client, job_id, lambda s: s["status"] == "completed") for job_id in ids]
+            return pumps, statuses
+        
+        pumps, statuses = self._run(scenario)
+        
+        assert len(pumps) == 1
+        assert not pumps[0].is_alive()
+        for status, size in zip(statuses, (12, 20)):
+            assert sorted(j for jobs in status["best_routes"].values() for j in jobs) == list(range(1, size))
+            assert status["improvements"] >= 1
+    
+    def test_unknown_job_returns_404(self):
+        self._attach_solver(solution_limit=50)
+        
+        async def scenario(client):
+            return await client.get("/jobs/does-not-exist")
+        
+        response = self._run(scenario)
+        
+        assert response.status_code == 404
+        assert response.json()["error"]["code"] == "JOB_NOT_FOUND"
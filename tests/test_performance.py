@@ -42,4 +42,53 @@ class TestVRPPerformance:
         assert result.metadata.solve_time_seconds < 10.0
         
         total_jobs_assigned = sum(len(route.jobs) for route in result.routes.values())
-        assert total_jobs_assigned == 20
\ No newline at end of file
+        assert total_jobs_assigned == 20
+    
+    def test_validation_outpaces_unvectorised_scan(self):
+        # the absolute 1 ms budget is checked by python -m src.benchmarks.validation; this only compares
+        # against the old per-element scan on the same machine, so it holds on slow runners too
+        import numpy as np
+        from src.schemas.response_models import Route
+        from src.validators.business_validator import BusinessValidator
+        from src.utils.matrix import encode_base64_matrix
+        
+        n_jobs, n_vehicles = 500, 10
+        rng = np.random.default_rng(7)
+        matrix = rng.integers(0, 3600, size=(n_jobs + 1, n_jobs + 1))
+        vehicles = [Vehicle(id=i, start_index=0, capacity=[200]) for i in range(1, n_vehicles + 1)]
+        jobs = [Job(id=i, location_index=i, delivery=[2], service=60) for i in range(1, n_jobs + 1)]
+        routes = {
+            str(v): Route(
+                jobs=list(range(v, n_jobs + 1, n_vehicles)),
+                delivery_duration=0, capacity_used=0, total_service_time=0,
+                total_distance=0, start_location=0
+            )
+            for v in range(1, n_vehicles + 1)
+        }
+        rows = matrix.tolist()
+        
+        def unvectorised_scan():
+            # the per-element negativity check the validator used to run, on its own
+            for row in rows:
+                for distance in row:
+                    if distance < 0:
+                        raise AssertionError
+        
+        def median_seconds(fn, runs):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+            return sorted(timings)[runs // 2]
+        
+        scan = median_seconds(unvectorised_scan, 11)
+        for encoding in ({"matrix": rows}, {"matrix_b64": encode_base64_matrix(matrix)}):
+            data = VRPInput(vehicles=vehicles, jobs=jobs, **encoding)
+            
+            def validate():
+                BusinessValidator.validate_business_rules(data)
+                BusinessValidator.validate_solution(routes, data)
+            
+            # full validation runs ~30x faster than that one scan here
+            assert median_seconds(validate, 50) * 5 < scan, list(encoding)
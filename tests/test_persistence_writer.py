@@ -0,0 +1,97 @@
+import threading
+import time
+from src.repositories.persistence_writer import PersistenceWriter
+from src.services.vrp_service import VRPService
+from src.schemas.request_models import VRPInput, Vehicle, Job
+
+
+def _sample_input() -> VRPInput:
+    return VRPInput(
+        vehicles=[Vehicle(id=1, start_index=0, capacity=[10])],
+        jobs=[
+            Job(id=1, location_index=1, delivery=[2]),
+            Job(id=2, location_index=2, delivery=[3])
+        ],
+        matrix=[
+            [0, 100, 200],
+            [100, 0, 150],
+            [200, 150, 0]
+        ]
+    )
+
+
+class RecordingRepository:
+
+    def __init__(self, delay: float = 0.0, gate: threading.Event = None):
+        self.batches = []
+        self.delay = delay
+        self.gate = gate
+
+    def save_solutions_batch(self, entries):
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        self.batches.append(list(entries))
+        return [str(i) for i in range(len(entries))]
+
+
+class TestPersistenceWriter:
+
+    def setup_method(self):
+        self.data = _sample_input()
+        self.result = VRPService(time_limit=5, repository=None).solve(self.data)
+
+    def test_batches_and_flushes_on_close(self):
+        gate = threading.Event()
+        repository = RecordingRepository(gate=gate)
+        writer = PersistenceWriter(repository, max_queue=100, batch_size=4, flush_interval=0.05)
+        for _ in range(10):
+            assert writer.submit(self.data, self.result)
+        gate.set()
+        writer.close()
+
+        assert sum(len(batch) for batch in repository.batches) == 10
+        assert all(len(batch) <= 4 for batch in repository.batches)
+        assert writer.written == 10
+        assert writer.pending == 0
+        vehicles, jobs, result = repository.batches[0][0]
+        assert vehicles == self.data.vehicles and jobs == self.data.jobs and result == self.result
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        gate = threading.Event()
+        writer = PersistenceWriter(RecordingRepository(gate=gate), max_queue=2, batch_size=1, flush_interval=0.05)
+        time.sleep(0.1)
+        start = time.monotonic()
+        accepted = [writer.submit(self.data, self.result) for _ in range(6)]
+        elapsed = time.monotonic() - start
+        gate.set()
+        writer.close()
+
+        assert elapsed < 0.05
+        assert accepted.count(False) == writer.dropped
+        assert writer.dropped >= 3
+        assert writer.written == accepted.count(True)
+
+    def test_service_persists_through_writer(self):
+        repository = RecordingRepository(delay=0.5)
+        writer = PersistenceWriter(repository, flush_interval=0.05)
+        service = VRPService(time_limit=5, repository=repository, writer=writer)
+
+        start = time.monotonic()
+        service.persist_solution(self.data, self.result)
+        assert time.monotonic() - start < 0.1
+
+        writer.close()
+        assert writer.written == 1
+
+    def test_repository_errors_are_counted(self):
+        class FailingRepository:
+            def save_solutions_batch(self, entries):
+                raise RuntimeError("connection refused")
+
+        writer = PersistenceWriter(FailingRepository(), flush_interval=0.05)
+        writer.submit(self.data, self.result)
+        writer.close()
+
+        assert writer.failed == 1
+        assert writer.written == 0
\ No newline at end of file
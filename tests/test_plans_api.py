@@ -0,0 +1,100 @@
+import asyncio
+import httpx
+from src.app import create_app
+from src.services.vrp_service import VRPService
+from src.services.solver_executor import SolverExecutor
+from src.services.plan_manager import PlanManager
+
+
+def _assigned(status: dict) -> set:
+    return {job for route in status["result"]["routes"].values() for job in route["jobs"]}
+
+
+class TestPlansAPI:
+    
+    def setup_method(self):
+        self.app = create_app()
+        self.app.state.vrp_service = VRPService(time_limit=20, solution_limit=100, repository=None)
+        self.app.state.solver_executor = SolverExecutor(self.app.state.vrp_service, mode="thread", max_workers=1, max_queue=1)
+        self.app.state.plan_manager = PlanManager(self.app.state.solver_executor, refine_seconds=0.5)
+    
+    def teardown_method(self):
+        self.app.state.solver_executor.shutdown()
+    
+    def _run(self, scenario):
+        async def runner():
+            async with httpx.AsyncClient(app=self.app, base_url="http://test") as client:
+                return await scenario(client)
+        return asyncio.run(runner())
+    
+    def test_deltas_repair_and_refine_the_current_plan(self, grid_payload):
+        async def scenario(client):
+            created = await client.post("/plans", json=grid_payload(40, 30, vehicles=3))
+            assert created.status_code == 201
+            plan = created.json()
+            plan_id = plan["plan_id"]
+            assert plan["version"] == 1
+            assert _assigned(plan) == set(range(1, 31))
+            
+            added = await client.post(f"/plans/{plan_id}/deltas", json={
+                "add_jobs": [{"id": 31, "location_index": 31}, {"id": 32, "location_index": 32}],
+                "remove_jobs": [5, 6]
+            })
+            assert added.status_code == 200
+            status = added.json()
+            assert status["version"] == 2
+            assert _assigned(status) == (set(range(1, 33)) - {5, 6})
+            assert status["result"]["metadata"]["warm_started"] is True
+            
+            # jobs of an unavailable vehicle are re-inserted on the remaining ones
+            dropped = await client.post(f"/plans/{plan_id}/deltas", json={"unavailable_vehicles": [2]})
+            status = dropped.json()
+            assert status["version"] == 3
+            assert set(status["result"]["routes"]) <= {"1", "3"}
+            assert _assigned(status) == (set(range(1, 33)) - {5, 6})
+            
+            fetched = await client.get(f"/plans/{plan_id}")
+            assert fetched.json()["version"] == 3
+        
+        self._run(scenario)
+    
+    def test_removed_job_location_is_no_longer_visited(self):
+        async def scenario(client):
+            # job 3 is the only one at the far location 3
+            payload = {
+                "vehicles": [{"id": 1, "start_index": 0}],
+                "jobs": [{"id": i, "location_index": i} for i in (1, 2, 3)],
+                "matrix": [
+                    [0, 1, 2, 50],
+                    [1, 0, 1, 50],
+                    [2, 1, 0, 50],
+                    [50, 50, 50, 0]
+                ]
+            }
+            plan = (await client.post("/plans", json=payload)).json()
+            assert plan["result"]["routes"]["1"]["end_location"] == 3
+            
+            status = (await client.post(f"/plans/{plan['plan_id']}/deltas", json={"remove_jobs": [3]})).json()
+            route = status["result"]["routes"]["1"]
+            assert route["jobs"] == [1, 2]
+            assert route["end_location"] == 2
+            assert status["result"]["total_delivery_duration"] == 2
+        
+        self._run(scenario)
+    
+    def test_invalid_deltas_leave_the_plan_unchanged(self, grid_payload):
+        async def scenario(client):
+            plan_id = (await client.post("/plans", json=grid_payload(20, 10, vehicles=3))).json()["plan_id"]
+            
+            unknown = await client.post(f"/plans/{plan_id}/deltas", json={"remove_jobs": [99]})
+            assert unknown.status_code == 400
+            duplicate = await client.post(f"/plans/{plan_id}/deltas", json={"add_jobs": [{"id": 3, "location_index": 12}]})
+            assert duplicate.status_code == 400
+            assert (await client.get(f"/plans/{plan_id}")).json()["version"] == 1
+            
+            assert (await client.delete(f"/plans/{plan_id}")).status_code == 204
+            missing = await client.get(f"/plans/{plan_id}")
+            assert missing.status_code == 404
+            assert missing.json()["error"]["code"] == "PLAN_NOT_FOUND"
+        
+        self._run(scenario)
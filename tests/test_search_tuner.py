@@ -0,0 +1,81 @@
+from src.services.vrp_service import VRPService
+from src.services.portfolio import PORTFOLIO, SearchConfig
+from src.services.search_tuner import SearchTuner, converged_at
+from src.schemas.request_models import VRPInput
+from src.schemas.response_models import VRPOutput, VRPMetadata
+
+
+def _features(jobs: int) -> dict:
+    return {"jobs": jobs, "vehicles": 3, "density": 1.0, "tightness": 0.0, "scale": 100.0 * jobs}
+
+
+def _result(strategy: str, curve: list) -> VRPOutput:
+    metadata = VRPMetadata(solve_time_seconds=curve[-1][0], random_seed=0, strategy=strategy, convergence=curve)
+    return VRPOutput(total_delivery_duration=int(curve[-1][1]), routes={}, metadata=metadata)
+
+
+class TestSearchTuner:
+    
+    def setup_method(self):
+        self.tuner = SearchTuner(time_limit=30, explore=0.0, min_history=4)
+    
+    def test_recommends_best_pair_and_converged_budget(self):
+        for _ in range(3):
+            self.tuner.record(_features(50), _result("PATH_CHEAPEST_ARC+GUIDED_LOCAL_SEARCH/seed=0", [[0.1, 9000], [2.0, 6000]]))
+        assert self.tuner.recommend(_features(50), seed=7) is None
+        
+        for _ in range(3):
+            self.tuner.record(_features(55), _result("SAVINGS+GUIDED_LOCAL_SEARCH/seed=1", [[0.05, 5600], [0.4, 5000], [3.0, 4990]]))
+        search = self.tuner.recommend(_features(52), seed=7)
+        
+        assert (search.first_solution_strategy, search.metaheuristic) == ("SAVINGS", "GUIDED_LOCAL_SEARCH")
+        assert search.seed == 7
+        # converged within 1% at 0.4s, so the budget is 0.4s with margin instead of the 30s limit
+        assert abs(search.time_budget - 0.6) < 1e-9
+    
+    def test_distant_instances_are_not_neighbours(self):
+        for _ in range(5):
+            self.tuner.record(_features(20), _result("PATH_CHEAPEST_ARC+GUIDED_LOCAL_SEARCH/seed=0", [[0.1, 900]]))
+        
+        assert self.tuner.recommend(_features(2000), seed=0) is None
+        assert converged_at([[0.1, 900], [1.0, 800], [5.0, 799]], 799) == 1.0
+    
+    def test_service_switches_to_tuned_budget(self, grid_payload):
+        service = VRPService(time_limit=1, solution_limit=1_000_000, repository=None,
+                             tuner=SearchTuner(time_limit=1, explore=0.0, min_history=3))
+        
+        for _ in range(3):
+            untuned = service.solve(VRPInput(**grid_payload(15)))
+            assert not untuned.metadata.autotuned
+        assert len(service.tuner) == 3
+        
+        tuned = service.solve(VRPInput(**grid_payload(16)))
+        
+        assert tuned.metadata.autotuned
+        assert tuned.metadata.solve_time_seconds < untuned.metadata.solve_time_seconds
+        assert sorted(j for r in tuned.routes.values() for j in r.jobs) == list(range(1, 16))
+        assert tuned.metadata.convergence is None
+    
+    def test_failed_pairs_are_not_explored(self):
+        tuner = SearchTuner(time_limit=30, explore=1.0, min_history=1)
+        failing = PORTFOLIO[-1]
+        for pair in PORTFOLIO[:-1]:
+            tuner.record(_features(50), _result(f"{pair[0]}+{pair[1]}/seed=0", [[0.1, 900]]))
+        tuner.record_failure(_features(50), SearchConfig(*failing, seed=0))
+        
+        picks = {(s.first_solution_strategy, s.metaheuristic) for s in (tuner.recommend(_features(50), seed=i) for i in range(20))}
+        
+        assert failing not in picks
+        assert len(tuner) == len(PORTFOLIO)
+    
+    def test_tuned_search_without_solution_falls_back_to_default(self, grid_payload):
+        service = VRPService(time_limit=5, solution_limit=50, repository=None,
+                             tuner=SearchTuner(time_limit=5, explore=0.0, min_history=1))
+        # SWEEP needs node coordinates, which these models lack, so it never finds a solution
+        service.tuner.recommend = lambda features, seed: SearchConfig("SWEEP", "GUIDED_LOCAL_SEARCH", seed=seed, time_budget=1.0)
+        
+        result = service.solve(VRPInput(**grid_payload(10)))
+        
+        assert not result.metadata.autotuned
+        assert sorted(j for r in result.routes.values() for j in r.jobs) == list(range(1, 10))
+        assert [r.get("failed", False) for r in service.tuner._records] == [True, False]
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from src.services.solution_history import decode_cursor, encode_cursor, parse_fields, public_solution
+from src.exceptions import VRPError
+
+
+class TestSolutionHistory:
+    
+    def test_cursor_round_trip(self):
+        doc = {"_id": ObjectId(), "timestamp": datetime(2024, 5, 1, 12, 30, 15, 123000)}
+        
+        cursor = encode_cursor(doc)
+        
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (doc["timestamp"], doc["_id"])
+        with pytest.raises(VRPError):
+            decode_cursor("not-a-cursor")
+    
+    def test_fields_are_validated(self):
+        assert parse_fields(None) is None
+        assert parse_fields("total_delivery_duration, metadata.solve_time_seconds") == [
+            "total_delivery_duration", "metadata.solve_time_seconds"
+        ]
+        for bad in ("$where", "routes..jobs", "_id"):
+            with pytest.raises(VRPError):
+                parse_fields(bad)
+    
+    def test_public_solution_exposes_string_id(self):
+        oid = ObjectId()
+        
+        doc = public_solution({"_id": oid, "total_delivery_duration": 42})
+        
+        assert doc == {"id": str(oid), "total_delivery_duration": 42}
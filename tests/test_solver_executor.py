@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+from src.services.vrp_service import VRPService
+from src.services.solver_executor import SolverExecutor
+from src.services.batch_solver import solve_batch
+from src.schemas.request_models import VRPInput, Vehicle, Job
+from src.exceptions import VRPSystemError, ErrorCode
+
+
+def _sample_input() -> VRPInput:
+    return VRPInput(
+        vehicles=[Vehicle(id=1, start_index=0, capacity=[10])],
+        jobs=[
+            Job(id=1, location_index=1, delivery=[2]),
+            Job(id=2, location_index=2, delivery=[3])
+        ],
+        matrix=[
+            [0, 100, 200],
+            [100, 0, 150],
+            [200, 150, 0]
+        ]
+    )
+
+
+class TestSolverExecutor:
+
+    def setup_method(self):
+        self.vrp_service = VRPService(time_limit=5, repository=None)
+
+    def test_thread_pool_solves(self):
+        executor = SolverExecutor(self.vrp_service, mode="thread", max_workers=2, max_queue=0)
+        try:
+            result = asyncio.run(executor.solve(_sample_input()))
+        finally:
+            executor.shutdown()
+
+        assert len(result.routes["1"].jobs) == 2
+        assert executor.in_flight == 0
+
+    def test_process_pool_solves(self):
+        executor = SolverExecutor(self.vrp_service, mode="process", max_workers=1, max_queue=0)
+        try:
+            result = asyncio.run(executor.solve(_sample_input()))
+        finally:
+            executor.shutdown()
+
+        assert result.routes["1"].capacity_used == 5
+
+    def test_saturated_executor_rejects(self):
+        executor = SolverExecutor(self.vrp_service, mode="thread", max_workers=1, max_queue=0)
+        executor._in_flight = executor.capacity
+        try:
+            with pytest.raises(VRPSystemError) as exc_info:
+                asyncio.run(executor.solve(_sample_input()))
+        finally:
+            executor.shutdown()
+
+        assert exc_info.value.error_code == ErrorCode.SOLVER_BUSY
+
+    def test_process_pool_propagates_vrp_errors(self):
+        data = _sample_input()
+        data.matrix[1] = [100, 0]
+        executor = SolverExecutor(self.vrp_service, mode="process", max_workers=1, max_queue=0)
+        try:
+            with pytest.raises(Exception) as exc_info:
+                asyncio.run(executor.solve(data))
+        finally:
+            executor.shutdown()
+
+        assert exc_info.value.error_code == ErrorCode.INVALID_MATRIX_DATA
+
+    def test_batch_fans_out_over_process_pool(self):
+        bad = _sample_input()
+        bad.matrix[1] = [100, 0]
+        problems = [_sample_input(), bad, _sample_input()]
+        executor = SolverExecutor(self.vrp_service, mode="process", max_workers=2, max_queue=0)
+
+        async def collect():
+            return [item async for item in solve_batch(problems, executor.solve, executor.max_workers)]
+
+        try:
+            items = sorted(asyncio.run(collect()), key=lambda item: item.index)
+        finally:
+            executor.shutdown()
+
+        assert [item.status for item in items] == ["ok", "error", "ok"]
+        assert items[1].error["code"] == "INVALID_MATRIX_DATA"
+        assert items[0].result.routes["1"].capacity_used == 5
+        assert executor.in_flight == 0
+
+    def test_portfolio_occupies_one_worker_per_search(self):
+        data = _sample_input()
+        data.portfolio_size = 4
+        executor = SolverExecutor(self.vrp_service, mode="process", max_workers=2, max_queue=0)
+        try:
+            result = asyncio.run(executor.solve(data))
+            executor._in_flight = 1
+            with pytest.raises(VRPSystemError) as exc_info:
+                asyncio.run(executor.solve(data))
+        finally:
+            executor._in_flight = 0
+            executor.shutdown()
+
+        assert result.metadata.portfolio_size == 2
+        assert result.routes["1"].capacity_used == 5
+        assert exc_info.value.error_code == ErrorCode.SOLVER_BUSY
+
+    def test_decomposed_solve_runs_subproblems_on_the_pool(self):
+        from src.benchmarks.generators import uniform
+
+        service = VRPService(time_limit=20, solution_limit=50, cluster_size=60)
+        executor = SolverExecutor(service, mode="process", max_workers=2, max_queue=0)
+        try:
+            result = asyncio.run(executor.solve(VRPInput(**uniform(150, seed=5), decompose=True)))
+        finally:
+            executor.shutdown()
+
+        assert result.metadata.clusters == 3
+        assert sorted(j for r in result.routes.values() for j in r.jobs) == list(range(1, 151))
+        assert executor.in_flight == 0
+
+    def test_workers_slice_stored_matrices(self, tmp_path):
+        import numpy as np
+
+        service = VRPService(time_limit=5, repository=None, matrix_dir=str(tmp_path))
+        info = service.matrix_store.put(np.array([[0, 100, 200, 7], [100, 0, 150, 7], [200, 150, 0, 7], [7, 7, 7, 0]]))
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0, capacity=[10])],
+            jobs=[Job(id=1, location_index=1, delivery=[2]), Job(id=2, location_index=2, delivery=[3])],
+            matrix_id=info["matrix_id"],
+            locations=[0, 1, 2]
+        )
+        executor = SolverExecutor(service, mode="process", max_workers=1, max_queue=0)
+        try:
+            result = asyncio.run(executor.solve(data))
+        finally:
+            executor.shutdown()
+
+        assert result.total_delivery_duration == 250
+        # the parent only forwarded the reference, the worker did the slicing
+        assert data.matrix_buffer() is None
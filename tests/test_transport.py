@@ -0,0 +1,120 @@
+import gzip
+import json
+import zlib
+from datetime import datetime
+
+import msgpack
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from src.api import compression
+from src.api.compression import negotiate
+from src.api.responses import dumps
+from src.app import create_app
+from src.schemas.response_models import JobStatus, Route, VRPMetadata, VRPOutput
+from src.services.vrp_service import VRPService
+
+
+MATRIX = [
+    [0, 100, 200],
+    [100, 0, 150],
+    [200, 150, 0]
+]
+PROBLEM = {
+    "vehicles": [{"id": 1, "start_index": 0, "capacity": [10]}],
+    "jobs": [{"id": 1, "location_index": 1, "delivery": [2]}, {"id": 2, "location_index": 2, "delivery": [3]}],
+    "matrix": MATRIX
+}
+
+
+class TestNegotiation:
+
+    def test_highest_q_value_wins_and_zstd_needs_its_package(self, monkeypatch):
+        monkeypatch.setattr(compression, "_zstd", lambda: object())
+        assert negotiate("gzip, deflate, br, zstd") == "zstd"
+        assert negotiate("zstd;q=0.5, gzip") == "gzip"
+        assert negotiate("*") == "zstd"
+        assert negotiate("gzip;q=0, *;q=0.1") == "zstd"
+
+        monkeypatch.setattr(compression, "_zstd", lambda: None)
+        assert negotiate("zstd, gzip;q=0.2") == "gzip"
+        assert negotiate("zstd, br") is None
+        assert negotiate("") is None
+        assert negotiate("identity, gzip;q=0") is None
+
+
+class TestTransport:
+
+    def setup_method(self):
+        self.app = create_app()
+        self.app.state.vrp_service = VRPService(repository=None)
+        self.client = TestClient(self.app)
+
+    def test_orjson_body_matches_fastapi_encoding(self):
+        output = VRPOutput.model_construct(
+            total_delivery_duration=450,
+            routes={"1": Route(jobs=[1, 2], delivery_duration=450, capacity_used=5, total_service_time=0,
+                               total_distance=450, start_location=0)},
+            metadata=VRPMetadata(solve_time_seconds=0.01, random_seed=0, convergence=[[0.0, 450.0]])
+        )
+        status = JobStatus(job_id="j", status="done", created_at=datetime(2024, 5, 1, 8, 30, 0, 1500),
+                           elapsed_seconds=1.5, result=output)
+
+        assert json.loads(dumps(status)) == jsonable_encoder(status)
+
+    def test_compressed_request_bodies_are_inflated(self):
+        plain = self.client.post("/solve", json=PROBLEM)
+        gzipped = self.client.post("/solve", content=gzip.compress(json.dumps(PROBLEM).encode()),
+                                   headers={"content-type": "application/json", "content-encoding": "gzip"})
+        deflated_msgpack = self.client.post("/solve", content=zlib.compress(msgpack.packb(PROBLEM)),
+                                            headers={"content-type": "application/x-msgpack", "content-encoding": "deflate"})
+
+        assert plain.status_code == gzipped.status_code == deflated_msgpack.status_code == 200
+        assert gzipped.json()["routes"] == plain.json()["routes"] == deflated_msgpack.json()["routes"]
+
+    def test_compressed_raw_matrix_upload(self, tmp_path):
+        self.app.state.vrp_service = VRPService(repository=None, matrix_dir=str(tmp_path))
+        raw = np.asarray(MATRIX, dtype="<i4").tobytes()
+
+        response = self.client.post("/matrices?size=3", content=gzip.compress(raw),
+                                    headers={"content-type": "application/octet-stream", "content-encoding": "gzip"})
+
+        assert response.status_code == 201
+        assert response.json()["bytes"] == len(raw)
+
+    def test_bad_request_encodings_return_400(self, monkeypatch):
+        body = json.dumps(PROBLEM).encode()
+        headers = {"content-type": "application/json"}
+
+        corrupt = self.client.post("/solve", content=b"not gzip", headers={**headers, "content-encoding": "gzip"})
+        truncated = self.client.post("/solve", content=gzip.compress(body)[:-12], headers={**headers, "content-encoding": "gzip"})
+        unsupported = self.client.post("/solve", content=body, headers={**headers, "content-encoding": "br"})
+        monkeypatch.setenv("VRP_MAX_DECODED_BODY_MB", "0")
+        oversized = self.client.post("/solve", content=gzip.compress(body), headers={**headers, "content-encoding": "gzip"})
+
+        for response in (corrupt, truncated, unsupported, oversized):
+            assert response.status_code == 400
+            assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+        assert "br" in unsupported.json()["error"]["details"]["details"]
+        assert "VRP_MAX_DECODED_BODY_MB" in oversized.json()["error"]["details"]["details"]
+
+    def test_responses_compressed_when_accepted(self, monkeypatch):
+        monkeypatch.setenv("VRP_COMPRESS_MIN_BYTES", "200")
+        monkeypatch.setattr(compression, "_zstd", lambda: None)
+        client = TestClient(create_app())
+        client.app.state.vrp_service = VRPService(repository=None)
+
+        compressed = client.post("/solve", json=PROBLEM, headers={"accept-encoding": "gzip"})
+        identity = client.post("/solve", json=PROBLEM, headers={"accept-encoding": "identity"})
+        small = client.get("/health", headers={"accept-encoding": "gzip"})
+        streamed = client.post("/solve/batch?stream=true", json={"problems": [PROBLEM]}, headers={"accept-encoding": "gzip"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in compressed.headers["vary"].lower()
+        assert int(compressed.headers["content-length"]) < len(identity.content)
+        assert compressed.json()["routes"] == identity.json()["routes"]
+        assert "content-encoding" not in identity.headers
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in streamed.headers
+        assert json.loads(streamed.text.splitlines()[0])["status"] == "ok"
@@ -44,4 +44,304 @@ class TestVRPService:
         )
         
         with pytest.raises(VRPError):
-            self.vrp_service.solve(data)
\ No newline at end of file
+            self.vrp_service.solve(data)
+    
+    def test_native_and_python_transits_agree(self):
+        data = VRPInput(
+            vehicles=[
+                Vehicle(id=1, start_index=0, capacity=[6]),
+                Vehicle(id=2, start_index=0, capacity=[6])
+            ],
+            jobs=[
+                Job(id=i, location_index=i, delivery=[1], service=50 * i)
+                for i in range(1, 9)
+            ],
+            matrix=[
+                [abs(i - j) * 100 + (i * j) % 7 for j in range(9)]
+                for i in range(9)
+            ]
+        )
+        
+        native = VRPService(native_transits=True).solve(data)
+        python = VRPService(native_transits=False).solve(data)
+        
+        assert native.total_delivery_duration == python.total_delivery_duration
+        assert native.metadata.objective_value == python.metadata.objective_value
+
+    
+    def test_concurrent_solves_share_one_service(self):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def make_input(size):
+            return VRPInput(
+                vehicles=[Vehicle(id=1, start_index=0, capacity=[100])],
+                jobs=[Job(id=i, location_index=i, delivery=[1]) for i in range(1, size)],
+                matrix=[[abs(i - j) * size for j in range(size)] for i in range(size)]
+            )
+        
+        inputs = [make_input(size) for size in (4, 7, 10, 13) * 3]
+        expected = [self.vrp_service.solve(data).total_delivery_duration for data in inputs]
+        
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(self.vrp_service.solve, inputs))
+        
+        assert [r.total_delivery_duration for r in results] == expected
+        for data, result in zip(inputs, results):
+            assert len(result.routes["1"].jobs) == len(data.jobs)
+
+    
+    def test_solution_cache_hit_on_identical_problem(self):
+        from src.services.solution_cache import SolutionCache
+        from src.utils.matrix import encode_base64_matrix
+        
+        matrix = [[0, 100, 200], [100, 0, 150], [200, 150, 0]]
+        service = VRPService(cache=SolutionCache(max_entries=2))
+        vehicles = [Vehicle(id=1, start_index=0, capacity=[10])]
+        jobs = [Job(id=1, location_index=1, delivery=[2]), Job(id=2, location_index=2, delivery=[3])]
+        
+        first = service.solve(VRPInput(vehicles=vehicles, jobs=jobs, matrix=matrix))
+        # same problem, different matrix encoding
+        second = service.solve(VRPInput(vehicles=vehicles, jobs=jobs, matrix_b64=encode_base64_matrix(matrix)))
+        changed = service.solve(VRPInput(vehicles=vehicles, jobs=jobs, matrix=matrix, random_seed=7))
+        
+        assert first.metadata.cache_hit is False
+        assert second.metadata.cache_hit is True
+        assert second.routes == first.routes
+        assert changed.metadata.cache_hit is False
+        assert service.cache.hits == 1
+    
+    def test_solution_cache_evicts_lru_and_expired(self):
+        from src.services.solution_cache import SolutionCache
+        
+        cache = SolutionCache(max_entries=2, ttl_seconds=60)
+        output = self.vrp_service.solve(VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0)],
+            jobs=[Job(id=1, location_index=1)],
+            matrix=[[0, 5], [5, 0]]
+        ))
+        
+        cache.put("a", output)
+        cache.put("b", output)
+        cache.get("a")
+        cache.put("c", output)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        
+        cache.ttl_seconds = -1
+        assert cache.get("c") is None
+        assert len(cache) == 1
+
+    
+    def test_warm_start_from_previous_routes(self):
+        from src.schemas.request_models import WarmStart
+        
+        matrix = [[abs(i - j) * 100 for j in range(8)] for i in range(8)]
+        vehicles = [Vehicle(id=1, start_index=0, capacity=[4]), Vehicle(id=2, start_index=0, capacity=[4])]
+        jobs = [Job(id=i, location_index=i, delivery=[1]) for i in range(1, 7)]
+        
+        first = self.vrp_service.solve(VRPInput(vehicles=vehicles, jobs=jobs, matrix=matrix))
+        hint = {vid: route.jobs for vid, route in first.routes.items()}
+        hint["1"] = hint["1"] + [99]
+        
+        # job 6 cancelled, job 7 added at a previously job-less location
+        changed_jobs = jobs[:5] + [Job(id=7, location_index=7, delivery=[1])]
+        result = self.vrp_service.solve(VRPInput(
+            vehicles=vehicles, jobs=changed_jobs, matrix=matrix, warm_start=WarmStart(routes=hint)
+        ))
+        
+        assert result.metadata.warm_started is True
+        assigned = sorted(jid for route in result.routes.values() for jid in route.jobs)
+        assert assigned == [1, 2, 3, 4, 5, 7]
+    
+    def test_warm_start_unknown_solution_id_solves_from_scratch(self):
+        from src.schemas.request_models import WarmStart
+        
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0, capacity=[10])],
+            jobs=[Job(id=1, location_index=1, delivery=[2])],
+            matrix=[[0, 100], [100, 0]],
+            warm_start=WarmStart(solution_id="64b7f0000000000000000000")
+        )
+        
+        result = self.vrp_service.solve(data)
+        
+        assert result.metadata.warm_started is False
+        assert result.routes["1"].jobs == [1]
+    
+    def test_portfolio_returns_best_member(self):
+        from src.services.portfolio import PORTFOLIO
+        
+        coords = [((i * 37) % 101, (i * 53) % 97) for i in range(40)]
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0, capacity=[20]), Vehicle(id=2, start_index=0, capacity=[20])],
+            jobs=[Job(id=i, location_index=i, delivery=[1]) for i in range(1, 40)],
+            matrix=[[abs(a[0] - b[0]) + abs(a[1] - b[1]) for b in coords] for a in coords]
+        )
+        service = VRPService(time_limit=20, solution_limit=50, portfolio_size=1)
+        
+        single = service.solve(data)
+        portfolio = service.solve(data.model_copy(update={"portfolio_size": 3}))
+        
+        assert single.metadata.portfolio_size == 1
+        assert single.metadata.strategy == "PATH_CHEAPEST_ARC+GUIDED_LOCAL_SEARCH/seed=0"
+        assert portfolio.metadata.portfolio_size == 3
+        assert portfolio.metadata.strategy.split("/")[0] in ["+".join(pair) for pair in PORTFOLIO[:3]]
+        assert portfolio.total_delivery_duration <= single.total_delivery_duration
+        assert sorted(j for r in portfolio.routes.values() for j in r.jobs) == list(range(1, 40))
+    
+    def test_every_portfolio_pair_finds_a_solution(self):
+        from src.services.portfolio import PORTFOLIO, SearchConfig
+        
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0, capacity=[10]), Vehicle(id=2, start_index=0, capacity=[10])],
+            jobs=[Job(id=i, location_index=i, delivery=[2]) for i in range(1, 6)],
+            matrix=[[abs(i - j) * 100 for j in range(6)] for i in range(6)]
+        )
+        service = VRPService(time_limit=5, solution_limit=20)
+        
+        for pair in PORTFOLIO:
+            result = service.compute_solution(data, search=SearchConfig(*pair, seed=0))
+            assert sorted(j for r in result.routes.values() for j in r.jobs) == [1, 2, 3, 4, 5], pair
+    
+    def test_time_budget_truncates_instead_of_failing(self):
+        import time
+        from src.benchmarks.generators import clustered
+        
+        service = VRPService(time_limit=1, solution_limit=10_000_000)
+        data = VRPInput(**clustered(120, seed=2))
+        
+        started = time.perf_counter()
+        result = service.solve(data)
+        elapsed = time.perf_counter() - started
+        
+        assert result.metadata.truncated is True
+        assert elapsed < 1.3
+        assert sorted(j for r in result.routes.values() for j in r.jobs) == list(range(1, 121))
+        
+        # a tighter request deadline wins over the service time limit
+        fast = VRPService(time_limit=30, solution_limit=10_000_000).solve(data.model_copy(update={"deadline_seconds": 0.3}))
+        assert fast.metadata.truncated is True
+        assert fast.metadata.solve_time_seconds < 0.5
+    
+    def test_expired_deadline_raises_timeout(self):
+        import time
+        from src.exceptions import VRPSystemError, ErrorCode
+        
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0)],
+            jobs=[Job(id=1, location_index=1)],
+            matrix=[[0, 5], [5, 0]],
+            deadline_seconds=1
+        )
+        data.mark_received(time.time() - 5)
+        
+        with pytest.raises(VRPSystemError) as exc_info:
+            self.vrp_service.solve(data)
+        
+        assert exc_info.value.error_code == ErrorCode.TIMEOUT_ERROR
+    
+    def test_decomposition_keeps_output_contract(self):
+        from src.benchmarks.generators import clustered
+        
+        payload = clustered(300, seed=3)
+        service = VRPService(time_limit=30, solution_limit=50, cluster_size=100)
+        
+        result = service.solve(VRPInput(**payload, decompose=True, include_timings=True))
+        
+        assert result.metadata.algorithm == "OR-Tools+decomposition"
+        assert result.metadata.clusters == 3
+        assert {"decomposition", "search", "repair", "extraction"} <= set(result.metadata.phases)
+        assert sorted(j for r in result.routes.values() for j in r.jobs) == list(range(1, 301))
+        assert set(result.routes) == {str(v["id"]) for v in payload["vehicles"]}
+        assert result.total_delivery_duration == sum(r.delivery_duration for r in result.routes.values())
+        capacity = payload["vehicles"][0]["capacity"][0]
+        assert all(r.capacity_used <= capacity for r in result.routes.values())
+        
+        # below the auto threshold, or with a single cluster, the problem is solved as a whole
+        auto = VRPService(time_limit=30, solution_limit=50, decompose_min_jobs=500).solve(VRPInput(**payload))
+        assert auto.metadata.algorithm == "OR-Tools"
+        small = service.solve(VRPInput(**clustered(60, seed=3), decompose=True))
+        assert small.metadata.clusters is None
+    
+    def test_candidate_neighbors_restrict_successors(self):
+        import numpy as np
+        from src.benchmarks.generators import uniform
+        from src.services.candidates import candidate_successors
+        
+        payload = uniform(120, seed=4)
+        matrix = np.asarray(payload["matrix"])
+        successors = candidate_successors(matrix, 5)
+        nearest = np.argsort(matrix[7] + np.where(np.arange(len(matrix)) == 7, 10 ** 9, 0))[:5]
+        assert set(nearest) <= set(successors[7])
+        assert all(i in successors[j] for i in range(len(matrix)) for j in successors[i])
+        
+        service = VRPService(time_limit=20, solution_limit=50, candidate_neighbors=5)
+        result = service.solve(VRPInput(**payload))
+        
+        assert sorted(j for r in result.routes.values() for j in r.jobs) == list(range(1, 121))
+        assert result.total_delivery_duration == sum(r.delivery_duration for r in result.routes.values())
+    
+    def test_sparse_matrix_input_forbids_unlisted_arcs(self):
+        # all arcs cost 10 except that 0 -> 1 -> 2 -> 3 is the only listed chain besides the depot's own row
+        sparse = [
+            [[1, 10], [2, 10], [3, 10]],
+            [[2, 50]],
+            [[3, 50]],
+            [],
+        ]
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0)],
+            jobs=[Job(id=i, location_index=i) for i in (1, 2, 3)],
+            matrix_sparse=sparse
+        )
+        
+        result = self.vrp_service.solve(data)
+        
+        assert result.routes["1"].jobs == [1, 2, 3]
+        assert result.routes["1"].total_distance == 110
+        
+        with pytest.raises(ValueError):
+            VRPInput(vehicles=data.vehicles, jobs=data.jobs, matrix_sparse=[[[5, 1]], [], [], []])
+    
+    def test_colocated_jobs_share_one_node_with_summed_demand(self):
+        # three parcels at location 1 need 6 units, so location 2 (4 units) cannot ride along despite being next door
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0, capacity=[7]), Vehicle(id=2, start_index=0, capacity=[7])],
+            jobs=[Job(id=i, location_index=1, delivery=[2], service=10) for i in (1, 2, 3)]
+                 + [Job(id=4, location_index=2, delivery=[4])],
+            matrix=[
+                [0, 10, 10],
+                [10, 0, 1],
+                [10, 1, 0]
+            ]
+        )
+        
+        result = self.vrp_service.solve(data)
+        
+        routes = sorted(result.routes.values(), key=lambda r: r.jobs)
+        assert [r.jobs for r in routes] == [[1, 2, 3], [4]]
+        assert routes[0].capacity_used == 6
+        assert routes[0].total_service_time == 30
+        assert result.total_delivery_duration == 50
+
+    def test_locations_without_jobs_are_not_visited(self):
+        # location 2 hosts no job and no vehicle start, so it is not a routing node at all
+        data = VRPInput(
+            vehicles=[Vehicle(id=1, start_index=0)],
+            jobs=[Job(id=1, location_index=1), Job(id=2, location_index=3)],
+            matrix=[
+                [0, 1, 100, 2],
+                [1, 0, 100, 1],
+                [100, 100, 0, 100],
+                [2, 1, 100, 0]
+            ]
+        )
+
+        result = self.vrp_service.solve(data)
+
+        route = result.routes["1"]
+        assert route.jobs == [1, 2]
+        assert route.total_distance == 2
+        assert (route.start_location, route.end_location) == (0, 3)
+        assert result.total_delivery_duration == 2